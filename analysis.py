@@ -0,0 +1,258 @@
+"""
+Vectorized text analysis over paper titles and abstracts.
+
+- TF-IDF embedding into a sparse matrix (NumPy/SciPy).
+- Top-k "related papers" by cosine similarity, computed with batched sparse
+  matrix products instead of a Python double loop.
+- Session audit: spherical k-means over the same embedding, reporting papers
+  whose session disagrees with their topic cluster, and sessions whose papers
+  match another session's name better than their own.
+
+NumPy and SciPy are optional: callers should check HAVE_NUMPY first.
+"""
+
+import re
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    HAVE_NUMPY = True
+except ImportError:  # optional: pip install numpy scipy
+    np = sp = None
+    HAVE_NUMPY = False
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in into is it its of on or our
+that the their these this to we which with via using based towards through
+while when where such than then them they those both each other over under
+new method methods approach paper propose proposed present show results
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords or single characters."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def paper_documents(papers, abstract_map):
+    """Title + abstract text per paper, aligned with papers."""
+    return [f"{p.title} {abstract_map.get(p.pid, '')}" for p in papers]
+
+
+def tfidf_matrix(docs, min_df=2, max_df=0.02, max_df_floor=50):
+    """
+    L2-normalized TF-IDF rows (CSR, float32), one per document.
+
+    Terms in fewer than min_df documents cannot link two papers, and terms in
+    more than max(max_df * n, max_df_floor) documents barely discriminate
+    between them; both are dropped. Besides sharpening neighbours this keeps
+    X @ X.T sparse, which is what lets top_k_neighbours scale to 50k papers.
+    """
+    vocab = {}
+    indptr = [0]
+    indices = []
+    for doc in docs:
+        for token in tokenize(doc):
+            indices.append(vocab.setdefault(token, len(vocab)))
+        indptr.append(len(indices))
+
+    n_docs = len(docs)
+    counts = sp.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(n_docs, len(vocab)),
+    )
+    counts.sum_duplicates()
+
+    df = np.bincount(counts.indices, minlength=len(vocab))
+    keep = (df >= min_df) & (df <= max(max_df * n_docs, max_df_floor))
+    counts = counts[:, np.flatnonzero(keep)].tocsr()
+    df = df[keep]
+
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    counts.data *= idf[counts.indices]
+
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sp.csr_matrix(sp.diags(1 / norms) @ counts, dtype=np.float32)
+
+
+def top_k_neighbours(matrix, k=5, min_similarity=0.1, batch_size=1024):
+    """
+    Indices of the k most cosine-similar rows for every row (self excluded).
+
+    Each batch of rows is one sparse product against matrix.T. Similarities
+    below min_similarity are discarded (they are not meaningfully "related"),
+    and the top k per row are picked from the rest with one argsort on a
+    row-major composite key -- no densifying and no Python loop over pairs.
+    Rows without any similarity above the cutoff get fewer than k neighbours.
+    """
+    n = matrix.shape[0]
+    if k <= 0 or n < 2:
+        return [[] for _ in range(n)]
+
+    transposed = matrix.T.tocsr()
+    neighbours = []
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        sims = (matrix[start:stop] @ transposed).tocsr()
+
+        rows = np.repeat(np.arange(stop - start), np.diff(sims.indptr))
+        cols, vals = sims.indices, sims.data
+        keep = (vals >= min_similarity) & (cols != rows + start)
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+        # Similarities are in (0, 1], so row - sim / 2 sorts by row, then by
+        # descending similarity within the row.
+        order = np.argsort(rows - vals.astype(np.float64) / 2)
+        rows, cols = rows[order], cols[order]
+
+        bounds = np.searchsorted(rows, np.arange(stop - start + 1))
+        cols = cols.tolist()
+        neighbours.extend(
+            cols[bounds[i]:min(bounds[i] + k, bounds[i + 1])] for i in range(stop - start)
+        )
+    return neighbours
+
+
+def related_papers(papers, abstract_map, k=5):
+    """Map papers_#### -> list of up to k related papers_#### ids, most similar first."""
+    if not papers:
+        return {}
+    matrix = tfidf_matrix(paper_documents(papers, abstract_map))
+    neighbours = top_k_neighbours(matrix, k=k)
+    return {
+        paper.pid: [papers[j].pid for j in idx]
+        for paper, idx in zip(papers, neighbours)
+    }
+
+
+def _normalize_rows(dense):
+    norms = np.linalg.norm(dense, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return dense / norms
+
+
+def spherical_kmeans(matrix, n_clusters, n_iter=50, seed=0):
+    """
+    Cosine k-means on L2-normalized sparse rows, k-means++ seeded.
+
+    Every step is a sparse x dense product (assignment) or a sparse one-hot
+    product (centroid update). Returns (labels, centroids).
+    """
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    n_clusters = min(n_clusters, n)
+
+    # k-means++ on cosine distance
+    chosen = [int(rng.integers(n))]
+    dist = 1 - (matrix @ matrix[chosen[0]].T).toarray().ravel()
+    for _ in range(1, n_clusters):
+        weights = np.clip(dist, 0, None) ** 2
+        total = weights.sum()
+        idx = int(rng.choice(n, p=weights / total)) if total > 0 else int(rng.integers(n))
+        chosen.append(idx)
+        dist = np.minimum(dist, 1 - (matrix @ matrix[idx].T).toarray().ravel())
+    centroids = matrix[chosen].toarray()
+
+    labels = None
+    for _ in range(n_iter):
+        new_labels = np.asarray(matrix @ centroids.T).argmax(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        onehot = sp.csr_matrix(
+            (np.ones(n, dtype=np.float32), (labels, np.arange(n))), shape=(n_clusters, n)
+        )
+        sums = np.asarray((onehot @ matrix).todense())
+        empty = np.asarray(onehot.sum(axis=1)).ravel() == 0
+        sums[empty] = centroids[empty]
+        centroids = _normalize_rows(sums)
+    return labels, centroids
+
+
+def _leave_one_out_similarity(matrix, group_ids, n_groups):
+    """Cosine of each row to the centroid of its group with the row itself removed."""
+    n = matrix.shape[0]
+    onehot = sp.csr_matrix(
+        (np.ones(n, dtype=np.float32), (group_ids, np.arange(n))), shape=(n_groups, n)
+    )
+    sums = np.asarray((onehot @ matrix).todense())
+    dot = np.asarray(matrix @ sums.T)[np.arange(n), group_ids]
+    self_sq = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+    rest_norm = np.sqrt(np.clip((sums ** 2).sum(axis=1)[group_ids] - 2 * dot + self_sq, 0, None))
+    return np.divide(dot - self_sq, rest_norm, out=np.zeros(n), where=rest_norm > 1e-6)
+
+
+def audit_sessions(docs, sessions, n_clusters=None, margin=0.1, seed=0):
+    """
+    Flag papers whose assigned session disagrees with their topic cluster.
+
+    Papers are clustered (spherical k-means, one cluster per session by
+    default). A paper is reported when the majority session of the other
+    members of its cluster is not its own, and it is closer to the rest of
+    its cluster than to the rest of its session by more than margin (both
+    leave-one-out centroids, so a paper never votes for itself).
+
+    Returns a list of (index, suggested_session, score), highest score first.
+    """
+    matrix = tfidf_matrix(docs)
+    session_names = sorted(set(sessions))
+    session_index = {name: i for i, name in enumerate(session_names)}
+    session_ids = np.array([session_index[s] for s in sessions])
+    n = len(docs)
+
+    labels, centroids = spherical_kmeans(matrix, n_clusters or len(session_names), seed=seed)
+    n_clusters = centroids.shape[0]
+
+    # Majority session among the *other* members of each paper's cluster.
+    votes = np.zeros((n_clusters, len(session_names)), dtype=np.int64)
+    np.add.at(votes, (labels, session_ids), 1)
+    paper_votes = votes[labels]
+    paper_votes[np.arange(n), session_ids] -= 1
+    suggested = paper_votes.argmax(axis=1)
+    has_peers = paper_votes.max(axis=1) > 0
+
+    score = (
+        _leave_one_out_similarity(matrix, labels, n_clusters)
+        - _leave_one_out_similarity(matrix, session_ids, len(session_names))
+    )
+
+    flagged = np.flatnonzero(has_peers & (suggested != session_ids) & (score > margin))
+    flagged = flagged[np.argsort(-score[flagged])]
+    return [(int(i), session_names[suggested[i]], float(score[i])) for i in flagged]
+
+
+def audit_session_names(docs, sessions, margin=0.05):
+    """
+    Flag sessions whose papers match another session's *name* better than their own.
+
+    Session names are embedded alongside the papers (same vocabulary and idf)
+    and compared with the centroid of each session's papers; this catches
+    whole sessions filed under a shifted session id.
+
+    Returns a list of (session, best_matching_name, own_sim, best_sim).
+    """
+    session_names = sorted(set(sessions))
+    session_index = {name: i for i, name in enumerate(session_names)}
+    session_ids = np.array([session_index[s] for s in sessions])
+    n = len(docs)
+
+    matrix = tfidf_matrix(list(docs) + session_names)
+    papers, names = matrix[:n], matrix[n:]
+    onehot = sp.csr_matrix(
+        (np.ones(n, dtype=np.float32), (session_ids, np.arange(n))), shape=(len(session_names), n)
+    )
+    centroids = _normalize_rows(np.asarray((onehot @ papers).todense()))
+    sims = np.asarray(names @ centroids.T).T  # [session, name]
+
+    own = sims[np.arange(len(session_names)), np.arange(len(session_names))]
+    best = sims.argmax(axis=1)
+    best_sim = sims[np.arange(len(session_names)), best]
+    flagged = np.flatnonzero((best != np.arange(len(session_names))) & (best_sim - own > margin))
+    flagged = flagged[np.argsort(own[flagged] - best_sim[flagged])]
+    return [
+        (session_names[i], session_names[best[i]], float(own[i]), float(best_sim[i]))
+        for i in flagged
+    ]
@@ -0,0 +1,110 @@
+"""
+Batched arXiv metadata for papers whose url.json link points at arXiv.
+
+All arXiv ids found in url.json are looked up with id_list queries of up to
+BATCH_SIZE ids each (one round-trip per batch instead of per paper), spaced
+REQUEST_INTERVAL seconds apart as the arXiv API asks. Atom responses are
+parsed incrementally with iterparse, clearing each <entry> once read.
+
+Results live in arxiv_cache.json ({id: {"title", "abstract", "doi"}}, or
+null for ids arXiv does not know), so each id is queried once.
+"""
+
+import re
+import json
+import time
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlencode
+from xml.etree.ElementTree import iterparse
+
+import transport
+from fsutil import write_json_atomic
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_CACHE_PATH = Path("arxiv_cache.json")
+
+BATCH_SIZE = 100
+REQUEST_INTERVAL = 3.0
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+# New-style (2506.24108) and old-style (math.GT/0309136) ids, version dropped.
+ARXIV_ID_RE = re.compile(
+    r"arxiv\.org/(?:abs|pdf|html)/((?:\d{4}\.\d{4,5})|(?:[a-z-]+(?:\.[A-Z]{2})?/\d{7}))(?:v\d+)?",
+    re.IGNORECASE,
+)
+
+
+def arxiv_id(url):
+    """
+    The version-less arXiv id in url, or None.
+
+    Old-style ids are reduced to archive/number: the API's entry ids drop
+    the subject class (math.GT/0309136 comes back as math/0309136), so
+    URL-derived and returned ids only match in that form.
+    """
+    match = ARXIV_ID_RE.search(url)
+    if not match:
+        return None
+    archive, sep, number = match.group(1).rpartition("/")
+    return f"{archive.split('.', 1)[0].lower()}/{number}" if sep else number
+
+
+def _clean(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def parse_feed(data):
+    """Yield (arxiv id, {"title", "abstract", "doi"}) from an Atom response, entry by entry."""
+    for _, elem in iterparse(BytesIO(data), events=("end",)):
+        if elem.tag != f"{ATOM}entry":
+            continue
+        entry_id = arxiv_id(elem.findtext(f"{ATOM}id") or "")
+        # Malformed ids come back as an entry titled "Error" without an abs/ link.
+        if entry_id:
+            yield entry_id, {
+                "title": _clean(elem.findtext(f"{ATOM}title")),
+                "abstract": _clean(elem.findtext(f"{ATOM}summary")),
+                "doi": _clean(elem.findtext(f"{ARXIV_NS}doi")) or None,
+            }
+        elem.clear()
+
+
+def load_cache(path=ARXIV_CACHE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_cache(cache, path=ARXIV_CACHE_PATH):
+    write_json_atomic(path, cache, sort_keys=True)
+
+
+def hydrate(ids, cache_path=ARXIV_CACHE_PATH, batch_size=BATCH_SIZE, interval=None):
+    """
+    Metadata for arXiv ids: returns ({id: record or None}, requests made).
+
+    Uncached ids are fetched in batches; the cache is saved after every batch
+    so an interrupted run keeps what it got. Ids a batch did not return are
+    cached as None.
+    """
+    interval = REQUEST_INTERVAL if interval is None else interval
+    cache = load_cache(cache_path)
+    missing = sorted({i for i in ids if i not in cache})
+    requests = 0
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        if requests:
+            time.sleep(interval)
+        query = urlencode({"id_list": ",".join(batch), "max_results": len(batch)})
+        data = transport.http_get(f"{ARXIV_API_URL}?{query}", timeout=60).body
+        requests += 1
+        found = dict(parse_feed(data))
+        for i in batch:
+            cache[i] = found.get(i)
+        _write_cache(cache, cache_path)
+    return {i: cache.get(i) for i in ids}, requests
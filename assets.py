@@ -0,0 +1,255 @@
+"""
+Post-processing for generated artifacts (papers.html, url.json, ...).
+
+- Writes the page stylesheet/script as minified, content-hashed static files
+  plus a _headers file marking them immutable for long-lived caching.
+- Emits a service worker that precaches the page, assets, data and the
+  same-origin thumbnail copies for offline use (cache-first with background
+  revalidation, limited to those files).
+- Emits precompressed .gz / .br siblings for static hosts that serve
+  precompressed files but cannot compress on the fly.
+"""
+
+import re
+import json
+import gzip
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+STATIC_DIR = Path("static")
+HEADERS_PATH = Path("_headers")
+SERVICE_WORKER_PATH = Path("sw.js")
+
+SERVICE_WORKER_REGISTER_SNIPPET = '''
+    <script>
+        if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {
+            window.addEventListener('load', () => navigator.serviceWorker.register('sw.js'));
+        }
+    </script>
+'''
+
+SERVICE_WORKER_JS = '''// Generated by scraper.py -- do not edit.
+const CACHE_VERSION = __VERSION__;
+const CORE_CACHE = `papers-core-${CACHE_VERSION}`;
+// Thumbnails are content-hashed, survive rebuilds and are pruned on activate.
+const THUMB_CACHE = 'papers-thumbs';
+const PAGE_URL = __PAGE_URL__;
+const PRECACHE = __PRECACHE__;
+const THUMBNAILS = __THUMBNAILS__;
+const href = url => new URL(url, self.location).href;
+const SCOPE_URL = href('./');
+const CORE_SET = new Set([SCOPE_URL, ...PRECACHE.map(href)]);
+const THUMBNAIL_SET = new Set(THUMBNAILS.map(href));
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const core = await caches.open(CORE_CACHE);
+        await core.addAll(PRECACHE);
+        // Thumbnails are best effort: a missing image must not fail the install.
+        const thumbs = await caches.open(THUMB_CACHE);
+        await Promise.allSettled(THUMBNAILS.map(async url => {
+            if (!(await thumbs.match(url))) await thumbs.add(url);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        for (const key of await caches.keys()) {
+            if (key !== CORE_CACHE && key !== THUMB_CACHE) await caches.delete(key);
+        }
+        const thumbs = await caches.open(THUMB_CACHE);
+        for (const request of await thumbs.keys()) {
+            if (!THUMBNAIL_SET.has(request.url)) await thumbs.delete(request);
+        }
+        await self.clients.claim();
+    })());
+});
+
+// Cache-first with background revalidation, for the precached files only;
+// everything else (other pages, API calls, remote images) goes to the network.
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const isThumb = THUMBNAIL_SET.has(request.url);
+    if (!isThumb && !CORE_SET.has(request.url)) return;
+
+    event.respondWith((async () => {
+        const cache = await caches.open(isThumb ? THUMB_CACHE : CORE_CACHE);
+        let cached = await cache.match(request);
+        if (!cached && request.url === SCOPE_URL) cached = await cache.match(PAGE_URL);
+
+        const network = fetch(request).then(response => {
+            if (response.ok) cache.put(request, response.clone());
+            return response;
+        });
+        if (cached) {
+            event.waitUntil(network.catch(() => {}));
+            return cached;
+        }
+        return network;
+    })());
+});
+'''
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def minify_js(js):
+    """
+    Conservative script minification: drop full-line comments, indentation and
+    blank lines. Newlines are kept so automatic semicolon insertion still holds.
+    """
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def _write_hashed(out_dir, stem, suffix, content):
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    path = out_dir / f"{stem}.{digest}{suffix}"
+    if not path.exists():
+        path.write_bytes(data)
+    # Drop superseded builds of the same asset (and their precompressed siblings).
+    pattern = rf"{re.escape(stem)}\.[0-9a-f]{{12}}{re.escape(suffix)}(\.gz|\.br)?"
+    for old in out_dir.glob(f"{stem}.*{suffix}*"):
+        if not old.name.startswith(path.name) and re.fullmatch(pattern, old.name):
+            old.unlink()
+    return path
+
+
+def write_static_assets(css, js, out_dir=STATIC_DIR):
+    """
+    Write minified, content-hashed papers.<hash>.css / editor.<hash>.js.
+
+    Returns (asset_urls, paths): asset_urls is {"css": ..., "js": ...} relative to
+    the page, suitable for scraper.render_page; paths are the files on disk.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    css_path = _write_hashed(out_dir, "papers", ".css", minify_css(css))
+    js_path = _write_hashed(out_dir, "editor", ".js", minify_js(js))
+    asset_urls = {"css": css_path.as_posix(), "js": js_path.as_posix()}
+    return asset_urls, [css_path, js_path]
+
+
+def write_cache_headers(pages, out_dir=STATIC_DIR, path=HEADERS_PATH):
+    """
+    Write a _headers file (Netlify / Cloudflare Pages syntax): hashed assets are
+    cached for a year as immutable, pages and data are always revalidated.
+    """
+    lines = [f"/{out_dir.as_posix()}/*", "  Cache-Control: public, max-age=31536000, immutable", ""]
+    for page in pages:
+        lines += [f"/{page.as_posix()}", "  Cache-Control: no-cache", ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def write_service_worker(page, precache, thumbnails, path=SERVICE_WORKER_PATH):
+    """
+    Write sw.js precaching page + precache paths and warming the thumbnail paths.
+
+    The cache version is a hash of the precached files' contents, so a rebuild
+    with changed output installs a fresh core cache while identical rebuilds
+    keep the existing one.
+    """
+    digest = hashlib.sha256()
+    for p in [page, *precache]:
+        digest.update(p.as_posix().encode("utf-8"))
+        digest.update(p.read_bytes())
+
+    script = (
+        SERVICE_WORKER_JS
+        .replace("__VERSION__", json.dumps(digest.hexdigest()[:12]))
+        .replace("__PAGE_URL__", json.dumps(page.as_posix()))
+        .replace("__PRECACHE__", json.dumps([p.as_posix() for p in [page, *precache]], indent=4))
+        .replace("__THUMBNAILS__", json.dumps(sorted({p.as_posix() for p in thumbnails}), indent=4))
+    )
+    path.write_text(script, encoding="utf-8")
+    return path
+
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical across builds.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+COMPRESSORS = {".gz": (_gzip, gzip.decompress)}
+if brotli is not None:
+    COMPRESSORS[".br"] = (_brotli, brotli.decompress)
+
+
+def _is_current(target, data, decompress):
+    """True if target already holds a compressed copy of data."""
+    if not target.exists():
+        return False
+    try:
+        return decompress(target.read_bytes()) == data
+    except Exception:
+        return False
+
+
+def _precompress_one(path, suffix):
+    compress, decompress = COMPRESSORS[suffix]
+    data = path.read_bytes()
+    target = path.with_name(path.name + suffix)
+    if _is_current(target, data, decompress):
+        return suffix, target.stat().st_size, False
+    compressed = compress(data)
+    target.write_bytes(compressed)
+    return suffix, len(compressed), True
+
+
+def precompress(paths, max_workers=None):
+    """
+    Write max-level .gz (and .br when brotli is installed) next to each path.
+
+    Variants whose decompressed content already matches the source are left
+    untouched. Returns {path: {"size": n, ".gz": n, ".br": n, "updated": [...]}}.
+    """
+    jobs = [(path, suffix) for path in paths for suffix in COMPRESSORS]
+    summary = {path: {"size": path.stat().st_size, "updated": []} for path in paths}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_precompress_one, path, suffix): path for path, suffix in jobs}
+        for future, path in futures.items():
+            suffix, size, updated = future.result()
+            summary[path][suffix] = size
+            if updated:
+                summary[path]["updated"].append(suffix)
+    return summary
+
+
+def print_compression_summary(summary):
+    if brotli is None:
+        print("  (brotli not installed: skipping .br variants; pip install brotli)")
+    for path, info in summary.items():
+        parts = [f"{path.as_posix():<32} {info['size']:>10,} B"]
+        for suffix in COMPRESSORS:
+            ratio = info[suffix] / info["size"] if info["size"] else 0
+            parts.append(f"{suffix} {info[suffix]:>9,} B ({ratio:.0%})")
+        status = "updated " + ", ".join(info["updated"]) if info["updated"] else "unchanged"
+        print("  " + "  ".join(parts) + f"  [{status}]")
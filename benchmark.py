@@ -0,0 +1,1208 @@
+"""
+Synthetic schedule generator and benchmark suite for the scraper pipeline.
+
+Generates linklings-style program snippets at configurable scale and times
+each pipeline stage on them, comparing against a stored baseline. The other
+modes below time or measure one subsystem each on the same synthetic data.
+
+Usage:
+    python benchmark.py                      # run default sizes, compare to baseline
+    python benchmark.py --sizes 300 50000    # custom sizes
+    python benchmark.py --save-baseline      # store this run as the new baseline
+    python benchmark.py --memory             # Paper records vs dicts
+    python benchmark.py --related            # TF-IDF related-papers stage
+    python benchmark.py --end-to-end         # full build over replayed fixtures
+    python benchmark.py --export             # export formats, one by one and together
+    python benchmark.py --browser            # headless-browser pool on local JS pages
+    python benchmark.py --meta               # url.json vs sharded metadata writes
+    python benchmark.py --faults             # retries, deadline and breaker against a faulty stub server
+    python benchmark.py --merge-edits        # merge-edits conflict rules on a legacy url.json download
+    python benchmark.py --thumbnails         # thumbnail placeholders against a stub image host
+    python benchmark.py --pdfs               # PDF abstract extraction against a stub host of sample PDFs
+    python benchmark.py --arxiv              # batched arXiv metadata against a stub Atom endpoint
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import re
+import random
+import argparse
+import tempfile
+import threading
+import http.server
+import tracemalloc
+import urllib.parse
+import statistics
+import contextlib
+from pathlib import Path
+from html import escape as html_escape
+
+import scraper
+import transport
+
+BENCH_BASELINE_PATH = Path("bench_baseline.json")
+BENCH_RESULTS_PATH = Path("bench_results.json")
+
+DEFAULT_SIZES = [300, 5000, 50000]
+DEFAULT_THRESHOLD = 1.25
+
+# Session ids the live schedule uses, plus a few unmapped ones to exercise
+# the "Session N" fallback in group_papers_by_session. The last papers go to
+# SPARSE_SESSION_ID, an unmapped session too small for its own heading, which
+# exercises the "Other Papers" fallback.
+SESSION_IDS = [f"sess{n}" for n in range(104, 157)] + ["sess159", "sess170", "sess171"]
+SPARSE_SESSION_ID = "sess172"
+SPARSE_SESSION_PAPERS = 2
+
+_WORDS = [
+    "Neural", "Gaussian", "Splatting", "Real-Time", "Differentiable", "Rendering",
+    "Simulation", "Fluid", "Cloth", "Mesh", "Geometry", "Diffusion", "Video",
+    "Motion", "Synthesis", "Reconstruction", "Implicit", "Surfaces", "Light",
+    "Transport", "Sampling", "Editing", "Avatars", "Hair", "Faces", "Scenes",
+    "Fabrication", "Design", "Sketch", "Vector", "Animation", "Control",
+]
+_NAMES = [
+    "Wei", "Yuki", "Anna", "Jonas", "Priya", "Chen", "Sofia", "Lucas", "Mei",
+    "Omar", "Elena", "Hiro", "Sara", "Tomas", "Lin", "Ivan", "Noor", "Kai",
+]
+_SURNAMES = [
+    "Zhang", "Tanaka", "Müller", "Kim", "Garcia", "Li", "Rossi", "Nguyen",
+    "Wang", "Dubois", "Sato", "Ivanova", "Park", "Silva", "Chen", "O'Brien",
+]
+
+
+def _synthetic_title(rng, index):
+    words = rng.sample(_WORDS, rng.randint(3, 7))
+    # The index keeps titles unique, so dedup only removes intended duplicates.
+    return f"{' '.join(words)} &amp; Beyond {index}"
+
+
+def _synthetic_row(rng, paper_id, session_id, title, with_image):
+    if with_image:
+        image_td = (
+            '<td class="representative-image-td">'
+            f'<img class="representative-img" alt="" '
+            f'src="/wp-content/linklings_snippets/images/papers_{paper_id}.jpg">'
+            '</td>'
+        )
+    else:
+        image_td = '<td class="representative-image-td"></td>'
+
+    presenters = "".join(
+        '<div class="presenter-name">'
+        f'<a href="?post_type=presenter&amp;id={rng.randint(1, 99999)}">'
+        f'{rng.choice(_NAMES)} {html_escape(rng.choice(_SURNAMES))}</a>'
+        '</div>'
+        for _ in range(rng.randint(1, 8))
+    )
+    return (
+        '<tr class="agenda-item">\n'
+        f'{image_td}\n'
+        '<td class="title-speakers-td">'
+        f'<a href="/?post_type=page&p=14&id=papers_{paper_id}&sess={session_id}">{title}</a>'
+        f'{presenters}'
+        '</td>\n'
+        '</tr>\n'
+    )
+
+
+def generate_schedule_snippets(num_papers, duplicate_rate=0.05, missing_image_rate=0.1, seed=0):
+    """
+    Generate linklings-style program HTML containing num_papers unique papers.
+
+    - duplicate_rate: fraction of papers emitted a second time (as on the live
+      site, where a paper shows up on more than one day).
+    - missing_image_rate: fraction of papers without a representative image.
+    """
+    rng = random.Random(seed)
+    rows = []
+    emitted = []
+    for i in range(num_papers):
+        paper_id = str(1000 + i)
+        if i >= num_papers - SPARSE_SESSION_PAPERS:
+            session_id = SPARSE_SESSION_ID
+        else:
+            session_id = SESSION_IDS[i * len(SESSION_IDS) // max(num_papers - SPARSE_SESSION_PAPERS, 1)]
+        title = _synthetic_title(rng, i)
+        with_image = rng.random() >= missing_image_rate
+        row = _synthetic_row(rng, paper_id, session_id, title, with_image)
+        rows.append(row)
+        emitted.append(row)
+
+    for row in rng.sample(emitted, int(num_papers * duplicate_rate)):
+        rows.insert(rng.randrange(len(rows) + 1), row)
+
+    return '<table class="agenda">\n' + "".join(rows) + "</table>\n"
+
+
+def _time_stage(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def run_benchmarks(sizes, repeat=3, seed=0):
+    """Time each pipeline stage on synthetic schedules; returns a results dict."""
+    results = {}
+    cwd = os.getcwd()
+    for size in sizes:
+        html_content = generate_schedule_snippets(size, seed=seed)
+        stages = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            # url.json is resolved relative to the working directory.
+            os.chdir(tmp)
+            try:
+                papers, t = _time_stage(lambda: scraper.extract_technical_papers(html_content), repeat)
+                stages["extract_technical_papers"] = t
+                by_session, t = _time_stage(lambda: scraper.group_papers_by_session(papers), repeat)
+                stages["group_papers_by_session"] = t
+                _, t = _time_stage(lambda: scraper.write_urls_json(by_session), repeat)
+                stages["write_urls_json"] = t
+                _, t = _time_stage(lambda: scraper.generate_html(by_session), repeat)
+                stages["generate_html"] = t
+            finally:
+                os.chdir(cwd)
+
+        results[str(size)] = {
+            "papers": len(papers),
+            "input_chars": len(html_content),
+            "stages": {
+                name: {"min": min(t), "median": statistics.median(t)}
+                for name, t in stages.items()
+            },
+        }
+    return results
+
+
+def split_schedule_days(html_content):
+    """{date: html} spreading a synthetic schedule over the conference days."""
+    chunks = html_content.split("</tr>")
+    per_day = -(-len(chunks) // len(scraper.DATES))
+    return {
+        date: "</tr>".join(chunks[i * per_day:(i + 1) * per_day])
+        for i, date in enumerate(scraper.DATES)
+    }
+
+
+def write_schedule_fixtures(fixture_dir, num_papers, seed=0):
+    """Record a synthetic schedule, split across the conference days, as replay fixtures."""
+    days = split_schedule_days(generate_schedule_snippets(num_papers, seed=seed))
+    for date, body in days.items():
+        transport.write_fixture(fixture_dir, transport.Response(
+            scraper.BASE_URL.format(date=date), 200, "OK",
+            {"Content-Type": "text/plain; charset=utf-8"}, body.encode("utf-8"),
+        ))
+
+
+def time_end_to_end(sizes, repeat=1, seed=0, latency=0.0):
+    """Time scraper.build (fetch -> parse -> enrich -> render) over replayed fixtures."""
+    results = {}
+    cwd = os.getcwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            fixture_dir = Path(tmp) / "fixtures"
+            write_schedule_fixtures(fixture_dir, size, seed=seed)
+            previous = transport.set_transport(transport.ReplayTransport(fixture_dir, latency=latency))
+            os.chdir(tmp)
+            try:
+                # Network-bound enrichment is left out: only the schedule is recorded.
+                offline_build = lambda: scraper.build(
+                    related_k=0, placeholders=False, pdfs=False, arxiv=False, crossref=False
+                )
+                _, t = _time_stage(offline_build, repeat)
+                papers = sum(1 for _ in open(scraper.PAPERS_JSONL_PATH, encoding="utf-8")) - 1
+            finally:
+                os.chdir(cwd)
+                transport.set_transport(previous)
+        results[str(size)] = {
+            "papers": papers,
+            "stages": {"build (replay)": {"min": min(t), "median": statistics.median(t)}},
+        }
+    return results
+
+
+def time_export(sizes, formats=None, repeat=1, seed=0):
+    """Time scraper.export_stage per format, and all formats in one pass, on parsed synthetic schedules."""
+    import export
+
+    formats = formats or list(export.WRITERS)
+    results = {}
+    cwd = os.getcwd()
+    for size in sizes:
+        html_content = generate_schedule_snippets(size, seed=seed)
+        stages = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scraper.write_raw_snippets(split_schedule_days(html_content))
+                    scraper.parse_stage()
+                    by_session = scraper.read_papers_jsonl()
+                    scraper.write_urls_json(by_session)
+                    papers = [p for ps in by_session.values() for p in ps]
+                    abstracts = synthetic_abstracts(papers, words_per_abstract=150, seed=seed)
+                    scraper.fill_missing_meta({
+                        p.pid: {"url": f"https://dl.acm.org/doi/10.1145/3757377.{p.pid[7:]}",
+                                "abstract": abstracts[p.pid]}
+                        for p in papers
+                    })
+                for fmt in formats:
+                    _, t = _time_stage(lambda: scraper.export_stage(formats=[fmt]), repeat)
+                    stages[f"export {fmt}"] = t
+                if len(formats) > 1:
+                    _, t = _time_stage(lambda: scraper.export_stage(formats=formats), repeat)
+                    stages[f"export {'+'.join(formats)}"] = t
+            finally:
+                os.chdir(cwd)
+        results[str(size)] = {
+            "papers": len(papers),
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    return results
+
+
+class _LandingPageHandler(http.server.BaseHTTPRequestHandler):
+    """
+    ACM-like landing pages whose abstract is inserted by script after a
+    delay, each referencing a font, an image and a tracker the browser pool
+    should never load (they are counted in server.blocked_hits).
+    """
+
+    def do_GET(self):
+        if not self.path.startswith("/doi/"):
+            self.server.blocked_hits += 1
+            self.send_response(404)
+            self.end_headers()
+            return
+        n = self.path.rsplit("/", 1)[-1]
+        body = f"""<!doctype html><html><head><title>Paper {n}</title>
+<style>@font-face {{ font-family: x; src: url(/fonts/{n}.woff2); }} body {{ font-family: x; }}</style>
+<script async src="https://www.googletagmanager.com/gtag/js?id={n}"></script></head>
+<body><img src="/img/{n}.png"><div id="root">Loading...</div>
+<script>setTimeout(() => {{
+  document.getElementById("root").innerHTML =
+    '<section id="abstract"><h2>Abstract</h2><p>' + "Paper {n} studies rendering. ".repeat(12) + '</p></section>';
+}}, 50);</script></body></html>""".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FaultyScheduleHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves /<date>.txt schedule snippets, injecting the faults queued for
+    the path in server.faults[path] (or server.default_fault once the
+    queue is empty): "ok", "503", "reset" (close without a response) or
+    "hang" (stall for server.hang seconds first). Every request is counted
+    in server.hits[path].
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            queue = server.faults.get(self.path)
+            fault = queue.pop(0) if queue else server.default_fault
+        if fault == "reset":
+            self.close_connection = True
+            return
+        if fault == "hang":
+            time.sleep(server.hang)
+        if fault == "503":
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = server.days.get(self.path.strip("/").removesuffix(".txt"), "").encode("utf-8")
+        try:
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # the client gave up on a stalled request
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def _faulty_schedule_server(num_papers, seed=0):
+    """Serve a synthetic schedule from a _FaultyScheduleHandler and point scraper.BASE_URL at it."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FaultyScheduleHandler)
+    server.days = split_schedule_days(generate_schedule_snippets(num_papers, seed=seed))
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.faults = {}
+    server.default_fault = "ok"
+    server.hang = 0.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous_url = scraper.BASE_URL
+    scraper.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/{{date}}.txt"
+    try:
+        yield server
+    finally:
+        scraper.BASE_URL = previous_url
+        server.shutdown()
+        server.server_close()
+
+
+def _fetch_days(resilient):
+    """scraper.fetch_schedule_days through resilient; returns (days or the error, seconds)."""
+    previous = transport.set_transport(resilient)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = scraper.fetch_schedule_days()
+    except scraper.IncompleteScheduleError as e:
+        result = e
+    finally:
+        transport.set_transport(previous)
+    return result, time.perf_counter() - start
+
+
+def run_fault_scenarios(num_papers=300, deadline=1.0, seed=0):
+    """
+    Fetch the schedule from a local fault-injecting stub server and check the
+    fetch layer's contract, timing each scenario:
+
+    - transient: every day answers 503, then resets the connection, then
+      succeeds; retries must recover the complete schedule.
+    - hung day: one day stalls past the deadline; the fetch must give up
+      within the deadline and report the schedule as incomplete.
+    - deadline scope: the same, with the deadline set by
+      transport.fetch_deadline() as fetch_stage does; once the block is
+      left, later requests (enrichment) must no longer be refused by it.
+    - dead host: every request is reset; the breaker must stop requests
+      after `threshold` failures, and once the cooldown has passed let
+      exactly one of several concurrent callers through as the trial.
+
+    Raises RuntimeError on the first broken expectation.
+    """
+    stages = {}
+    fast_backoff = {"base_delay": 0.01, "max_delay": 0.05}
+
+    with _faulty_schedule_server(num_papers, seed=seed) as server:
+        server.faults = {f"/{date}.txt": ["503", "reset"] for date in server.days}
+        result, elapsed = _fetch_days(transport.ResilientTransport(
+            transport.LiveTransport(), retries=3, deadline=transport.Deadline(10), **fast_backoff,
+        ))
+        if not isinstance(result, dict) or len(result) != len(server.days):
+            raise RuntimeError(f"transient: schedule not recovered ({result})")
+        stages["transient (503, reset)"] = [elapsed]
+
+    with _faulty_schedule_server(num_papers, seed=seed) as server:
+        server.faults = {f"/{scraper.DATES[0]}.txt": ["hang"] * 10}
+        server.hang = deadline * 3
+        result, elapsed = _fetch_days(transport.ResilientTransport(
+            transport.LiveTransport(), retries=3, deadline=transport.Deadline(deadline), **fast_backoff,
+        ))
+        if not isinstance(result, scraper.IncompleteScheduleError):
+            raise RuntimeError("hung day: a partial schedule was returned")
+        if elapsed > deadline * 1.5:
+            raise RuntimeError(f"hung day: gave up after {elapsed:.2f}s, deadline was {deadline:.2f}s")
+        stages[f"hung day (deadline {deadline:g}s)"] = [elapsed]
+
+        resilient = transport.ResilientTransport(transport.LiveTransport(), retries=3, **fast_backoff)
+        previous = transport.set_transport(resilient)
+        try:
+            with transport.fetch_deadline(deadline):
+                result, elapsed = _fetch_days(resilient)
+            if not isinstance(result, scraper.IncompleteScheduleError) or elapsed > deadline * 1.5:
+                raise RuntimeError(f"deadline scope: fetch not bounded ({elapsed:.2f}s, {result!r})")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                transport.http_get(scraper.BASE_URL.format(date=scraper.DATES[-1]), timeout=5)
+            stages["after fetch_deadline()"] = [time.perf_counter() - start]
+        except transport.DeadlineExceeded as e:
+            raise RuntimeError(f"deadline scope: the fetch deadline outlived fetch_deadline() ({e})") from e
+        finally:
+            transport.set_transport(previous)
+
+    with _faulty_schedule_server(num_papers, seed=seed) as server:
+        server.default_fault = "reset"
+        breaker = transport.CircuitBreaker(threshold=3, cooldown=0.2)
+        resilient = transport.ResilientTransport(
+            transport.LiveTransport(), retries=3, deadline=transport.Deadline(10), breaker=breaker, **fast_backoff,
+        )
+        result, elapsed = _fetch_days(resilient)
+        hits = sum(server.hits.values())
+        if not isinstance(result, scraper.IncompleteScheduleError) or hits != breaker.threshold:
+            raise RuntimeError(f"dead host: {hits} requests reached the server, expected {breaker.threshold}")
+        stages["dead host (breaker opens)"] = [elapsed]
+
+        time.sleep(breaker.cooldown)
+        url = scraper.BASE_URL.format(date=scraper.DATES[0])
+        start_hits = sum(server.hits.values())
+        barrier = threading.Barrier(8)
+
+        def call():
+            barrier.wait()
+            try:
+                resilient.get(url)
+            except Exception:
+                pass
+
+        start = time.perf_counter()
+        callers = [threading.Thread(target=call) for _ in range(barrier.parties)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in callers:
+                thread.start()
+            for thread in callers:
+                thread.join()
+        trials = sum(server.hits.values()) - start_hits
+        if trials != 1:
+            raise RuntimeError(f"dead host: {trials} concurrent requests got through the half-open breaker")
+        stages["dead host (half-open trial)"] = [time.perf_counter() - start]
+
+    return {
+        str(num_papers): {
+            "papers": num_papers,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+def run_merge_edit_checks(num_papers=300, seed=0):
+    """
+    Merge a legacy url.json download (the old page's full export, with one
+    url edited) back into url.json and check the conflict rules, timing
+    each scenario:
+
+    - no-op rewrite: enrich rewrites url.json after the download without
+      changing it; the edit must still apply.
+    - upstream change: the same url changes in url.json after the
+      download; url.json must win and the conflict be reported.
+    - bad export: an edit whose updated_at is not a number must be
+      refused with a ValueError naming the file.
+
+    Raises RuntimeError on the first broken expectation.
+    """
+    by_session = scraper.group_papers_by_session(
+        scraper.extract_technical_papers(generate_schedule_snippets(num_papers, seed=seed))
+    )
+    pid = next(iter(by_session.values()))[0].pid
+    stages = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper.write_urls_json(by_session)
+            download = json.loads(scraper.URLS_JSON_PATH.read_text(encoding="utf-8"))
+            next(e for e in download if e["id"] == pid)["url"] = "https://example.org/edited"
+            Path("download.json").write_text(json.dumps(download), encoding="utf-8")
+            now = time.time()
+            os.utime(scraper.URLS_JSON_PATH, (now - 20, now - 20))
+            os.utime("download.json", (now - 10, now - 10))
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper.write_urls_json(by_session)
+            if scraper.URLS_JSON_PATH.stat().st_mtime > now - 15:
+                raise RuntimeError("no-op rewrite: url.json was rewritten without changes")
+            applied, conflicts = scraper.merge_edit_deltas(["download.json"], dry_run=True)
+            if len(applied) != 1 or conflicts:
+                raise RuntimeError(f"no-op rewrite: applied {applied}, conflicts {conflicts}")
+            stages["merge after no-op rewrite"] = [time.perf_counter() - start]
+
+            start = time.perf_counter()
+            scraper.update_paper_meta(pid, {"url": "https://example.org/upstream"})
+            applied, conflicts = scraper.merge_edit_deltas(["download.json"], dry_run=True)
+            if applied or len(conflicts) != 1:
+                raise RuntimeError(f"upstream change: applied {applied}, conflicts {conflicts}")
+            stages["merge after upstream change"] = [time.perf_counter() - start]
+
+            start = time.perf_counter()
+            Path("bad.json").write_text(json.dumps({"edits": {pid: {"url": {
+                "value": "https://example.org/bad", "updated_at": "yesterday", "base": None,
+            }}}}), encoding="utf-8")
+            try:
+                scraper.merge_edit_deltas(["bad.json"], dry_run=True)
+            except ValueError as e:
+                if "bad.json" not in str(e):
+                    raise RuntimeError(f"bad export: error does not name the file ({e})")
+            else:
+                raise RuntimeError("bad export: a non-numeric updated_at was accepted")
+            stages["refuse bad updated_at"] = [time.perf_counter() - start]
+        finally:
+            os.chdir(cwd)
+    return {
+        str(num_papers): {
+            "papers": num_papers,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+class _StubHostHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the static files in server.files ({path: (content_type, body)});
+    anything else is a 404. Every request is counted in server.hits[path].
+    """
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        content_type, body = self.server.files.get(self.path, ("text/plain", b""))
+        try:
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # the client refused an oversized body
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def _stub_host(files):
+    """Serve files from a _StubHostHandler; yields (server, base URL)."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubHostHandler)
+    server.files = files
+    server.lock = threading.Lock()
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# (format, content type, size, colour) of the sample thumbnails.
+SAMPLE_IMAGES = [
+    ("JPEG", "image/jpeg", (64, 48), (200, 40, 40)),
+    ("PNG", "image/png", (40, 30), (30, 160, 60)),
+    ("GIF", "image/gif", (32, 32), (20, 40, 220)),
+    ("WEBP", "image/webp", (50, 20), (240, 200, 0)),
+]
+
+
+def run_thumbnail_checks(num_papers=300, seed=0):
+    """
+    Serve solid-colour JPEG/PNG/GIF/WebP thumbnails (and one 404) from a local
+    stub image host as the schedule's images, and check the thumbnail
+    pipeline, timing each scenario:
+
+    - placeholders: build_placeholders must report each image's size and
+      (within JPEG/WebP loss) its colour, and report the 404 as a failure
+      instead of raising.
+    - cached re-run: the same build must not request the cached images
+      again (only the failed one is retried).
+    - render: render_stage must publish the cached images and point the
+      cards' <img src> at the published same-origin copies, leaving the
+      404's card on its remote url.
+
+    Needs Pillow to draw the samples. Raises RuntimeError on the first
+    broken expectation.
+    """
+    import thumbnails
+
+    if thumbnails.Image is None or not thumbnails.HAVE_WEBP:
+        raise RuntimeError("--thumbnails needs Pillow with WebP support to draw the sample images")
+    files = {}
+    expected = {}
+    for fmt, content_type, size, color in SAMPLE_IMAGES:
+        buf = io.BytesIO()
+        thumbnails.Image.new("RGB", size, color).save(buf, format=fmt)
+        files[f"/img/sample.{fmt.lower()}"] = (content_type, buf.getvalue())
+        expected[f"/img/sample.{fmt.lower()}"] = (size, color)
+
+    by_session = scraper.group_papers_by_session(
+        scraper.extract_technical_papers(generate_schedule_snippets(num_papers, seed=seed))
+    )
+    papers = [paper for session_papers in by_session.values() for paper in session_papers]
+    stages = {}
+    cwd = os.getcwd()
+    with _stub_host(files) as (server, base), tempfile.TemporaryDirectory() as tmp:
+        paths = [*expected, "/img/missing.png"]
+        for i, paper in enumerate(papers):
+            paper.image = f"{base}{paths[i]}" if i < len(paths) else None
+        urls = [f"{base}{path}" for path in paths]
+        missing_url = urls[-1]
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            placeholders, failures = thumbnails.build_placeholders(urls)
+            stages["placeholders"] = [time.perf_counter() - start]
+            for path, ((width, height), color) in expected.items():
+                info = placeholders.get(f"{base}{path}")
+                if not info or (info["width"], info["height"]) != (width, height):
+                    raise RuntimeError(f"placeholders: {path} is {info and (info['width'], info['height'])}, "
+                                       f"expected {(width, height)}")
+                got = tuple(int(info["color"][i:i + 2], 16) for i in (1, 3, 5))
+                if max(abs(a - b) for a, b in zip(got, color)) > 12:
+                    raise RuntimeError(f"placeholders: {path} colour {info['color']}, expected {color}")
+            if list(failures) != [missing_url]:
+                raise RuntimeError(f"placeholders: failures {failures}, expected only the 404")
+
+            hits = dict(server.hits)
+            start = time.perf_counter()
+            placeholders, failures = thumbnails.build_placeholders(urls)
+            stages["placeholders (cached)"] = [time.perf_counter() - start]
+            refetched = {path: n - hits.get(path, 0) for path, n in server.hits.items() if n != hits.get(path, 0)}
+            if refetched != {"/img/missing.png": 1} or len(placeholders) != len(expected):
+                raise RuntimeError(f"cached re-run: requested {refetched}, expected only the 404 again")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper.write_papers_jsonl(by_session)
+                thumbnails.write_placeholders(placeholders)
+                start = time.perf_counter()
+                scraper.render_stage()
+                stages["render_stage"] = [time.perf_counter() - start]
+            page = scraper.PAPERS_HTML_PATH.read_text(encoding="utf-8")
+            published = sorted(scraper.THUMBS_STATIC_DIR.glob("*"))
+            if len(published) != len(expected):
+                raise RuntimeError(f"render: published {len(published)} thumbnails, expected {len(expected)}")
+            for path in published:
+                if f'src="{path.as_posix()}"' not in page:
+                    raise RuntimeError(f"render: no card references {path.as_posix()}")
+            if f'src="{missing_url}"' not in page or f'src="{base}/img/sample.' in page:
+                raise RuntimeError("render: cards do not use the published copies (and the 404 its remote url)")
+        finally:
+            os.chdir(cwd)
+    return {
+        str(num_papers): {
+            "papers": num_papers,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+def _sample_pdf(lines, padding=0):
+    """A minimal one-page PDF showing lines in Helvetica; padding adds a comment of that many bytes."""
+    def literal(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    content = ("BT /F1 9 Tf 11 TL 50 750 Td\n" + "".join(f"({literal(line)}) Tj T*\n" for line in lines)
+               + "ET").encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+        b" /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    if padding:
+        out += b"%" + b"x" * padding + b"\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+_SAMPLE_ABSTRACT_LINES = [
+    "We present a method for real-time neural render-",
+    "ing of dynamic scenes captured with a handheld camera. Our representation",
+    "combines Gaussian primitives with a learned deformation field, and a",
+    "differentiable rasterizer fits both from a single video in minutes while",
+    "preserving fine detail under fast motion and changing illumination.",
+]
+SAMPLE_ABSTRACT = re.sub(r"-\s(?=[a-z])", "", " ".join(_SAMPLE_ABSTRACT_LINES))
+
+
+def run_pdf_checks(max_bytes=64 * 1024):
+    """
+    Serve hand-written sample PDFs (and one 404) from a local stub host as
+    direct-PDF links and check pdf_abstracts.pdf_abstracts, timing each
+    scenario:
+
+    - first run: the abstract is found under an "Abstract" heading and in
+      the acmsmall layout (no heading, the block before CCS Concepts); a
+      paper without an abstract yields none without an error; a PDF over
+      MAX_PDF_BYTES (lowered to max_bytes here) and the 404 are reported
+      as errors.
+    - second run: only the 404 is requested again; everything else,
+      including the oversized PDF, is answered from the index.
+
+    Needs pypdf. Raises RuntimeError on the first broken expectation.
+    """
+    import pdf_abstracts
+
+    if pdf_abstracts.PdfReader is None:
+        raise RuntimeError("--pdfs needs pypdf to read the sample PDFs")
+    title = ["Dynamic Gaussian Fields for Handheld Video"]
+    files = {
+        "/pdf/heading.pdf": _sample_pdf([
+            *title, "Alice Smith, Bob Jones", "Abstract", *_SAMPLE_ABSTRACT_LINES,
+            "CCS Concepts: Computing methodologies -> Rendering.",
+        ]),
+        "/pdf/acmsmall.pdf": _sample_pdf([
+            *title, "ALICE SMITH and BOB JONES, University of Somewhere, Country", *_SAMPLE_ABSTRACT_LINES,
+            "CCS Concepts: Computing methodologies -> Rendering.",
+        ]),
+        "/pdf/no-abstract.pdf": _sample_pdf([
+            *title, "Alice Smith, Bob Jones", "1 Introduction", *_SAMPLE_ABSTRACT_LINES,
+        ]),
+        "/pdf/oversized.pdf": _sample_pdf([*title, "Abstract", *_SAMPLE_ABSTRACT_LINES], padding=max_bytes),
+    }
+    stages = {}
+    previous_max = pdf_abstracts.MAX_PDF_BYTES
+    pdf_abstracts.MAX_PDF_BYTES = max_bytes
+    try:
+        with _stub_host({path: ("application/pdf", body) for path, body in files.items()}) as (server, base), \
+                tempfile.TemporaryDirectory() as tmp:
+            paths = [*files, "/pdf/missing.pdf"]
+            urls_by_pid = {f"papers_{1000 + i}": f"{base}{path}" for i, path in enumerate(paths)}
+            pid_of = {path: pid for pid, path in zip(urls_by_pid, paths)}
+            cache_dir = Path(tmp) / "pdfs"
+
+            start = time.perf_counter()
+            abstracts, stats = pdf_abstracts.pdf_abstracts(urls_by_pid, cache_dir=cache_dir)
+            stages["pdf_abstracts"] = [time.perf_counter() - start]
+            for path in ("/pdf/heading.pdf", "/pdf/acmsmall.pdf"):
+                if abstracts.get(pid_of[path]) != SAMPLE_ABSTRACT:
+                    raise RuntimeError(f"{path}: extracted {abstracts.get(pid_of[path])!r}")
+            if len(abstracts) != 2:
+                raise RuntimeError(f"abstracts found for {sorted(abstracts)}, expected only the two with one")
+            errors = {url.removeprefix(base): error for url, error in stats["errors"].items()}
+            if sorted(errors) != ["/pdf/missing.pdf", "/pdf/oversized.pdf"] \
+                    or "ResponseTooLarge" not in errors["/pdf/oversized.pdf"]:
+                raise RuntimeError(f"errors {errors}, expected the oversized PDF and the 404")
+
+            hits = dict(server.hits)
+            start = time.perf_counter()
+            again, stats = pdf_abstracts.pdf_abstracts(urls_by_pid, cache_dir=cache_dir)
+            stages["pdf_abstracts (rerun)"] = [time.perf_counter() - start]
+            refetched = {path: n - hits.get(path, 0) for path, n in server.hits.items() if n != hits.get(path, 0)}
+            if refetched != {"/pdf/missing.pdf": 1} or again != abstracts:
+                raise RuntimeError(f"second run: requested {refetched}, expected only the 404 again")
+    finally:
+        pdf_abstracts.MAX_PDF_BYTES = previous_max
+    return {
+        str(len(files) + 1): {
+            "papers": len(files) + 1,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+class _AtomHandler(http.server.BaseHTTPRequestHandler):
+    """
+    An arXiv API stand-in: answers id_list queries with an Atom feed holding
+    an entry for each id in server.records ({id: (title, abstract)}) and
+    nothing for the rest. The size of every requested batch is appended to
+    server.batches.
+    """
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        ids = query.get("id_list", [""])[0].split(",")
+        with self.server.lock:
+            self.server.batches.append(len(ids))
+        entries = "".join(
+            f"<entry><id>http://arxiv.org/abs/{i}v2</id><title>{html_escape(title)}</title>"
+            f"<summary>\n  {html_escape(abstract)}\n</summary><arxiv:doi>10.1145/{i}</arxiv:doi></entry>"
+            for i in ids if i in self.server.records
+            for title, abstract in [self.server.records[i]]
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+            f"<title>arXiv Query</title>{entries}</feed>"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_arxiv_checks(num_ids=250, unknown=10, seed=0):
+    """
+    Hydrate num_ids arXiv links (one old-style math.GT/0309136 among them,
+    `unknown` of them not on arXiv) against a local stub of the Atom API
+    and check arxiv_meta.hydrate, timing each scenario:
+
+    - first run: ids go out in batches of BATCH_SIZE (250 ids: 100/100/50);
+      math.GT/0309136 matches the entry the API returns as math/0309136;
+      unknown ids are cached as null.
+    - second run: everything is answered from the cache, with no request.
+
+    Raises RuntimeError on the first broken expectation.
+    """
+    import arxiv_meta
+
+    rng = random.Random(seed)
+    urls = ["https://arxiv.org/abs/math.GT/0309136v1"] + [
+        f"https://arxiv.org/abs/2506.{10000 + n}v{rng.randint(1, 3)}" for n in range(num_ids - 1)
+    ]
+    ids = [arxiv_meta.arxiv_id(url) for url in urls]
+    records = {i: (f"Paper {i}", f"Abstract of {i}. " * 5) for i in ids[:len(ids) - unknown]}
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _AtomHandler)
+    server.records = records
+    server.lock = threading.Lock()
+    server.batches = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous_url = arxiv_meta.ARXIV_API_URL
+    arxiv_meta.ARXIV_API_URL = f"http://127.0.0.1:{server.server_address[1]}/api/query"
+    stages = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "arxiv_cache.json"
+            start = time.perf_counter()
+            found, requests = arxiv_meta.hydrate(ids, cache_path=cache_path, interval=0)
+            stages["hydrate"] = [time.perf_counter() - start]
+            batch_size = arxiv_meta.BATCH_SIZE
+            expected_batches = [min(batch_size, num_ids - start) for start in range(0, num_ids, batch_size)]
+            if requests != len(expected_batches) or sorted(server.batches) != sorted(expected_batches):
+                raise RuntimeError(f"batching: {requests} requests of {server.batches}, expected {expected_batches}")
+            old_style = found.get("math/0309136")
+            if not old_style or old_style["title"] != "Paper math/0309136":
+                raise RuntimeError(f"old-style id: math.GT/0309136 did not match math/0309136 ({old_style})")
+            if any(found[i] is None for i in records) or any(found[i] for i in ids if i not in records):
+                raise RuntimeError("records: a known id came back empty or an unknown one with a record")
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+            nulls = [i for i in ids if i not in records]
+            if any(i not in cache or cache[i] is not None for i in nulls):
+                raise RuntimeError("unknown ids: not cached as null")
+
+            start = time.perf_counter()
+            again, requests = arxiv_meta.hydrate(ids, cache_path=cache_path, interval=0)
+            stages["hydrate (cached)"] = [time.perf_counter() - start]
+            if requests or len(server.batches) != len(expected_batches) or again != found:
+                raise RuntimeError(f"second run: {requests} requests, expected none")
+    finally:
+        arxiv_meta.ARXIV_API_URL = previous_url
+        server.shutdown()
+        server.server_close()
+    return {
+        str(num_ids): {
+            "papers": num_ids,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+def time_meta(sizes, edits=20, seed=0):
+    """Time url.json vs sharded metadata: full scaffold rewrite, no-op rewrite, single edits and a full load."""
+    import meta_store
+
+    results = {}
+    cwd = os.getcwd()
+    for size in sizes:
+        by_session = scraper.group_papers_by_session(
+            scraper.extract_technical_papers(generate_schedule_snippets(size, seed=seed))
+        )
+        pids = [p.pid for papers in by_session.values() for p in papers]
+        edit_pids = random.Random(seed).sample(pids, min(edits, len(pids)))
+        stages = {}
+        for layout in ("file", *meta_store.LAYOUTS):
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        scraper.write_urls_json(by_session)
+                        if layout != "file":
+                            scraper.shard_meta(layout)
+                    _, t = _time_stage(lambda: scraper.write_urls_json(by_session), 1)
+                    stages[f"{layout}: rewrite (no changes)"] = t
+                    start = time.perf_counter()
+                    for pid in edit_pids:
+                        scraper.update_paper_meta(pid, {"abstract": f"edited {pid}"})
+                    stages[f"{layout}: {len(edit_pids)} edits"] = [time.perf_counter() - start]
+                    _, t = _time_stage(scraper._load_existing_meta, 1)
+                    stages[f"{layout}: load all"] = t
+                finally:
+                    os.chdir(cwd)
+        results[str(size)] = {
+            "papers": len(pids),
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    return results
+
+
+def time_browser(num_pages=40, pool_sizes=(1, 4, 8)):
+    """Time browser_fetch.fetch_rendered on locally served JS pages, per pool size and from cache."""
+    import browser_fetch
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _LandingPageHandler)
+    server.blocked_hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/doi/10.1145/3757377.{3000 + i}" for i in range(num_pages)]
+    stages = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for pool_size in pool_sizes:
+                cache_dir = Path(tmp) / f"pool{pool_size}"
+                start = time.perf_counter()
+                records, stats = browser_fetch.fetch_rendered(urls, pool_size=pool_size, cache_dir=cache_dir)
+                stages[f"browser pool={pool_size}"] = [time.perf_counter() - start]
+                if stats["errors"] or sum(1 for r in records.values() if r["abstract"]) != num_pages:
+                    raise RuntimeError(f"pool={pool_size}: {len(stats['errors'])} errors, abstracts missing")
+            start = time.perf_counter()
+            browser_fetch.fetch_rendered(urls, cache_dir=cache_dir)
+            stages["browser (cached)"] = [time.perf_counter() - start]
+    finally:
+        server.shutdown()
+    if server.blocked_hits:
+        print(f"WARNING: {server.blocked_hits} blocked resources reached the server")
+    return {
+        str(num_pages): {
+            "papers": num_pages,
+            "stages": {name: {"min": min(t), "median": statistics.median(t)} for name, t in stages.items()},
+        }
+    }
+
+
+def synthetic_abstracts(papers, words_per_abstract=80, vocab_size=20000, topic_share=0.7, seed=0):
+    """
+    papers_#### -> synthetic abstract.
+
+    Words are drawn Zipf-style, topic_share of them from a vocabulary slice
+    owned by the paper's session and the rest from the shared vocabulary, so
+    sessions are topical the way real abstracts are.
+    """
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    weights = [1 / (rank + 1) for rank in range(vocab_size)]
+    topic_size = 400
+    topic_weights = weights[:topic_size]
+    topics = {}
+
+    abstracts = {}
+    for p in papers:
+        if p.session_id not in topics:
+            offset = rng.randrange(vocab_size - topic_size)
+            topics[p.session_id] = vocab[offset:offset + topic_size]
+        n_topic = int(words_per_abstract * topic_share)
+        words = rng.choices(topics[p.session_id], weights=topic_weights, k=n_topic)
+        words += rng.choices(vocab, weights=weights, k=words_per_abstract - n_topic)
+        abstracts[p.pid] = " ".join(words)
+    return abstracts
+
+
+def time_related(sizes, k=5, repeat=1, seed=0):
+    """Time analysis.related_papers (TF-IDF + batched top-k) on synthetic papers."""
+    import analysis
+
+    results = {}
+    for size in sizes:
+        papers = scraper.extract_technical_papers(generate_schedule_snippets(size, seed=seed))
+        abstracts = synthetic_abstracts(papers, seed=seed)
+        _, timings = _time_stage(lambda: analysis.related_papers(papers, abstracts, k=k), repeat)
+        results[str(size)] = {
+            "papers": len(papers),
+            "stages": {"related_papers": {"min": min(timings), "median": statistics.median(timings)}},
+        }
+    return results
+
+
+def _fresh(text):
+    # A new, un-interned copy, as every regex match group used to produce.
+    return text.encode("utf-8").decode("utf-8")
+
+
+def _as_dicts(papers):
+    return [
+        {
+            "id": _fresh(p.id),
+            "session_id": _fresh(p.session_id),
+            "title": _fresh(p.title),
+            "authors": [_fresh(a) for a in p.authors],
+            "image": _fresh(p.image) if p.image else None,
+        }
+        for p in papers
+    ]
+
+
+def _retained_bytes(build):
+    """(bytes still allocated after build() returns, len(result))."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, len(result)
+
+
+def measure_memory(sizes, seed=0):
+    """Bytes retained by Paper records vs equivalent per-paper dicts."""
+    results = {}
+    for size in sizes:
+        html_content = generate_schedule_snippets(size, seed=seed)
+        # Warm up (regex caches etc.); the result is dropped, so its
+        # interned strings are freed with it.
+        scraper.extract_technical_papers(html_content)
+        # Both variants parse inside the traced region, so the interned
+        # strings the parse allocates are counted instead of being reused
+        # from an untraced earlier parse.
+        dict_bytes, num_papers = _retained_bytes(lambda: _as_dicts(scraper.extract_technical_papers(html_content)))
+        record_bytes, _ = _retained_bytes(lambda: scraper.extract_technical_papers(html_content))
+        results[str(size)] = {"papers": num_papers, "dict_bytes": dict_bytes, "record_bytes": record_bytes}
+    return results
+
+
+def _print_memory(results):
+    print(f"{'size':>7}  {'dicts (KiB)':>12} {'Paper (KiB)':>12} {'saving':>8}")
+    for size, entry in results.items():
+        saving = 1 - entry["record_bytes"] / entry["dict_bytes"] if entry["dict_bytes"] else 0
+        print(
+            f"{size:>7}  {entry['dict_bytes'] / 1024:12.0f} "
+            f"{entry['record_bytes'] / 1024:12.0f} {saving:8.0%}"
+        )
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of (size, stage, baseline_s, current_s) regressions."""
+    regressions = []
+    for size, entry in results.items():
+        base_entry = baseline.get(size)
+        if not base_entry:
+            continue
+        for stage, timing in entry["stages"].items():
+            base = base_entry["stages"].get(stage)
+            if base and timing["min"] > base["min"] * threshold:
+                regressions.append((size, stage, base["min"], timing["min"]))
+    return regressions
+
+
+def _load_json(path):
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _print_results(results, baseline):
+    print(f"{'size':>7}  {'stage':<26} {'min (ms)':>10} {'median (ms)':>12} {'baseline':>10}")
+    for size, entry in results.items():
+        for stage, timing in entry["stages"].items():
+            base = baseline.get(size, {}).get("stages", {}).get(stage)
+            base_str = f"{base['min'] * 1000:10.1f}" if base else f"{'-':>10}"
+            print(
+                f"{size:>7}  {stage:<26} {timing['min'] * 1000:10.1f} "
+                f"{timing['median'] * 1000:12.1f} {base_str}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper pipeline on synthetic schedules.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="flag a stage whose min time exceeds baseline * threshold")
+    parser.add_argument("--output", type=Path, default=BENCH_RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=BENCH_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--memory", action="store_true",
+                        help="compare memory of Paper records vs per-paper dicts and exit")
+    parser.add_argument("--related", action="store_true",
+                        help="time the related-papers stage (needs numpy/scipy) and exit")
+    parser.add_argument("--end-to-end", action="store_true",
+                        help="time a full build over replayed HTTP fixtures and exit")
+    parser.add_argument("--latency", type=float, default=0, metavar="MS",
+                        help="simulated latency per replayed request (with --end-to-end)")
+    parser.add_argument("--export", nargs="*", metavar="FORMAT",
+                        help="time the export writers (default: all formats) and exit")
+    parser.add_argument("--browser", type=int, nargs="?", const=40, metavar="PAGES",
+                        help="time the headless-browser pool on PAGES local pages (needs playwright) and exit")
+    parser.add_argument("--meta", action="store_true",
+                        help="time url.json vs sharded metadata rewrites and edits and exit")
+    parser.add_argument("--faults", action="store_true",
+                        help="check retries, the deadline and the circuit breaker against a fault-injecting "
+                             "local stub server and exit")
+    parser.add_argument("--merge-edits", action="store_true",
+                        help="check merge-edits on a legacy url.json download and exit")
+    parser.add_argument("--thumbnails", action="store_true",
+                        help="check thumbnail placeholders and publishing against a local stub image host "
+                             "(needs Pillow) and exit")
+    parser.add_argument("--pdfs", action="store_true",
+                        help="check PDF abstract extraction against a local stub host of sample PDFs "
+                             "(needs pypdf) and exit")
+    parser.add_argument("--arxiv", action="store_true",
+                        help="check batched arXiv metadata lookups against a local stub Atom endpoint and exit")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        _print_memory(measure_memory(args.sizes, seed=args.seed))
+        return 0
+    if args.related:
+        _print_results(time_related(args.sizes, repeat=args.repeat, seed=args.seed), {})
+        return 0
+    if args.meta:
+        _print_results(time_meta(args.sizes), {})
+        return 0
+    if args.merge_edits:
+        _print_results(run_merge_edit_checks(args.sizes[0], seed=args.seed), {})
+        return 0
+    if args.thumbnails:
+        _print_results(run_thumbnail_checks(args.sizes[0], seed=args.seed), {})
+        return 0
+    if args.pdfs:
+        _print_results(run_pdf_checks(), {})
+        return 0
+    if args.arxiv:
+        _print_results(run_arxiv_checks(seed=args.seed), {})
+        return 0
+    if args.faults:
+        _print_results(run_fault_scenarios(args.sizes[0], seed=args.seed), {})
+        return 0
+    if args.browser:
+        _print_results(time_browser(args.browser), {})
+        return 0
+    if args.export is not None:
+        _print_results(time_export(args.sizes, formats=args.export, repeat=args.repeat, seed=args.seed), {})
+        return 0
+    if args.end_to_end:
+        results = time_end_to_end(args.sizes, repeat=args.repeat, seed=args.seed, latency=args.latency / 1000)
+        _print_results(results, {})
+        return 0
+
+    results = run_benchmarks(args.sizes, repeat=args.repeat, seed=args.seed)
+    baseline = _load_json(args.baseline)
+    _print_results(results, baseline)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for size, stage, base, current in regressions:
+        print(f"REGRESSION: {stage} @ {size} papers: {base * 1000:.1f} ms -> {current * 1000:.1f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
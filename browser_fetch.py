@@ -0,0 +1,194 @@
+"""
+Headless-browser fetches for metadata pages that only render with JavaScript.
+
+One Chromium instance is launched per run and shared by a bounded pool of
+browser contexts, each keeping one page that is navigated from URL to URL,
+so a few hundred pages cost one browser start-up rather than one each.
+Images, media, fonts and known tracker hosts are aborted at the routing
+layer; only the document, its scripts/styles and XHR are loaded.
+
+The extracted DOM text (title, body text, abstract candidates) is cached
+per URL under build/browser/, so later runs only open pages they have not
+rendered yet (failed loads are retried). Bumping EXTRACTOR_VERSION
+invalidates the cache.
+
+These requests bypass transport.py (record/replay does not apply).
+Playwright is optional: pip install playwright && playwright install chromium.
+"""
+
+import re
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from fsutil import write_json_atomic
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+except ImportError:  # optional: pip install playwright
+    async_playwright = None
+    PlaywrightTimeout = TimeoutError
+
+BROWSER_CACHE_DIR = Path("build") / "browser"
+EXTRACTOR_VERSION = 1
+
+POOL_SIZE = 4
+PAGE_TIMEOUT = 30.0
+NETWORK_IDLE_TIMEOUT = 5.0
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "hotjar.com", "scorecardresearch.com", "newrelic.com", "nr-data.net",
+    "crazyegg.com", "adobedtm.com", "omtrdc.net", "demdex.net", "hs-analytics.net",
+)
+
+# Abstract candidates in order of preference: ACM DL / publisher sections
+# first, then the citation meta tags most publishers emit.
+ABSTRACT_SELECTORS = (
+    "section#abstract", "div.abstractSection", "#abstract", "section.abstract", "div.abstract",
+    "meta[name='citation_abstract']", "meta[name='dc.Description']", "meta[property='og:description']",
+)
+EXTRACT_JS = """
+(selectors) => {
+  const candidates = selectors.map((sel) => {
+    const el = document.querySelector(sel);
+    return el ? (el.getAttribute("content") || el.innerText || "") : "";
+  });
+  return {title: document.title, text: document.body ? document.body.innerText : "", candidates};
+}
+"""
+MIN_ABSTRACT_CHARS = 200
+
+
+def is_blocked(resource_type, url):
+    """Whether the router should abort a request of this type to url."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+
+def pick_abstract(candidates):
+    """First candidate long enough to be an abstract (not a teaser description), cleaned."""
+    for text in candidates:
+        text = re.sub(r"\s+", " ", text or "").strip()
+        text = re.sub(r"^abstract\s*[:.]?\s*", "", text, flags=re.IGNORECASE)
+        if len(text) >= MIN_ABSTRACT_CHARS:
+            return text
+    return None
+
+
+def _cache_path(url, cache_dir):
+    return cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.json"
+
+
+def load_cached(url, cache_dir=BROWSER_CACHE_DIR):
+    try:
+        with open(_cache_path(url, cache_dir), "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except Exception:
+        return None
+    return record if record.get("version") == EXTRACTOR_VERSION and record.get("url") == url else None
+
+
+def _store(record, cache_dir):
+    write_json_atomic(_cache_path(record["url"], cache_dir), record, indent=None)
+
+
+async def _route(route):
+    request = route.request
+    if is_blocked(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _render(page, url, timeout):
+    response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT * 1000)
+    except PlaywrightTimeout:
+        pass  # pages with polling never go idle; take what has rendered by now
+    data = await page.evaluate(EXTRACT_JS, list(ABSTRACT_SELECTORS))
+    return {
+        "url": url,
+        "version": EXTRACTOR_VERSION,
+        "status": response.status if response else None,
+        "final_url": page.url,
+        "title": data["title"],
+        "text": data["text"],
+        "abstract": pick_abstract(data["candidates"]),
+    }
+
+
+async def _render_all(urls, pool_size, timeout):
+    """{url: record or exception}, rendering at most pool_size pages at a time."""
+    results = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            pool = asyncio.Queue()
+            for _ in range(min(pool_size, len(urls))):
+                context = await browser.new_context(service_workers="block")
+                await context.route("**/*", _route)
+                pool.put_nowait((context, await context.new_page()))
+
+            async def worker(url):
+                context, page = await pool.get()
+                try:
+                    results[url] = await _render(page, url, timeout)
+                except Exception as e:
+                    results[url] = e
+                    # A page left mid-navigation or crashed is not worth reusing.
+                    await page.close()
+                    page = await context.new_page()
+                finally:
+                    pool.put_nowait((context, page))
+
+            await asyncio.gather(*(worker(url) for url in urls))
+        finally:
+            await browser.close()
+    return results
+
+
+def fetch_rendered(urls, pool_size=POOL_SIZE, timeout=PAGE_TIMEOUT, cache_dir=BROWSER_CACHE_DIR):
+    """
+    Rendered DOM text for urls: returns ({url: record}, stats).
+
+    A record is {"url", "status", "final_url", "title", "text", "abstract"}.
+    Cached URLs are answered without starting the browser; pages that fail
+    to load (or answer with an HTTP error) are reported in stats["errors"]
+    and not cached.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    urls = sorted(set(urls))
+    records = {}
+    for url in urls:
+        record = load_cached(url, cache_dir)
+        if record is not None:
+            records[url] = record
+    pending = [url for url in urls if url not in records]
+
+    errors = {}
+    start = time.perf_counter()
+    if pending:
+        for url, result in asyncio.run(_render_all(pending, pool_size, timeout)).items():
+            if isinstance(result, Exception):
+                errors[url] = f"{type(result).__name__}: {str(result).splitlines()[0] if str(result) else ''}"
+            elif result["status"] is not None and result["status"] >= 400:
+                errors[url] = f"HTTP {result['status']}"
+            else:
+                records[url] = result
+                _store(result, cache_dir)
+    stats = {
+        "pages": len(urls),
+        "cached": len(urls) - len(pending),
+        "rendered": len(pending) - len(errors),
+        "errors": errors,
+        "seconds": time.perf_counter() - start,
+    }
+    return records, stats
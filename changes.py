@@ -0,0 +1,136 @@
+"""
+Change feed between scraper runs.
+
+Each build hashes the upstream fields of every paper (title, session,
+authors, thumbnail) into a snapshot keyed by paper id. The next build diffs
+its papers against that snapshot with two dict lookups per paper -- O(n),
+no pairwise comparison -- and writes the delta as a JSON feed:
+
+    {
+      "generated_at": "...", "previous": "...",
+      "summary": {"added": 1, "removed": 0, "changed": 2, "unchanged": 298},
+      "added":   [{"id": "papers_1234", "title": ..., "session": ..., ...}],
+      "removed": [{"id": ..., ...}],
+      "changed": [{"id": ..., "fields": {"session": {"old": ..., "new": ...}}}]
+    }
+
+Only the upstream schedule is tracked; url.json edits are local and do not
+show up in the feed.
+"""
+
+import json
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fsutil import write_json_atomic
+
+SNAPSHOT_PATH = Path("schedule_snapshot.json")
+CHANGES_PATH = Path("changes.json")
+
+TRACKED_FIELDS = ("title", "session", "authors", "image")
+
+
+def paper_record(paper, session_name):
+    """Upstream fields of a paper as a JSON-ready dict."""
+    return {
+        "title": paper.title,
+        "session": session_name,
+        "authors": list(paper.authors),
+        "image": paper.image,
+    }
+
+
+def record_hash(record):
+    payload = json.dumps([record.get(f) for f in TRACKED_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_snapshot(papers_by_session):
+    """papers_#### -> {"hash": ..., **record} for the current run."""
+    snapshot = {}
+    for session_name, papers in papers_by_session.items():
+        for paper in papers:
+            record = paper_record(paper, session_name)
+            snapshot[paper.pid] = {"hash": record_hash(record), **record}
+    return snapshot
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Return (generated_at, papers) from the last run, or (None, None) if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("generated_at"), data["papers"]
+    except Exception:
+        return None, None
+
+
+def diff_snapshots(old, new):
+    """Added / removed / changed papers between two snapshots, plus an unchanged count."""
+    added, changed = [], []
+    unchanged = 0
+    for pid, entry in new.items():
+        previous = old.get(pid)
+        if previous is None:
+            added.append({"id": pid, **{f: entry[f] for f in TRACKED_FIELDS}})
+        elif previous.get("hash") == entry["hash"]:
+            unchanged += 1
+        else:
+            fields = {
+                f: {"old": previous.get(f), "new": entry[f]}
+                for f in TRACKED_FIELDS
+                if previous.get(f) != entry[f]
+            }
+            changed.append({"id": pid, "fields": fields})
+    removed = [
+        {"id": pid, **{f: entry.get(f) for f in TRACKED_FIELDS}}
+        for pid, entry in old.items()
+        if pid not in new
+    ]
+    return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+
+def update_change_feed(papers_by_session, snapshot_path=SNAPSHOT_PATH, feed_path=CHANGES_PATH):
+    """
+    Diff this run against the previous snapshot, write the feed, then the new snapshot.
+
+    The first run (no snapshot yet) reports every paper as added. Returns the
+    feed dict.
+    """
+    generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    previous_at, old = load_snapshot(snapshot_path)
+    new = build_snapshot(papers_by_session)
+    diff = diff_snapshots(old or {}, new)
+
+    feed = {
+        "generated_at": generated_at,
+        "previous": previous_at,
+        "summary": {
+            "added": len(diff["added"]),
+            "removed": len(diff["removed"]),
+            "changed": len(diff["changed"]),
+            "unchanged": diff["unchanged"],
+        },
+        "added": diff["added"],
+        "removed": diff["removed"],
+        "changed": diff["changed"],
+    }
+    write_json_atomic(feed_path, feed)
+    write_json_atomic(snapshot_path, {"generated_at": generated_at, "papers": new})
+    return feed
+
+
+def print_change_summary(feed, limit=10):
+    s = feed["summary"]
+    since = f" since {feed['previous']}" if feed["previous"] else " (first snapshot)"
+    print(f"Changes{since}: {s['added']} added, {s['removed']} removed, "
+          f"{s['changed']} changed, {s['unchanged']} unchanged")
+    if not feed["previous"]:
+        return
+    for item in feed["added"][:limit]:
+        print(f"  + {item['id']}: {item['title']}")
+    for item in feed["removed"][:limit]:
+        print(f"  - {item['id']}: {item['title']}")
+    for item in feed["changed"][:limit]:
+        print(f"  ~ {item['id']}: {', '.join(item['fields'])}")
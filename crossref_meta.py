@@ -0,0 +1,124 @@
+"""
+Batched Crossref work records for papers with a known DOI.
+
+DOIs come from url.json links (doi.org / dl.acm.org/doi/...) and from the
+title -> DOI matches already in crossref_cache.json. Uncached DOIs are
+fetched with /works filter queries of BATCH_SIZE DOIs each
+(filter=doi:A,doi:B,...), so a whole conference takes a handful of
+requests.
+
+Records are kept compactly in crossref_works.json:
+{doi: {"title", "authors": [...], "published", "url", "abstract"}}, or null
+for DOIs Crossref does not return.
+"""
+
+import os
+import re
+import json
+import time
+from pathlib import Path
+from html import unescape
+from urllib.parse import urlencode
+
+import transport
+from fsutil import write_json_atomic
+
+CROSSREF_API_URL = "https://api.crossref.org/works"
+CROSSREF_CACHE_PATH = Path("crossref_cache.json")
+CROSSREF_WORKS_PATH = Path("crossref_works.json")
+
+BATCH_SIZE = 50
+REQUEST_INTERVAL = 1.0
+SELECT_FIELDS = "DOI,title,author,published,URL,abstract"
+
+DOI_RE = re.compile(r"\b(10\.\d{4,9}/[^\s?#\"<>]+)", re.IGNORECASE)
+
+
+def doi_from_url(url):
+    """The DOI in a doi.org / publisher URL, lowercased, or None."""
+    match = DOI_RE.search(url)
+    return match.group(1).rstrip(".").lower() if match else None
+
+
+def title_key(title):
+    """Normalized title, as used for the keys of crossref_cache.json."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", title.lower()).split())
+
+
+def load_title_matches(path=CROSSREF_CACHE_PATH):
+    """title_key -> DOI for the titles crossref_cache.json resolved."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    return {
+        key: entry["doi"].lower() for key, entry in data.items()
+        if isinstance(entry, dict) and entry.get("status") == "found" and entry.get("doi")
+    }
+
+
+def _plain_abstract(jats):
+    text = unescape(re.sub(r"<[^>]+>", " ", jats or ""))
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"^abstract\s*[:.]?\s*", "", text, flags=re.IGNORECASE)
+
+
+def compact_record(item):
+    """The fields the pipeline uses from a Crossref work item."""
+    parts = (item.get("published") or {}).get("date-parts") or [[]]
+    authors = [
+        " ".join(filter(None, [a.get("given"), a.get("family")])) or a.get("name", "")
+        for a in item.get("author", [])
+    ]
+    return {
+        "title": " ".join((item.get("title") or [""])[0].split()),
+        "authors": [a for a in authors if a],
+        "published": "-".join(f"{p:02d}" for p in parts[0]) or None,
+        "url": item.get("URL") or f"https://doi.org/{item['DOI']}",
+        "abstract": _plain_abstract(item.get("abstract")),
+    }
+
+
+def load_works(path=CROSSREF_WORKS_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_works(works, path=CROSSREF_WORKS_PATH):
+    write_json_atomic(path, works, indent=1, sort_keys=True)
+
+
+def hydrate(dois, works_path=CROSSREF_WORKS_PATH, batch_size=BATCH_SIZE, interval=None, mailto=None):
+    """
+    Work records for DOIs: returns ({doi: record or None}, requests made).
+
+    mailto (or $CROSSREF_MAILTO) is sent so Crossref routes the requests to
+    its "polite" pool. The cache is saved after every batch.
+    """
+    interval = REQUEST_INTERVAL if interval is None else interval
+    mailto = mailto or os.environ.get("CROSSREF_MAILTO")
+    works = load_works(works_path)
+    missing = sorted({d for d in dois if d not in works})
+    requests = 0
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        if requests:
+            time.sleep(interval)
+        params = {
+            "filter": ",".join(f"doi:{d}" for d in batch),
+            "rows": len(batch),
+            "select": SELECT_FIELDS,
+        }
+        if mailto:
+            params["mailto"] = mailto
+        data = json.loads(transport.http_get(f"{CROSSREF_API_URL}?{urlencode(params)}", timeout=60).body)
+        requests += 1
+        found = {item["DOI"].lower(): compact_record(item) for item in data["message"]["items"]}
+        for d in batch:
+            works[d] = found.get(d)
+        _write_works(works, works_path)
+    return {d: works.get(d) for d in dois}, requests
@@ -0,0 +1,248 @@
+"""
+Single-pass export of the parsed papers to other formats.
+
+export_papers() walks the grouped papers once, joins each with its url.json
+metadata and DOI, and hands the resulting record to every selected writer,
+so adding a format never adds another pass over the data:
+
+- json:  normalized records as one JSON array
+- csv:   one row per paper (authors joined with "; ")
+- md:    Markdown list grouped by session
+- bib:   BibTeX entries, with DOIs from url.json links / crossref_cache.json
+- ics:   iCalendar, one all-day event per session and conference day
+
+Usage:
+    python scraper.py export                      # all formats into export/
+    python scraper.py export --format csv --format bib
+"""
+
+import csv
+import contextlib
+import json
+import re
+import time
+from datetime import date as Date, timedelta
+from pathlib import Path
+
+from fsutil import atomic_open
+
+EXPORT_DIR = Path("export")
+CONFERENCE = "SIGGRAPH Asia 2025"
+PROCEEDINGS_DOI_PREFIX = "10.1145/3757377."
+
+FIELDS = ("id", "session_id", "session", "date", "title", "authors", "url", "doi", "abstract", "image")
+
+
+class JsonWriter:
+    suffix = ".json"
+
+    def __init__(self, f):
+        self.f = f
+        self.first = True
+        f.write("[")
+
+    def write(self, record):
+        self.f.write("\n  " if self.first else ",\n  ")
+        self.f.write(json.dumps(record, ensure_ascii=False))
+        self.first = False
+
+    def close(self):
+        self.f.write("\n]\n")
+
+
+class CsvWriter:
+    suffix = ".csv"
+
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(FIELDS)
+
+    def write(self, record):
+        self.writer.writerow([
+            "; ".join(record[k]) if k == "authors" else (record[k] or "") for k in FIELDS
+        ])
+
+    def close(self):
+        pass
+
+
+def _md_escape(text):
+    return re.sub(r"([\\`*_\[\]<>|])", r"\\\1", text)
+
+
+class MarkdownWriter:
+    suffix = ".md"
+
+    def __init__(self, f):
+        self.f = f
+        self.session = None
+        f.write(f"# {CONFERENCE} Technical Papers\n")
+
+    def write(self, record):
+        if record["session"] != self.session:
+            self.session = record["session"]
+            day = f" ({record['date']})" if record["date"] else ""
+            self.f.write(f"\n## {_md_escape(self.session)}{day}\n\n")
+        title = _md_escape(record["title"])
+        line = f"- [{title}]({record['url']})" if record["url"] else f"- {title}"
+        if record["authors"]:
+            line += " — " + _md_escape(", ".join(record["authors"]))
+        self.f.write(line + "\n")
+
+    def close(self):
+        pass
+
+
+BIBTEX_ESCAPES = {c: "\\" + c for c in "&%$#_{}"}
+BIBTEX_ESCAPES.update({"~": r"\textasciitilde{}", "^": r"\textasciicircum{}", "\\": r"\textbackslash{}"})
+
+
+def _bib_escape(text):
+    return "".join(BIBTEX_ESCAPES.get(c, c) for c in text)
+
+
+class BibtexWriter:
+    suffix = ".bib"
+
+    def __init__(self, f):
+        self.f = f
+        self.keys = set()
+
+    def _key(self, record):
+        surname = record["authors"][0].split()[-1] if record["authors"] else "anon"
+        word = next((w for w in re.findall(r"[A-Za-z]+", record["title"]) if len(w) > 3), "paper")
+        key = re.sub(r"[^a-z0-9]", "", f"{surname}2025{word}".lower())
+        if key in self.keys:
+            key = f"{key}_{record['id'].removeprefix('papers_')}"
+        self.keys.add(key)
+        return key
+
+    def write(self, record):
+        doi = record["doi"]
+        if doi and not doi.startswith(PROCEEDINGS_DOI_PREFIX):
+            kind, venue = "article", ("journal", "ACM Transactions on Graphics")
+        else:
+            kind, venue = "inproceedings", ("booktitle", f"{CONFERENCE} Conference Papers")
+        fields = [
+            ("title", "{" + _bib_escape(record["title"]) + "}"),
+            ("author", " and ".join(_bib_escape(a) for a in record["authors"])),
+            venue,
+            ("year", "2025"),
+            ("publisher", "ACM"),
+            ("doi", doi),
+            ("url", record["url"]),
+        ]
+        body = ",\n".join(f"  {name} = {{{value}}}" for name, value in fields if value)
+        self.f.write(f"@{kind}{{{self._key(record)},\n{body}\n}}\n\n")
+
+    def close(self):
+        pass
+
+
+def _ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1) without splitting UTF-8 sequences."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+class IcalWriter:
+    """One all-day VEVENT per (session, day), listing the session's papers."""
+
+    suffix = ".ics"
+
+    def __init__(self, f):
+        self.f = f
+        self.current = None
+        self.titles = []
+        self.stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//siggraph2025//papers export//EN\r\n")
+        f.write(_ics_fold(f"X-WR-CALNAME:{_ics_escape(CONFERENCE + ' Technical Papers')}"))
+
+    def _flush(self):
+        if self.current is None:
+            return
+        session_id, session, day = self.current
+        start = Date.fromisoformat(day)
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{session_id}-{start:%Y%m%d}@siggraph-asia-2025",
+            f"DTSTAMP:{self.stamp}",
+            f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{start + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_ics_escape(session)}",
+            f"DESCRIPTION:{_ics_escape(chr(10).join(self.titles))}",
+            "END:VEVENT",
+        ]
+        self.f.write("".join(_ics_fold(line) for line in lines))
+
+    def write(self, record):
+        if not record["date"]:
+            return
+        key = (record["session_id"], record["session"], record["date"])
+        if key != self.current:
+            self._flush()
+            self.current, self.titles = key, []
+        self.titles.append(record["title"])
+
+    def close(self):
+        self._flush()
+        self.f.write("END:VCALENDAR\r\n")
+
+
+WRITERS = {"json": JsonWriter, "csv": CsvWriter, "md": MarkdownWriter, "bib": BibtexWriter, "ics": IcalWriter}
+
+
+def export_records(papers_by_session, meta_map, doi_for):
+    """Yield one normalized record per paper, in page order."""
+    for session_name, papers in papers_by_session.items():
+        for paper in papers:
+            meta = meta_map.get(paper.pid, {})
+            url = (meta.get("url") or "").strip()
+            yield {
+                "id": paper.pid,
+                "session_id": paper.session_id,
+                "session": session_name,
+                "date": paper.date,
+                "title": paper.title,
+                "authors": list(paper.authors),
+                "url": url,
+                "doi": doi_for(paper, url),
+                "abstract": (meta.get("abstract") or "").strip(),
+                "image": paper.image,
+            }
+
+
+def export_papers(papers_by_session, meta_map, doi_for, formats=tuple(WRITERS), out_dir=EXPORT_DIR, stem="papers"):
+    """
+    Write every selected format in one pass over the papers.
+
+    Each writer gets its own buffered file; temp files are renamed into place
+    only after all writers finished. Returns the written paths.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    targets = {fmt: out_dir / f"{stem}{WRITERS[fmt].suffix}" for fmt in formats}
+    with contextlib.ExitStack() as stack:
+        writers = [
+            WRITERS[fmt](stack.enter_context(atomic_open(path, newline="", buffering=1 << 20)))
+            for fmt, path in targets.items()
+        ]
+        for record in export_records(papers_by_session, meta_map, doi_for):
+            for writer in writers:
+                writer.write(record)
+        for writer in writers:
+            writer.close()
+    return list(targets.values())
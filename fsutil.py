@@ -0,0 +1,51 @@
+"""
+Atomic file writes shared by every stage.
+
+Content goes to a uniquely named temp file in the target's directory and is
+moved into place with os.replace, so readers (the watch server, the next
+stage, a static host) never see a partially written file, and concurrent
+writers of the same path never share a temp file. On error the temp file is
+removed and the previous file is left untouched.
+"""
+
+import os
+import json
+import tempfile
+import contextlib
+from pathlib import Path
+
+# mkstemp creates 0600 files; published pages and assets need the usual mode.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    """open() a temp file next to path (text mode defaults to UTF-8); it replaces path on a clean exit."""
+    path = Path(path)
+    if "b" not in mode:
+        kwargs.setdefault("encoding", "utf-8")
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if hasattr(os, "fchmod"):  # not on Windows
+            os.fchmod(fd, 0o666 & ~_UMASK)
+        with open(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_atomic(path, data):
+    """Write str (as UTF-8) or bytes to path atomically."""
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+
+
+def write_json_atomic(path, data, indent=2, **kwargs):
+    """json.dump data to path atomically (non-ASCII kept as is)."""
+    kwargs.setdefault("ensure_ascii", False)
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent, **kwargs)
@@ -0,0 +1,145 @@
+"""
+Content-addressed history of pipeline runs.
+
+Every run stores the files it produced or read (raw schedule snippets,
+papers.jsonl, url.json or its shards, related/authors/placeholder maps,
+API caches) as objects named by the SHA-256 of their content:
+
+    history/objects/ab/cdef....xz     lzma-compressed file content
+    history/runs.jsonl                one line per run: {"run", "created_at",
+                                      "command", "bytes", "files": {path: sha256}}
+
+A file that did not change since an earlier run is stored once, so a run
+that only refreshed a few abstracts costs the size of those changes plus
+one index line. restore() writes a run's files back into a directory, from
+which `render` (or `parse`) reproduces that build without the network.
+"""
+
+import json
+import lzma
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fsutil import atomic_open, write_atomic
+
+HISTORY_DIR = Path("history")
+OBJECTS_DIRNAME = "objects"
+RUNS_FILENAME = "runs.jsonl"
+
+
+def _object_path(digest, history_dir):
+    return history_dir / OBJECTS_DIRNAME / digest[:2] / f"{digest[2:]}.xz"
+
+
+def store_object(data, history_dir=HISTORY_DIR):
+    """Store bytes (once per content); returns (sha256, bytes written to disk)."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest, history_dir)
+    if path.exists():
+        return digest, 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compressed = lzma.compress(data)
+    write_atomic(path, compressed)
+    return digest, len(compressed)
+
+
+def load_object(digest, history_dir=HISTORY_DIR):
+    data = lzma.decompress(_object_path(digest, history_dir).read_bytes())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"history object {digest} is corrupt")
+    return data
+
+
+def load_runs(history_dir=HISTORY_DIR):
+    """All recorded runs, oldest first."""
+    try:
+        with open(history_dir / RUNS_FILENAME, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def find_run(run_id, history_dir=HISTORY_DIR):
+    """The run whose id is run_id (or starts with it); "latest" is the newest run."""
+    runs = load_runs(history_dir)
+    if run_id == "latest" and runs:
+        return runs[-1]
+    matches = [run for run in runs if run["run"].startswith(run_id)]
+    if len(matches) != 1:
+        raise LookupError(f"{len(matches)} runs match {run_id!r} in {history_dir / RUNS_FILENAME}")
+    return matches[0]
+
+
+def record_run(paths, command, history_dir=HISTORY_DIR):
+    """
+    Store the existing files among paths and append a run to the index.
+
+    Returns (run, new_bytes): the index entry and the compressed bytes this
+    run added to the object store (0 when nothing changed).
+    """
+    history_dir.mkdir(parents=True, exist_ok=True)
+    files = {}
+    total_bytes = 0
+    new_bytes = 0
+    for path in sorted(Path(p) for p in paths):
+        if not path.is_file():
+            continue
+        data = path.read_bytes()
+        digest, written = store_object(data, history_dir)
+        files[path.as_posix()] = digest
+        total_bytes += len(data)
+        new_bytes += written
+
+    now = datetime.now(timezone.utc)
+    fingerprint = hashlib.sha256(json.dumps(files, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    run = {
+        "run": f"{now:%Y%m%dT%H%M%SZ}-{fingerprint}",
+        "created_at": now.isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "command": command,
+        "bytes": total_bytes,
+        "files": files,
+    }
+    with open(history_dir / RUNS_FILENAME, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, ensure_ascii=False) + "\n")
+    return run, new_bytes
+
+
+def restore(run, dest_dir, history_dir=HISTORY_DIR):
+    """Write a run's files under dest_dir (relative paths preserved); returns the written paths."""
+    written = []
+    for rel_path, digest in run["files"].items():
+        path = Path(dest_dir) / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(load_object(digest, history_dir))
+        written.append(path)
+    return written
+
+
+def storage_stats(history_dir=HISTORY_DIR):
+    """{"runs", "objects", "stored_bytes", "logical_bytes"}: disk used vs the size of plain copies."""
+    objects = list((history_dir / OBJECTS_DIRNAME).glob("*/*.xz"))
+    runs = load_runs(history_dir)
+    return {
+        "runs": len(runs),
+        "objects": len(objects),
+        "stored_bytes": sum(p.stat().st_size for p in objects),
+        "logical_bytes": sum(run["bytes"] for run in runs),
+    }
+
+
+def prune(keep, history_dir=HISTORY_DIR):
+    """Keep the newest `keep` runs and delete objects no kept run references; returns (runs, objects) removed."""
+    runs = load_runs(history_dir)
+    kept = runs[-keep:] if keep > 0 else []
+    referenced = {digest for run in kept for digest in run["files"].values()}
+
+    with atomic_open(history_dir / RUNS_FILENAME) as f:
+        f.writelines(json.dumps(run, ensure_ascii=False) + "\n" for run in kept)
+
+    removed = 0
+    for path in (history_dir / OBJECTS_DIRNAME).glob("*/*.xz"):
+        if path.parent.name + path.name[:-len(".xz")] not in referenced:
+            path.unlink()
+            removed += 1
+    return len(runs) - len(kept), removed
@@ -0,0 +1,266 @@
+"""
+Storage for the per-paper url/abstract metadata.
+
+Two layouts behind one interface (entries / save / replace_all):
+
+- SingleFileStore: url.json, a list of {id, title, session, url, abstract}
+  (or the older {id: {url, abstract}} dict). The default.
+- ShardedStore: meta/<shard>.json files in the same list format, one per
+  session or per id prefix, plus meta/manifest.json mapping every paper id
+  to its shard. Reads load only the shards holding the requested ids (all
+  of them in parallel when everything is needed) and saves rewrite only
+  shards whose content changed, so an edit rewrites a few KB and editors
+  working on different sessions never touch the same file. The manifest
+  only changes when papers are added, removed or moved between shards.
+
+open_store() picks the sharded layout whenever meta/manifest.json exists.
+A file that is missing or does not parse raises MetaStoreError rather than
+reading as empty: callers rewrite every entry from what they read, so an
+empty read would blank the url/abstract of every paper.
+`python scraper.py shard-meta` converts url.json; `join-meta` writes the
+single-file url.json back from the shards for tools that expect it.
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from fsutil import write_atomic
+
+META_DIR = Path("meta")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+LAYOUTS = ("session", "prefix")
+PREFIX_DIGITS = 2
+
+
+class MetaStoreError(ValueError):
+    """url.json, a meta/ shard or the manifest is missing or unreadable."""
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise MetaStoreError(f"cannot read {path}: {e}") from e
+
+
+def _dumps(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _write_if_changed(path, text):
+    """
+    Write text unless the file already holds it; returns the path or None.
+
+    Unchanged files keep their mtime, which merge-edits compares against
+    edit times to tell upstream changes from no-op rewrites.
+    """
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return None
+    except OSError:
+        pass
+    write_atomic(path, text)
+    return path
+
+
+def shard_key(entry, layout):
+    """Shard name for a url.json entry: session slug, or the first digits of its id."""
+    if layout == "session":
+        return re.sub(r"[^a-z0-9]+", "-", (entry.get("session") or "").lower()).strip("-") or "other"
+    digits = re.sub(r"\D", "", entry.get("id") or "")
+    return digits[:PREFIX_DIGITS] or "other"
+
+
+class SingleFileStore:
+    """url.json, read and rewritten as a whole."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.location = str(self.path)
+        self.data = None
+
+    def _load(self):
+        if self.data is None:
+            self.data = _read_json(self.path)
+        return self.data
+
+    def entries(self, pids=None):
+        """{pid: entry} (live dicts: mutate, then save())."""
+        data = self._load()
+        if isinstance(data, list):
+            return {item.get("id"): item for item in data if isinstance(item, dict)}
+        return data if isinstance(data, dict) else {}
+
+    def mtime_ms(self, pid=None):
+        return self.path.stat().st_mtime_ns // 1_000_000
+
+    def save(self, pids=None):
+        """Rewrite url.json if its content changed; returns the written paths."""
+        path = _write_if_changed(self.path, _dumps(self._load()))
+        return [path] if path else []
+
+    def replace_all(self, entries):
+        """Replace the contents with a list of entries; returns (written paths, removed paths, total files)."""
+        self.data = entries
+        return self.save(), [], 1
+
+
+class ShardedStore:
+    """meta/<shard>.json files plus a manifest; shards are loaded on demand."""
+
+    def __init__(self, meta_dir=META_DIR, manifest=None, max_workers=8):
+        self.dir = Path(meta_dir)
+        self.location = f"{self.dir}/"
+        self.max_workers = max_workers
+        if manifest is None:
+            manifest = _read_json(self.dir / MANIFEST_NAME)
+            if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+                raise MetaStoreError(
+                    f"{self.dir / MANIFEST_NAME} has version {manifest.get('version')}, expected {MANIFEST_VERSION}"
+                )
+        self.manifest = manifest
+        self.layout = manifest["layout"]
+        self.shards = {}
+
+    def _path(self, name):
+        return self.dir / f"{name}.json"
+
+    def _load_shard(self, name):
+        items = _read_json(self._path(name))
+        if not isinstance(items, list):
+            raise MetaStoreError(f"{self._path(name)} is not a list of entries")
+        return items
+
+    def _ensure(self, names):
+        missing = [name for name in names if name not in self.shards]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                self.shards.update(zip(missing, pool.map(self._load_shard, missing)))
+        elif missing:
+            self.shards[missing[0]] = self._load_shard(missing[0])
+
+    def _names_for(self, pids):
+        if pids is None:
+            return list(self.manifest["shards"])
+        papers = self.manifest["papers"]
+        return sorted({papers[pid] for pid in pids if pid in papers})
+
+    def entries(self, pids=None):
+        """{pid: entry} from the shards holding pids (all shards when pids is None)."""
+        names = self._names_for(pids)
+        self._ensure(names)
+        return {
+            item.get("id"): item
+            for name in names for item in self.shards[name] if isinstance(item, dict)
+        }
+
+    def mtime_ms(self, pid=None):
+        name = self.manifest["papers"].get(pid)
+        path = self._path(name) if name else self.dir / MANIFEST_NAME
+        return path.stat().st_mtime_ns // 1_000_000
+
+    def _write_shard(self, name, items):
+        """Write one shard unless the file already holds this content; returns the path or None."""
+        return _write_if_changed(self._path(name), _dumps(items))
+
+    def save(self, pids=None):
+        """
+        Rewrite the (loaded) shards holding pids; returns the written paths.
+
+        Edits never move a paper between shards, so the manifest is left alone.
+        """
+        return [
+            path for name in self._names_for(pids) if name in self.shards
+            if (path := self._write_shard(name, self.shards[name]))
+        ]
+
+    def replace_all(self, entries):
+        """
+        Regroup a list of entries into shards and write only the shards whose
+        content changed (plus the manifest); returns (written paths, removed
+        paths, total shards).
+        """
+        groups = {}
+        papers = {}
+        for entry in entries:
+            name = shard_key(entry, self.layout)
+            groups.setdefault(name, []).append(entry)
+            papers[entry["id"]] = name
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        written = [path for name, items in groups.items() if (path := self._write_shard(name, items))]
+        removed = []
+        for name in [n for n in self.manifest["shards"] if n not in groups]:
+            self._path(name).unlink(missing_ok=True)
+            removed.append(self._path(name))
+        # Shards and papers in page order, so join() reproduces url.json.
+        manifest = {
+            **self.manifest,
+            "shards": {name: {"count": len(items)} for name, items in groups.items()},
+            "papers": papers,
+        }
+        if manifest != self.manifest or not (self.dir / MANIFEST_NAME).exists():
+            self.manifest = manifest
+            write_atomic(self.dir / MANIFEST_NAME, _dumps(manifest))
+        self.shards = groups
+        return written, removed, len(groups)
+
+
+def is_sharded(meta_dir=META_DIR):
+    return (Path(meta_dir) / MANIFEST_NAME).exists()
+
+
+def open_store(path, meta_dir=META_DIR):
+    """The sharded store when meta_dir has a manifest, else the single file at path."""
+    if is_sharded(meta_dir):
+        return ShardedStore(meta_dir)
+    return SingleFileStore(path)
+
+
+def signature(path, meta_dir=META_DIR):
+    """Cheap change token for watchers: (mtime, size) of every file in the active layout."""
+    try:
+        if is_sharded(meta_dir):
+            return tuple(sorted(
+                (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                for e in os.scandir(meta_dir) if e.name.endswith(".json")
+            ))
+        st = Path(path).stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def ordered_entries(store):
+    """All entries as a list, in page order."""
+    index = store.entries()
+    if isinstance(store, ShardedStore):
+        return [index[pid] for pid in store.manifest["papers"] if pid in index]
+    return [{"id": pid, **entry} if "id" not in entry else entry for pid, entry in index.items()]
+
+
+def shard(store, layout="session", meta_dir=META_DIR):
+    """Write the entries of store as a fresh sharded layout in meta_dir; returns the new store."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r} (expected one of {', '.join(LAYOUTS)})")
+    entries = ordered_entries(store)
+    meta_dir = Path(meta_dir)
+    meta_dir.mkdir(parents=True, exist_ok=True)
+    for path in meta_dir.glob("*.json"):
+        path.unlink()
+    sharded = ShardedStore(meta_dir, manifest={"version": MANIFEST_VERSION, "layout": layout, "shards": {}, "papers": {}})
+    sharded.replace_all(entries)
+    return sharded
+
+
+def join(store, out_path):
+    """Write the single-file url.json format from any store; returns the entry count."""
+    entries = ordered_entries(store)
+    write_atomic(Path(out_path), _dumps(entries))
+    return len(entries)
@@ -0,0 +1,134 @@
+"""
+Prometheus textfile-collector metrics for scheduled runs.
+
+Pipeline code records values into the module-level registry (set_gauge,
+inc_counter, the timed_stage decorator); `python scraper.py --metrics PATH`
+writes them at the end of the run in the text exposition format, via a temp
+file + rename so node_exporter never reads a half-written file.
+
+Counters (fetch failures, runs) are carried over from the previous file at
+PATH so they keep increasing across runs, and so does the last-success
+timestamp when a run fails -- alert on its age to catch stalled refreshes.
+
+Usage:
+    python scraper.py --metrics /var/lib/node_exporter/textfile/siggraph.prom build
+"""
+
+import re
+import time
+import functools
+from pathlib import Path
+
+from fsutil import write_atomic
+
+PREFIX = "siggraph_"
+
+HELP = {
+    "papers_parsed": ("gauge", "Technical papers extracted from the schedule."),
+    "sessions": ("gauge", "Sessions the papers are grouped into."),
+    "empty_urls": ("gauge", "url.json entries without a paper link."),
+    "missing_abstracts": ("gauge", "url.json entries without an abstract after enrichment."),
+    "fetch_bytes": ("gauge", "Bytes of schedule HTML fetched, per conference day."),
+    "stage_duration_seconds": ("gauge", "Wall time of each pipeline stage in the last run."),
+    "last_run_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+    "last_success_timestamp_seconds": ("gauge", "Unix time the last successful run finished."),
+    "fetch_failures_total": ("counter", "Conference days that could not be fetched."),
+    "runs_total": ("counter", "Runs by result."),
+}
+
+_gauges = {}
+_counters = {}
+
+SAMPLE_RE = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def set_gauge(name, value, labels=None):
+    _gauges[_key(name, labels)] = float(value)
+
+
+def inc_counter(name, amount=1, labels=None):
+    key = _key(name, labels)
+    _counters[key] = _counters.get(key, 0.0) + amount
+
+
+def timed_stage(stage):
+    """Decorator recording the wall time of a pipeline stage."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                set_gauge("stage_duration_seconds", time.perf_counter() - start, {"stage": stage})
+        return wrapper
+    return decorator
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def _read_previous(path):
+    """{(name, labels): value} of the samples in an earlier textfile (prefix stripped)."""
+    samples = {}
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return samples
+    for line in lines:
+        match = SAMPLE_RE.match(line)
+        if not match or not match.group(1).startswith(PREFIX):
+            continue
+        labels = {k: _unescape(v) for k, v in LABEL_RE.findall(match.group(2) or "")}
+        try:
+            samples[_key(match.group(1)[len(PREFIX):], labels)] = float(match.group(3))
+        except ValueError:
+            continue
+    return samples
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def write_textfile(path, success):
+    """Write this run's metrics (plus carried-over counters) to path atomically."""
+    path = Path(path)
+    previous = _read_previous(path)
+    now = time.time()
+
+    inc_counter("runs_total", labels={"result": "success" if success else "failure"})
+    set_gauge("last_run_timestamp_seconds", now)
+    if success:
+        set_gauge("last_success_timestamp_seconds", now)
+    elif _key("last_success_timestamp_seconds", None) in previous:
+        set_gauge("last_success_timestamp_seconds", previous[_key("last_success_timestamp_seconds", None)])
+
+    samples = dict(_gauges)
+    for key, value in previous.items():
+        if HELP.get(key[0], ("",))[0] == "counter":
+            samples[key] = value
+    for key, value in _counters.items():
+        samples[key] = samples.get(key, 0.0) + value
+
+    lines = []
+    for name in sorted({key[0] for key in samples}):
+        kind, text = HELP.get(name, ("gauge", name))
+        lines += [f"# HELP {PREFIX}{name} {text}", f"# TYPE {PREFIX}{name} {kind}"]
+        for key in sorted(k for k in samples if k[0] == name):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key[1])
+            lines.append(f"{PREFIX}{name}{{{labels}}} {_format_value(samples[key])}" if labels
+                         else f"{PREFIX}{name} {_format_value(samples[key])}")
+
+    write_atomic(path, "\n".join(lines) + "\n")
+    return path
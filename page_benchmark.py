@@ -0,0 +1,276 @@
+"""
+Page-load benchmark for the generated output in headless Chromium.
+
+Builds a synthetic site per size (parse -> enrich -> render, no network),
+serves it from a local HTTP server and loads each output mode with
+Playwright, recording per load:
+
+- dom_nodes:      elements in the document after load
+- fcp_ms:         first contentful paint
+- dcl_script_ms:  time spent in DOMContentLoaded handlers (the localStorage
+                  edit replay), from Navigation Timing
+- load_ms:        load event end
+- js_heap_bytes:  used JS heap after a forced GC (CDP Performance metrics)
+
+Output modes: "single" (papers.html with hashed external assets), "inline"
+(one self-contained page, as watch mode serves it), "index" and "session"
+(multi-page mode: sessions/index.html and the largest session page). Each
+is loaded clean and with `--edits` local edits seeded into localStorage.
+Only requests to the local server are allowed (fonts, remote thumbnails
+and the service worker are blocked), so numbers do not depend on the
+network.
+
+Results are written as JSON; with a baseline, any metric whose median
+exceeds baseline * threshold (and the metric's noise floor) is reported and
+the command exits 1.
+
+Usage:
+    python page_benchmark.py                     # compare to page_baseline.json
+    python page_benchmark.py --save-baseline
+    python page_benchmark.py --sizes 300 5000 --repeat 5 --edits 100
+"""
+
+import io
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import threading
+import contextlib
+import statistics
+from pathlib import Path
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import scraper
+import analysis
+import benchmark
+
+try:
+    from playwright.sync_api import sync_playwright, Error as PlaywrightError
+except ImportError:  # optional: pip install playwright && playwright install chromium
+    sync_playwright = None
+    PlaywrightError = Exception
+
+PAGE_BASELINE_PATH = Path("page_baseline.json")
+PAGE_RESULTS_PATH = Path("page_results.json")
+
+DEFAULT_SIZES = [300, 2000]
+DEFAULT_THRESHOLD = 1.25
+DEFAULT_EDITS = 50
+
+METRICS = ("dom_nodes", "fcp_ms", "dcl_script_ms", "load_ms", "js_heap_bytes")
+# Differences below these are noise, whatever the ratio.
+NOISE_FLOOR = {"dom_nodes": 0, "fcp_ms": 20, "dcl_script_ms": 5, "load_ms": 25, "js_heap_bytes": 512 * 1024}
+
+COLLECT_JS = """
+() => new Promise((resolve) => {
+  const finish = (fcp) => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    resolve({
+      dom_nodes: document.getElementsByTagName('*').length,
+      fcp_ms: fcp,
+      dcl_script_ms: nav.domContentLoadedEventEnd - nav.domContentLoadedEventStart,
+      load_ms: nav.loadEventEnd,
+    });
+  };
+  const paint = performance.getEntriesByName('first-contentful-paint')[0];
+  if (paint) return finish(paint.startTime);
+  new PerformanceObserver((list) => finish(list.getEntries()[0].startTime))
+    .observe({type: 'paint', buffered: true});
+  setTimeout(() => finish(null), 3000);
+})
+"""
+
+
+class BrowserUnavailable(RuntimeError):
+    """Chromium could not be launched (typically: `playwright install chromium` was never run)."""
+
+
+def build_site(site_dir, num_papers, seed=0):
+    """Render every output mode for a synthetic schedule into site_dir; returns (papers, {mode: path})."""
+    cwd = os.getcwd()
+    os.chdir(site_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.write_raw_snippets(benchmark.split_schedule_days(
+                benchmark.generate_schedule_snippets(num_papers, seed=seed)
+            ))
+            scraper.parse_stage()
+            by_session = scraper.read_papers_jsonl()
+            scraper.write_urls_json(by_session)
+            papers = [p for session_papers in by_session.values() for p in session_papers]
+            abstracts = benchmark.synthetic_abstracts(papers, seed=seed)
+            scraper.fill_missing_meta({
+                p.pid: {"url": f"https://doi.org/10.1145/3757377.{p.pid[7:]}", "abstract": abstracts[p.pid]}
+                for p in papers
+            })
+            scraper.enrich_stage(
+                related_k=5 if analysis.HAVE_NUMPY else 0,
+                placeholders=False, pdfs=False, arxiv=False, crossref=False,
+            )
+            scraper.render_stage(multi_page=True)
+            Path("inline.html").write_text(
+                scraper.generate_html(by_session, related_map=scraper._load_related_map()), encoding="utf-8"
+            )
+        largest = max(by_session, key=lambda name: len(by_session[name]))
+    finally:
+        os.chdir(cwd)
+    return papers, {
+        "single": "papers.html",
+        "inline": "inline.html",
+        "index": f"{scraper.SESSIONS_DIR.as_posix()}/index.html",
+        "session": f"{scraper.SESSIONS_DIR.as_posix()}/{scraper.session_slug(largest)}.html",
+    }
+
+
+def synthetic_edits(papers, count, seed=0):
+    """A siggraph_paper_edits localStorage value editing count papers' url and abstract."""
+    edits = {}
+    for p in random.Random(seed).sample(papers, min(count, len(papers))):
+        edits[p.pid] = {"url": f"https://example.org/{p.pid}", "abstract": f"Edited abstract of {p.title}."}
+    return edits
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _measure(browser, url, origin, edits):
+    context = browser.new_context(service_workers="block")
+    context.route("**/*", lambda route: route.continue_() if route.request.url.startswith(origin) else route.abort())
+    if edits:
+        context.add_init_script(f"localStorage.setItem('siggraph_paper_edits', {json.dumps(json.dumps(edits))});")
+    try:
+        page = context.new_page()
+        cdp = context.new_cdp_session(page)
+        cdp.send("Performance.enable")
+        page.goto(url, wait_until="load")
+        sample = page.evaluate(COLLECT_JS)
+        cdp.send("HeapProfiler.collectGarbage")
+        heap = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        sample["js_heap_bytes"] = heap["JSHeapUsedSize"]
+        return sample
+    finally:
+        context.close()
+
+
+def _summarize(samples):
+    return {
+        metric: {
+            "median": statistics.median(values),
+            "min": min(values),
+        }
+        for metric in METRICS
+        if (values := [s[metric] for s in samples if s[metric] is not None])
+    }
+
+
+def run_page_benchmarks(sizes, repeat=3, edit_count=DEFAULT_EDITS, seed=0):
+    """{size: {"papers", "pages": {mode: {"path", "bytes", "metrics": {metric: {median, min}}}}}}"""
+    results = {}
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except PlaywrightError as e:
+            # Playwright's message is a multi-line banner; its first line names the problem.
+            raise BrowserUnavailable(str(e).splitlines()[0] if str(e) else type(e).__name__) from e
+        try:
+            for size in sizes:
+                with tempfile.TemporaryDirectory() as site_dir:
+                    papers, modes = build_site(site_dir, size, seed=seed)
+                    edits = synthetic_edits(papers, edit_count, seed=seed)
+                    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=site_dir))
+                    threading.Thread(target=server.serve_forever, daemon=True).start()
+                    origin = f"http://127.0.0.1:{server.server_address[1]}/"
+                    pages = {}
+                    try:
+                        for mode, rel_path in modes.items():
+                            for variant, seeded in ((mode, None), (f"{mode}+edits", edits)):
+                                samples = [_measure(browser, origin + rel_path, origin, seeded) for _ in range(repeat)]
+                                pages[variant] = {
+                                    "path": rel_path,
+                                    "bytes": (Path(site_dir) / rel_path).stat().st_size,
+                                    "metrics": _summarize(samples),
+                                }
+                    finally:
+                        server.shutdown()
+                results[str(size)] = {"papers": len(papers), "edits": len(edits), "pages": pages}
+        finally:
+            browser.close()
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of (size, page, metric, baseline, current) regressions (medians)."""
+    regressions = []
+    for size, entry in results.items():
+        for page, data in entry["pages"].items():
+            base_metrics = baseline.get(size, {}).get("pages", {}).get(page, {}).get("metrics", {})
+            for metric, values in data["metrics"].items():
+                base = base_metrics.get(metric)
+                if not base:
+                    continue
+                current = values["median"]
+                if current > base["median"] * threshold and current - base["median"] > NOISE_FLOOR[metric]:
+                    regressions.append((size, page, metric, base["median"], current))
+    return regressions
+
+
+def _print_results(results):
+    print(f"{'size':>6}  {'page':<14} {'KB':>7} {'nodes':>7} {'FCP ms':>8} {'DCL ms':>8} {'load ms':>8} {'heap MB':>8}")
+    for size, entry in results.items():
+        for page, data in entry["pages"].items():
+            m = {k: v["median"] for k, v in data["metrics"].items()}
+            fcp = f"{m['fcp_ms']:8.1f}" if "fcp_ms" in m else f"{'-':>8}"
+            print(
+                f"{size:>6}  {page:<14} {data['bytes'] / 1024:7.0f} {m['dom_nodes']:7.0f} {fcp} "
+                f"{m['dcl_script_ms']:8.1f} {m['load_ms']:8.1f} {m['js_heap_bytes'] / 2**20:8.1f}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page loads of the generated output in headless Chromium.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--edits", type=int, default=DEFAULT_EDITS, help="local edits seeded for the +edits loads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="flag a metric whose median exceeds baseline * threshold")
+    parser.add_argument("--output", type=Path, default=PAGE_RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=PAGE_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    if sync_playwright is None:
+        print("ERROR: the page benchmark needs playwright (pip install playwright && playwright install chromium)")
+        return 2
+
+    try:
+        results = run_page_benchmarks(args.sizes, repeat=args.repeat, edit_count=args.edits, seed=args.seed)
+    except BrowserUnavailable as e:
+        print(f"ERROR: could not launch Chromium ({e}); run `playwright install chromium`")
+        return 2
+    _print_results(results)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, benchmark._load_json(args.baseline), args.threshold)
+    for size, page, metric, base, current in regressions:
+        print(f"REGRESSION: {metric} of {page} @ {size} papers: {base:.1f} -> {current:.1f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Abstracts for papers whose url.json link points straight at a PDF.
+
+PDFs are downloaded concurrently through transport.http_get with a size cap
+and stored once per content hash under build/pdfs/. Only the first pages are
+parsed, and the text between an "Abstract" heading and the first of
+CCS Concepts / Keywords / ACM Reference Format / Introduction is taken as
+the abstract. The ACM TOG (acmsmall) layout has no heading: there the
+paragraph right before "CCS Concepts", after the capitalised author and
+affiliation lines, is taken instead.
+
+build/pdfs/index.json remembers, per URL, the content hash and the
+extraction result, so later runs neither re-download nor re-parse (failed
+downloads other than oversized files are retried). Bumping
+EXTRACTOR_VERSION re-runs extraction from the cached PDFs without touching
+the network.
+
+pypdf is optional: without it the stage is skipped.
+"""
+
+import re
+import json
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import transport
+from fsutil import write_atomic, write_json_atomic
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional: pip install pypdf
+    PdfReader = None
+
+PDF_CACHE_DIR = Path("build") / "pdfs"
+PDF_INDEX_PATH = PDF_CACHE_DIR / "index.json"
+EXTRACTOR_VERSION = 2
+
+MAX_PDF_BYTES = 25 * 1024 * 1024
+FIRST_PAGES = 2
+
+ABSTRACT_START_RE = re.compile(r"(?:^|\n)\s*Abstract\b[\s.:—–-]*", re.IGNORECASE)
+ABSTRACT_END_RE = re.compile(
+    r"\n\s*(?:CCS Concepts|Keywords|Additional Key Words|ACM Reference Format|Index Terms"
+    r"|(?:1|I)\.?\s+Introduction)\b",
+    re.IGNORECASE,
+)
+CCS_CONCEPTS_RE = re.compile(r"\n\s*CCS Concepts\b", re.IGNORECASE)
+MIN_ABSTRACT_CHARS = 200
+MAX_ABSTRACT_CHARS = 4000
+
+
+def is_pdf_url(url):
+    return url.lower().split("?", 1)[0].split("#", 1)[0].endswith(".pdf")
+
+
+def first_pages_text(data, pages=FIRST_PAGES):
+    """Extracted text of the first pages of a PDF (pypdf parses pages lazily)."""
+    reader = PdfReader(BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages[:pages])
+
+
+def _is_author_line(line):
+    # acmsmall lines start "ALICE SMITH and BOB JONES, Affiliation"; e-mails mark the rest.
+    names = re.sub(r"\band\b", "", line.split(",", 1)[0])
+    letters = [c for c in names if c.isalpha()]
+    return "@" in line or (len(letters) >= 4 and all(c.isupper() for c in letters))
+
+
+def _block_before_ccs(text):
+    """The lines right before "CCS Concepts", back to a blank or author line (acmsmall)."""
+    ccs = CCS_CONCEPTS_RE.search(text)
+    if not ccs:
+        return None
+    lines = []
+    for line in reversed(text[:ccs.start()].rstrip().split("\n")):
+        if not line.strip() or _is_author_line(line):
+            break
+        lines.append(line)
+        if sum(len(l) for l in lines) > MAX_ABSTRACT_CHARS:
+            return None
+    return "\n".join(reversed(lines))
+
+
+def extract_abstract(text):
+    """The abstract block of a paper's first-page text, or None."""
+    start = ABSTRACT_START_RE.search(text)
+    if start:
+        end = ABSTRACT_END_RE.search(text, start.end())
+        block = text[start.end():end.start() if end else start.end() + MAX_ABSTRACT_CHARS]
+    else:
+        block = _block_before_ccs(text)
+        if block is None:
+            return None
+
+    # Re-join words hyphenated across lines, then collapse line breaks.
+    block = re.sub(r"(\w)-\n(?=[a-z])", r"\1", block)
+    block = re.sub(r"\s+", " ", block).strip()
+    if not MIN_ABSTRACT_CHARS <= len(block) <= MAX_ABSTRACT_CHARS:
+        return None
+    return block
+
+
+def _load_index(path=PDF_INDEX_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_index(index, path=PDF_INDEX_PATH):
+    write_json_atomic(path, index)
+
+
+def _process(url, entry, cache_dir):
+    """Download (unless cached) and extract one PDF; returns the new index entry."""
+    pdf_path = cache_dir / f"{entry['sha256']}.pdf" if entry.get("sha256") else None
+    if pdf_path is not None and pdf_path.exists():
+        data = pdf_path.read_bytes()
+    else:
+        try:
+            data = transport.http_get(url, timeout=60, max_bytes=MAX_PDF_BYTES).body
+        except transport.ResponseTooLarge as e:
+            # Will not shrink by asking again.
+            return {"version": EXTRACTOR_VERSION, "abstract": None, "error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        digest = hashlib.sha256(data).hexdigest()
+        pdf_path = cache_dir / f"{digest}.pdf"
+        try:
+            if not pdf_path.exists():
+                write_atomic(pdf_path, data)
+        except OSError as e:
+            # Not cached: retried (and downloaded again) on the next run.
+            return {"error": f"{type(e).__name__}: {e}"}
+        entry = {"sha256": digest, "bytes": len(data)}
+
+    try:
+        abstract = extract_abstract(first_pages_text(data))
+    except Exception as e:
+        return {**entry, "version": EXTRACTOR_VERSION, "abstract": None, "error": f"{type(e).__name__}: {e}"}
+    return {**entry, "version": EXTRACTOR_VERSION, "abstract": abstract}
+
+
+def pdf_abstracts(urls_by_pid, cache_dir=PDF_CACHE_DIR, max_workers=8):
+    """
+    Abstracts for direct-PDF links: {pid: pdf url} -> ({pid: abstract}, stats).
+
+    URLs already extracted with the current EXTRACTOR_VERSION are answered
+    from the index; failed downloads are retried on the next run.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index = _load_index(cache_dir / PDF_INDEX_PATH.name)
+
+    pending = sorted({
+        url for url in urls_by_pid.values()
+        if index.get(url, {}).get("version") != EXTRACTOR_VERSION
+    })
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for url, entry in zip(pending, pool.map(lambda u: _process(u, index.get(u, {}), cache_dir), pending)):
+            index[url] = entry
+    _write_index(index, cache_dir / PDF_INDEX_PATH.name)
+
+    abstracts = {pid: index[url]["abstract"] for pid, url in urls_by_pid.items() if index[url].get("abstract")}
+    stats = {
+        "pdfs": len(set(urls_by_pid.values())),
+        "processed": len(pending),
+        "found": len(abstracts),
+        "errors": {url: index[url]["error"] for url in set(urls_by_pid.values()) if index[url].get("error")},
+    }
+    return abstracts, stats
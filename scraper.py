@@ -1,35 +1,103 @@
 """
 SIGGRAPH Asia 2025 Technical Papers Scraper
 Fetches paper titles, authors, and thumbnails from the conference schedule.
+
+The pipeline runs as four stages that hand over files in build/, so later
+stages can be re-run (or run elsewhere) without touching the network:
+
+    python scraper.py fetch    # build/raw/<date>.html + manifest.json
+    python scraper.py parse    # build/papers.jsonl
+    python scraper.py enrich   # url.json, changes.json, build/related.json
+    python scraper.py render   # papers.html, static/, sw.js, ...
+
+`python scraper.py` (or `build`) runs all four in order; `export` writes
+JSON / CSV / Markdown / BibTeX / iCal copies of the papers into export/.
+Each pipeline command also records its inputs and outputs in history/
+(see `history`, `history-restore`).
 """
 
+import os
 import re
+import sys
 import json
+import time
+import hashlib
+import argparse
+import contextlib
+import dataclasses
 from pathlib import Path
-from urllib.request import urlopen, Request
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from html import unescape, escape as html_escape
 
+import analysis
+import metrics
+import transport
+import thumbnails
+import pdf_abstracts
+import browser_fetch
+import meta_store
+import history
+import changes
+import arxiv_meta
+import crossref_meta
+import export
+from changes import CHANGES_PATH, print_change_summary, update_change_feed
+from fsutil import atomic_open, write_json_atomic
+from assets import (
+    SERVICE_WORKER_PATH,
+    SERVICE_WORKER_REGISTER_SNIPPET,
+    STATIC_DIR,
+    precompress,
+    print_compression_summary,
+    write_cache_headers,
+    write_service_worker,
+    write_static_assets,
+)
+
 URLS_JSON_PATH = Path("url.json")
+PAPERS_HTML_PATH = Path("papers.html")
+SESSIONS_DIR = Path("sessions")
+THUMBS_STATIC_DIR = STATIC_DIR / "thumbs"
+
+# Intermediate artifacts written by the fetch / parse / enrich stages.
+BUILD_DIR = Path("build")
+RAW_DIR = BUILD_DIR / "raw"
+PAPERS_JSONL_PATH = BUILD_DIR / "papers.jsonl"
+RELATED_JSON_PATH = BUILD_DIR / "related.json"
+AUTHORS_JSON_PATH = BUILD_DIR / "authors.json"
+ARTIFACT_VERSION = 1
+
+FONTS_URL = (
+    "https://fonts.googleapis.com/css2?family=Fredoka:wght@400;500;600;700"
+    "&family=Nunito:wght@400;500;600;700&display=swap"
+)
+
+
+def _meta_store():
+    """url.json, or the meta/ shards once `shard-meta` has been run."""
+    return meta_store.open_store(URLS_JSON_PATH)
 
 
 def _load_existing_meta():
     """
-    Load existing url.json if present.
+    Load existing url.json (or its shards) if present.
 
     Expected formats:
     - list of {id, title, session, url, abstract?}
     - dict of {id: {url, abstract, ...}}
+
+    A url.json that does not exist yet reads as empty; one that cannot be
+    read, or a missing or corrupt shard, raises meta_store.MetaStoreError.
     """
-    if not URLS_JSON_PATH.exists():
+    store = _meta_store()
+    if isinstance(store, meta_store.SingleFileStore) and not store.path.exists():
         return {}
+    return _parse_meta(store.entries())
 
-    try:
-        with open(URLS_JSON_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        return {}
 
+def _parse_meta(data):
+    """Normalize decoded url.json data (either format) into {id: {url, abstract}}."""
     meta_map = {}
     if isinstance(data, list):
         for item in data:
@@ -61,34 +129,239 @@ def write_urls_json(papers_by_session):
 
     - Keeps any existing non-empty urls already in url.json.
     - Output format is a list for easy manual editing.
+    - With the sharded layout only shards whose entries changed are rewritten.
     """
     existing = _load_existing_meta()
 
     entries = []
     for session_name, papers in papers_by_session.items():
         for paper in papers:
-            pid = f"papers_{paper['id']}"
-            prev = existing.get(pid, {})
+            prev = existing.get(paper.pid, {})
             entries.append(
                 {
-                    "id": pid,
-                    "title": paper["title"],
+                    "id": paper.pid,
+                    "title": paper.title,
                     "session": session_name,
                     "url": (prev.get("url") or ""),
                     "abstract": (prev.get("abstract") or ""),
                 }
             )
 
-    with open(URLS_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    store = _meta_store()
+    written, removed, total = store.replace_all(entries)
 
     empty_count = sum(1 for e in entries if not e.get("url"))
-    print(f"Wrote {URLS_JSON_PATH} ({len(entries)} entries, {empty_count} empty urls)")
+    metrics.set_gauge("empty_urls", empty_count)
+    files = ""
+    if isinstance(store, meta_store.ShardedStore):
+        files = f", {len(written)} of {total} shards rewritten"
+        if removed:
+            files += f", {len(removed)} removed"
+    print(f"Wrote {store.location} ({len(entries)} entries, {empty_count} empty urls{files})")
+
+
+def update_paper_meta(pid, updates):
+    """
+    Apply a url/abstract update to a single url.json entry.
+
+    The file (or, sharded, only the paper's shard) is rewritten through a
+    temp file + os.replace, so readers never observe a partially written
+    url.json. Returns the updated entry, or None if pid is not present.
+    """
+    store = _meta_store()
+    entry = store.entries([pid]).get(pid)
+    if not isinstance(entry, dict):
+        return None
+
+    for field in ("url", "abstract"):
+        if field in updates:
+            entry[field] = updates[field]
+
+    store.save([pid])
+    return entry
+
+
+def fill_missing_meta(updates):
+    """
+    Fill empty url/abstract fields of url.json entries from {pid: {field: value}}.
+
+    Non-empty fields are never overwritten, so hand edits always win over
+    enrichment. One atomic rewrite for the whole batch; returns the list of
+    (pid, field) pairs that were filled.
+    """
+    store = _meta_store()
+    index = store.entries(updates)
+
+    filled = []
+    for pid, fields in updates.items():
+        entry = index.get(pid)
+        if not isinstance(entry, dict):
+            continue
+        for field in ("url", "abstract"):
+            value = (fields.get(field) or "").strip()
+            if value and not (entry.get(field) or "").strip():
+                entry[field] = value
+                filled.append((pid, field))
+
+    if filled:
+        store.save({pid for pid, _ in filled})
+    return filled
+
+
+def _edit_time(value, path):
+    """An edit's updated_at as epoch ms (0 when absent); ValueError naming path otherwise."""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{path}: updated_at {value!r} is not a timestamp in ms") from None
+
 
+def _load_edit_delta(path):
+    """
+    Read an exported edits file into {(pid, field): {value, updated_at, base}}.
+
+    Accepts the page's export ({"edits": {pid: {field: {value, updated_at, base}}}}),
+    a raw siggraph_paper_edits localStorage dump ({pid: {field: value}}), and
+    the full url.json download older pages produced ([{id, url, abstract, ...}]).
+    The latter carries no edit times, so its values are timestamped with the
+    file's mtime and lose to url.json values changed after the download.
+    Raises ValueError (naming path) for files that are not one of these.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: not JSON ({e})") from None
+
+    if isinstance(data, list):
+        downloaded_at = Path(path).stat().st_mtime_ns // 1_000_000
+        return {
+            (item["id"], field): {
+                "value": item[field].strip(), "updated_at": downloaded_at, "base": None, "snapshot": True,
+            }
+            for item in data
+            if isinstance(item, dict) and isinstance(item.get("id"), str)
+            for field in ("url", "abstract") if isinstance(item.get(field), str)
+        }
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected an edits export or a url.json download, got JSON {type(data).__name__}")
+    raw = data.get("edits", {}) if "edits" in data else data
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: \"edits\" must map paper ids to fields, got JSON {type(raw).__name__}")
+
+    delta = {}
+    for pid, fields in raw.items():
+        if not isinstance(fields, dict):
+            continue
+        legacy_meta = fields.get("_meta") if isinstance(fields.get("_meta"), dict) else {}
+        for field in ("url", "abstract"):
+            edit = fields.get(field)
+            if isinstance(edit, str):
+                meta = legacy_meta.get(field) if isinstance(legacy_meta.get(field), dict) else {}
+                edit = {"value": edit, "updated_at": meta.get("updatedAt"), "base": meta.get("base")}
+            if isinstance(edit, dict) and isinstance(edit.get("value"), str):
+                delta[(pid, field)] = {
+                    "value": edit["value"].strip(),
+                    "updated_at": _edit_time(edit.get("updated_at"), path),
+                    "base": edit.get("base"),
+                }
+    return delta
 
-def load_urls_for_html():
+
+def merge_edit_deltas(delta_paths, dry_run=False):
+    """
+    Merge exported edit deltas into url.json with per-field last-writer-wins.
+
+    Work is proportional to the number of edits: deltas are reduced to one
+    winning edit per (id, field), then applied through an id index. url.json
+    values are timestamped with the mtime of their file (or shard), so a
+    field changed in url.json after an edit was made (value differs from the
+    edit's base) wins over that edit. Returns (applied, conflicts) lists of
+    human-readable lines.
+    """
+    winners = {}
+    conflicts = []
+    for path in delta_paths:
+        for key, edit in _load_edit_delta(path).items():
+            edit["source"] = str(path)
+            prev = winners.get(key)
+            if prev is None:
+                winners[key] = edit
+                continue
+            if prev["value"] != edit["value"]:
+                loser, winner = (prev, edit) if edit["updated_at"] >= prev["updated_at"] else (edit, prev)
+                conflicts.append(
+                    f"{key[0]}.{key[1]}: {winner['source']} overrides {loser['source']} (newer edit)"
+                )
+                winners[key] = winner
+
+    store = _meta_store()
+    index = store.entries({pid for pid, _ in winners})
+
+    applied = []
+    for (pid, field), edit in winners.items():
+        entry = index.get(pid)
+        if not isinstance(entry, dict):
+            conflicts.append(f"{pid}.{field}: not in {store.location}, skipped ({edit['source']})")
+            continue
+        current = entry.get(field) or ""
+        if current == edit["value"]:
+            continue
+        base = edit["base"]
+        if edit.get("snapshot") and store.mtime_ms(pid) > edit["updated_at"]:
+            conflicts.append(
+                f"{pid}.{field}: changed in {store.location} after the download {edit['source']}, kept {store.location}"
+            )
+            continue
+        if base is not None and current != base and store.mtime_ms(pid) > edit["updated_at"]:
+            conflicts.append(
+                f"{pid}.{field}: changed in {store.location} after the edit in {edit['source']}, kept {store.location}"
+            )
+            continue
+        if base is not None and current != base:
+            conflicts.append(f"{pid}.{field}: {edit['source']} overrides an older {store.location} change")
+        entry[field] = edit["value"]
+        applied.append(f"{pid}.{field} <- {edit['source']}")
+
+    if applied and not dry_run:
+        # Shards whose content did not change are skipped by the store.
+        store.save({pid for pid, _ in winners})
+    return applied, conflicts
+
+
+def shard_meta(layout="session"):
+    """Move url.json (or re-shard meta/) into the sharded layout."""
+    start = time.perf_counter()
+    source = _meta_store()
+    store = meta_store.shard(source, layout)
+    if isinstance(source, meta_store.SingleFileStore):
+        # The shards are the source of truth from now on; join-meta recreates url.json.
+        URLS_JSON_PATH.unlink()
+    print(f"Wrote {len(store.manifest['papers'])} entries to {len(store.manifest['shards'])} {layout} shards "
+          f"in {store.location} in {time.perf_counter() - start:.2f}s")
+
+
+def join_meta(out_path=URLS_JSON_PATH, unshard=False):
+    """Write the single-file url.json format from the shards (optionally leaving the sharded layout)."""
+    store = _meta_store()
+    count = meta_store.join(store, out_path)
+    print(f"Wrote {out_path} ({count} entries) from {store.location}")
+    if unshard and isinstance(store, meta_store.ShardedStore):
+        for path in store.dir.glob("*.json"):
+            path.unlink()
+        with contextlib.suppress(OSError):
+            store.dir.rmdir()
+        print(f"Removed {store.location}; {URLS_JSON_PATH} is the metadata store again")
+
+
+def load_urls_for_html(meta_map=None):
     """Return mapping papers_#### -> url (non-empty only)."""
-    meta_map = _load_existing_meta()
+    if meta_map is None:
+        meta_map = _load_existing_meta()
     out = {}
     for pid, meta in meta_map.items():
         url = (meta or {}).get("url", "")
@@ -97,9 +370,10 @@ def load_urls_for_html():
     return out
 
 
-def load_abstracts_for_html():
+def load_abstracts_for_html(meta_map=None):
     """Return mapping papers_#### -> abstract (may be empty; we only include non-empty)."""
-    meta_map = _load_existing_meta()
+    if meta_map is None:
+        meta_map = _load_existing_meta()
     out = {}
     for pid, meta in meta_map.items():
         abstract = (meta or {}).get("abstract", "")
@@ -123,23 +397,66 @@ BASE_URL = "https://sa2025.conference-schedule.org/wp-content/linklings_snippets
 IMAGE_BASE = "https://sa2025.conference-schedule.org"
 
 
-def fetch_schedule_data():
-    """Fetch schedule data from all conference days."""
-    all_html = ""
+class IncompleteScheduleError(RuntimeError):
+    """Some conference days could not be fetched; the schedule must not be published."""
+
+
+def fetch_schedule_days():
+    """
+    Fetch the schedule snippet of every conference day; returns {date: html}.
+
+    Raises IncompleteScheduleError unless every day was fetched: a partial
+    program would otherwise be persisted as if sessions had been cancelled.
+    """
+    days = {}
+    failed = {}
     
     for date in DATES:
         url = BASE_URL.format(date=date)
         print(f"Fetching {date}...")
         try:
-            req = Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urlopen(req, timeout=30) as response:
-                content = response.read().decode('utf-8')
-                all_html += content
-                print(f"  Got {len(content):,} characters")
+            body = transport.http_get(url, timeout=30).body
+            content = body.decode('utf-8')
+            days[date] = content
+            metrics.set_gauge("fetch_bytes", len(body), {"date": date})
+            print(f"  Got {len(content):,} characters")
         except Exception as e:
             print(f"  Error fetching {date}: {e}")
-            
-    return all_html
+            failed[date] = e
+            metrics.inc_counter("fetch_failures_total", labels={"date": date})
+    
+    if failed:
+        raise IncompleteScheduleError(
+            f"could not fetch {len(failed)} of {len(DATES)} days: {', '.join(failed)}"
+        )
+    return days
+
+
+def fetch_schedule_data():
+    """Fetch schedule data from all conference days."""
+    return "".join(fetch_schedule_days().values())
+
+
+@dataclasses.dataclass(slots=True)
+class Paper:
+    """
+    One technical paper, shared by every pipeline stage without copying.
+
+    session_id and author names are interned: a multi-year archive repeats
+    them across tens of thousands of records. date is the first conference
+    day (YYYY-MM-DD) whose schedule lists the paper, when known.
+    """
+    id: str
+    session_id: str
+    title: str
+    authors: tuple = ()
+    image: str = None
+    date: str = None
+    pid: str = dataclasses.field(init=False)
+
+    def __post_init__(self):
+        # The papers_#### key used by url.json and the page's data-paper-id.
+        self.pid = f"papers_{self.id}"
 
 
 def extract_technical_papers(html_content):
@@ -194,17 +511,109 @@ def extract_technical_papers(html_content):
         )
         authors = [unescape(a.strip()) for a in authors]
         
-        papers.append({
-            'id': paper_id,
-            'session_id': session_id,
-            'title': title,
-            'authors': authors,
-            'image': image,
-        })
+        papers.append(Paper(
+            id=paper_id,
+            session_id=sys.intern(session_id),
+            title=title,
+            authors=tuple(sys.intern(a) for a in authors),
+            image=image,
+        ))
     
     return papers
 
 
+def _check_artifact_version(header, path, stage):
+    if header.get("version") != ARTIFACT_VERSION:
+        raise ValueError(
+            f"{path} has format version {header.get('version')!r}, expected {ARTIFACT_VERSION}; "
+            f"re-run `python scraper.py {stage}`"
+        )
+
+
+def write_raw_snippets(days, raw_dir=RAW_DIR):
+    """Write one <date>.html per fetched day plus a manifest.json describing them."""
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "version": ARTIFACT_VERSION,
+        "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "days": {},
+    }
+    for date, content in days.items():
+        data = content.encode("utf-8")
+        path = raw_dir / f"{date}.html"
+        path.write_bytes(data)
+        manifest["days"][date] = {
+            "file": path.name,
+            "url": BASE_URL.format(date=date),
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+    write_json_atomic(raw_dir / "manifest.json", manifest)
+    return manifest
+
+
+def read_raw_days(raw_dir=RAW_DIR):
+    """{date: schedule HTML} for the days listed in raw_dir/manifest.json, in date order."""
+    manifest_path = raw_dir / "manifest.json"
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    _check_artifact_version(manifest, manifest_path, "fetch")
+    missing = [date for date in DATES if date not in manifest["days"]]
+    if missing:
+        raise IncompleteScheduleError(f"{manifest_path} is missing days: {', '.join(missing)}")
+    return {
+        date: (raw_dir / info["file"]).read_text(encoding="utf-8")
+        for date, info in sorted(manifest["days"].items())
+    }
+
+
+def read_raw_snippets(raw_dir=RAW_DIR):
+    """Concatenated schedule HTML of the days listed in raw_dir/manifest.json."""
+    return "".join(read_raw_days(raw_dir).values())
+
+
+def write_papers_jsonl(papers_by_session, path=PAPERS_JSONL_PATH):
+    """
+    Write parsed papers as JSON Lines: a format header, then one paper per line
+    in page order.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_open(path) as f:
+        f.write(json.dumps({"format": "siggraph-papers", "version": ARTIFACT_VERSION}) + "\n")
+        for session_name, papers in papers_by_session.items():
+            for paper in papers:
+                record = {
+                    "id": paper.id,
+                    "session_id": paper.session_id,
+                    "session": session_name,
+                    "title": paper.title,
+                    "authors": list(paper.authors),
+                    "image": paper.image,
+                    "date": paper.date,
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def read_papers_jsonl(path=PAPERS_JSONL_PATH):
+    """Read papers.jsonl back into {session name: [Paper, ...]} in page order."""
+    papers_by_session = {}
+    with open(path, "r", encoding="utf-8") as f:
+        _check_artifact_version(json.loads(f.readline() or "{}"), path, "parse")
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            papers_by_session.setdefault(record["session"], []).append(Paper(
+                id=record["id"],
+                session_id=sys.intern(record["session_id"]),
+                title=record["title"],
+                authors=tuple(sys.intern(a) for a in record["authors"]),
+                image=record["image"],
+                date=record.get("date"),
+            ))
+    return papers_by_session
+
+
 def group_papers_by_session(papers):
     """Group papers by session, using actual session topic names."""
     
@@ -276,7 +685,7 @@ def group_papers_by_session(papers):
     # Group by session ID
     by_session = defaultdict(list)
     for p in papers:
-        by_session[p['session_id']].append(p)
+        by_session[p.session_id].append(p)
     
     # Sort sessions by their numeric ID
     sorted_sessions = sorted(by_session.items(), key=lambda x: int(x[0].replace('sess', '')))
@@ -304,13 +713,142 @@ def group_papers_by_session(papers):
     return result
 
 
-def generate_html(papers_by_session):
-    """Generate HTML output with CSS styling."""
+def render_paper_card(paper, url_map, abstract_map, related=None, placeholder=None):
+    """
+    Render a single paper-card article.
+
+    related, if given, is a list of (papers_####, title, href) for the card's
+    "Related" list (see related_items); the ids are also exposed as data-related.
+    placeholder (see thumbnails.placeholder_info) adds the thumbnail's
+    intrinsic width/height and paints its colour / blurred preview inline
+    until the lazy image loads; its "src", when set by render_stage, is the
+    same-origin copy loaded instead of paper.image.
+    """
+    # Thumbnail
+    if paper.image and placeholder:
+        background = " ".join(filter(None, [
+            placeholder.get("color"),
+            f"url({placeholder['lqip']}) center/cover no-repeat" if placeholder.get("lqip") else None,
+        ]))
+        style_attr = f' style="background:{background}"' if background else ""
+        thumb_html = (
+            f'<img class="thumbnail" src="{placeholder.get("src", paper.image)}" alt="" loading="lazy" decoding="async"'
+            f' width="{placeholder["width"]}" height="{placeholder["height"]}"{style_attr}>'
+        )
+    elif paper.image:
+        thumb_html = f'<img class="thumbnail" src="{paper.image}" alt="" loading="lazy">'
+    else:
+        thumb_html = '<div class="thumbnail placeholder">📄</div>'
     
-    url_map = load_urls_for_html()
-    abstract_map = load_abstracts_for_html()
+    # Authors
+    authors_str = ", ".join(paper.authors[:6])
+    authors_html = f'<p class="authors">{html_escape(authors_str)}</p>' if authors_str else ''
+
+    pid = paper.pid
+    paper_url = url_map.get(pid, "").strip()
+    paper_abstract = abstract_map.get(pid, "").strip()
+
+    safe_title = html_escape(paper.title)
+    title_html = safe_title
+    link_block_html = ""
+    if paper_url:
+        safe_url = paper_url.replace('"', "%22")
+        title_html = f'<a class="paper-title-link" href="{safe_url}" target="_blank" rel="noopener">{safe_title}</a>'
+        # Escape for JavaScript: replace quotes and newlines
+        js_url = paper_url.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r')
+        link_block_html = f'''
+            <div class="paper-links">
+                <a class="paper-link" href="{safe_url}" target="_blank" rel="noopener">
+                    🔗 Open link
+                    <span class="edit-icon-inline" onclick="event.preventDefault(); event.stopPropagation(); openEditModal('{pid}', 'url', '{js_url}')" title="Edit URL">✏️</span>
+                </a>
+            </div>
+        '''
+    else:
+        link_block_html = f'''
+            <div class="paper-links">
+                <button class="edit-btn" onclick="openEditModal('{pid}', 'url', '')" title="Add URL">✏️ Add link</button>
+            </div>
+        '''
+
+    if paper_abstract:
+        # Escape for JavaScript
+        js_abstract = paper_abstract.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r')
+        abstract_html = f'''
+            <details class="abstract-toggle">
+                <summary>
+                    🧻 Abstract
+                    <button class="edit-btn-inline" onclick="event.stopPropagation(); openEditModal('{pid}', 'abstract', '{js_abstract}')" title="Edit Abstract">✏️</button>
+                </summary>
+                <div class="abstract-body">{html_escape(paper_abstract)}</div>
+            </details>
+        '''
+    else:
+        abstract_html = f'''
+            <details class="abstract-toggle">
+                <summary>
+                    🧻 Abstract
+                    <button class="edit-btn-inline" onclick="event.stopPropagation(); openEditModal('{pid}', 'abstract', '')" title="Add Abstract">✏️</button>
+                </summary>
+                <div class="abstract-body abstract-missing">Abstract not available yet (you can paste it into url.json).</div>
+            </details>
+        '''
     
-    css = '''
+    related_html = ""
+    related_attr = ""
+    if related:
+        items_html = "".join(
+            f'<li><a href="{rel_href}">{html_escape(rel_title)}</a></li>' for _, rel_title, rel_href in related
+        )
+        related_html = f'''
+            <details class="abstract-toggle related-toggle">
+                <summary>🧭 Related</summary>
+                <ul class="abstract-body related-list">{items_html}</ul>
+            </details>
+        '''
+        related_attr = f' data-related="{" ".join(rel_pid for rel_pid, _, _ in related)}"'
+    
+    # Combine link, abstract and related papers in one container
+    actions_html = ""
+    if link_block_html or abstract_html:
+        actions_html = f'''
+            <div class="paper-actions">
+                {link_block_html}
+                {abstract_html}
+                {related_html}
+            </div>
+        '''
+    
+    return f'''
+    <article class="paper-card" id="{pid}" data-paper-id="{pid}"{related_attr}>
+        <div class="thumbnail-wrapper">
+            {thumb_html}
+        </div>
+        <div class="card-content">
+            <h3>{title_html}</h3>
+            {authors_html}
+            {actions_html}
+        </div>
+    </article>
+    '''
+
+
+def render_session(session_name, papers, cards_html):
+    """Render a session section around its already-rendered paper cards."""
+    return f'''
+    <section class="session">
+        <div class="session-header">
+            <h2>{session_name}</h2>
+            <span class="session-count">{len(papers)} papers</span>
+        </div>
+        <div class="papers-grid">
+            {cards_html}
+        </div>
+    </section>
+    '''
+
+
+PAGE_CSS = '''
 :root {
     --bg-primary: #fef9f3;
     --bg-secondary: #fff5eb;
@@ -326,8 +864,6 @@ def generate_html(papers_by_session):
     --shadow: rgba(255, 107, 107, 0.15);
 }
 
-@import url('https://fonts.googleapis.com/css2?family=Fredoka:wght@400;500;600;700&family=Nunito:wght@400;500;600;700&display=swap');
-
 * {
     margin: 0;
     padding: 0;
@@ -513,6 +1049,36 @@ header .subtitle {
     border: 2px solid rgba(255, 107, 107, 0.2);
 }
 
+.page-nav {
+    margin-bottom: 2rem;
+    font-family: 'Fredoka', sans-serif;
+    font-weight: 600;
+}
+
+.page-nav a,
+.session-index a {
+    color: var(--accent);
+    text-decoration: none;
+}
+
+.session-index {
+    list-style: none;
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
+    gap: 1rem;
+}
+
+.session-index li {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    gap: 1rem;
+    padding: 1rem 1.5rem;
+    background: var(--bg-card);
+    border: 2px solid var(--border);
+    border-radius: 20px;
+}
+
 .papers-grid {
     display: grid;
     grid-template-columns: repeat(auto-fill, minmax(340px, 1fr));
@@ -675,6 +1241,25 @@ header .subtitle {
     font-style: italic;
 }
 
+.related-list {
+    list-style: none;
+    white-space: normal;
+}
+
+.related-list li + li {
+    margin-top: 0.4rem;
+}
+
+.related-list a {
+    color: var(--text-primary);
+    text-decoration: none;
+    font-weight: 600;
+}
+
+.related-list a:hover {
+    color: var(--accent);
+}
+
 .paper-link {
     display: inline-flex;
     align-items: center;
@@ -952,188 +1537,16 @@ footer a:hover {
     }
 }
 '''
-    
-    # Count totals
-    total_papers = sum(len(papers) for papers in papers_by_session.values())
-    total_sessions = len(papers_by_session)
-    
-    # Generate session HTML
-    sessions_html = ""
-    
-    for session_name, papers in papers_by_session.items():
-        papers_html = ""
-        for paper in papers:
-            # Thumbnail
-            if paper.get('image'):
-                thumb_html = f'<img class="thumbnail" src="{paper["image"]}" alt="" loading="lazy">'
-            else:
-                thumb_html = '<div class="thumbnail placeholder">📄</div>'
-            
-            # Authors
-            authors_str = ", ".join(paper.get('authors', [])[:6])
-            authors_html = f'<p class="authors">{html_escape(authors_str)}</p>' if authors_str else ''
-
-            pid = f"papers_{paper['id']}"
-            paper_url = url_map.get(pid, "").strip()
-            paper_abstract = abstract_map.get(pid, "").strip()
-
-            safe_title = html_escape(paper["title"])
-            title_html = safe_title
-            link_block_html = ""
-            if paper_url:
-                safe_url = paper_url.replace('"', "%22")
-                title_html = f'<a class="paper-title-link" href="{safe_url}" target="_blank" rel="noopener">{safe_title}</a>'
-                # Escape for JavaScript: replace quotes and newlines
-                js_url = paper_url.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r')
-                link_block_html = f'''
-                    <div class="paper-links">
-                        <a class="paper-link" href="{safe_url}" target="_blank" rel="noopener">
-                            🔗 Open link
-                            <span class="edit-icon-inline" onclick="event.preventDefault(); event.stopPropagation(); openEditModal('{pid}', 'url', '{js_url}')" title="Edit URL">✏️</span>
-                        </a>
-                    </div>
-                '''
-            else:
-                link_block_html = f'''
-                    <div class="paper-links">
-                        <button class="edit-btn" onclick="openEditModal('{pid}', 'url', '')" title="Add URL">✏️ Add link</button>
-                    </div>
-                '''
-
-            if paper_abstract:
-                # Escape for JavaScript
-                js_abstract = paper_abstract.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r')
-                abstract_html = f'''
-                    <details class="abstract-toggle">
-                        <summary>
-                            🧻 Abstract
-                            <button class="edit-btn-inline" onclick="event.stopPropagation(); openEditModal('{pid}', 'abstract', '{js_abstract}')" title="Edit Abstract">✏️</button>
-                        </summary>
-                        <div class="abstract-body">{html_escape(paper_abstract)}</div>
-                    </details>
-                '''
-            else:
-                abstract_html = f'''
-                    <details class="abstract-toggle">
-                        <summary>
-                            🧻 Abstract
-                            <button class="edit-btn-inline" onclick="event.stopPropagation(); openEditModal('{pid}', 'abstract', '')" title="Add Abstract">✏️</button>
-                        </summary>
-                        <div class="abstract-body abstract-missing">Abstract not available yet (you can paste it into url.json).</div>
-                    </details>
-                '''
-            
-            # Combine link and abstract in one container
-            actions_html = ""
-            if link_block_html or abstract_html:
-                actions_html = f'''
-                    <div class="paper-actions">
-                        {link_block_html}
-                        {abstract_html}
-                    </div>
-                '''
-            
-            papers_html += f'''
-            <article class="paper-card" data-paper-id="{pid}">
-                <div class="thumbnail-wrapper">
-                    {thumb_html}
-                </div>
-                <div class="card-content">
-                    <h3>{title_html}</h3>
-                    {authors_html}
-                    {actions_html}
-                </div>
-            </article>
-            '''
-        
-        sessions_html += f'''
-        <section class="session">
-            <div class="session-header">
-                <h2>{session_name}</h2>
-                <span class="session-count">{len(papers)} papers</span>
-            </div>
-            <div class="papers-grid">
-                {papers_html}
-            </div>
-        </section>
-        '''
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>SIGGRAPH Asia 2025 - Technical Papers</title>
-    <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🎬</text></svg>">
-    <style>
-{css}
-    </style>
-</head>
-<body>
-    <div class="bg-pattern"></div>
-    
-    <header>
-        <div class="logo">ACM SIGGRAPH</div>
-        <h1>SIGGRAPH Asia 2025</h1>
-        <p class="subtitle">Technical Papers Collection</p>
-        
-        <div class="meta-info">
-            <span><span class="icon">📍</span> Hong Kong</span>
-            <span><span class="icon">📅</span> December 13-19, 2025</span>
-        </div>
-        
-        <div class="stats-bar">
-            <div class="stat-item">
-                <div class="stat-value">{total_papers}</div>
-                <div class="stat-label">Technical Papers</div>
-            </div>
-            <div class="stat-item">
-                <div class="stat-value">{total_sessions}</div>
-                <div class="stat-label">Sessions</div>
-            </div>
-        </div>
-    </header>
-    
-    <main class="container">
-        {sessions_html}
-    </main>
-    
-    <footer>
-        <p>Data sourced from <a href="https://sa2025.conference-schedule.org/" target="_blank" rel="noopener">SIGGRAPH Asia 2025 Conference Schedule</a></p>
-        <p style="margin-top: 0.5rem; opacity: 0.7;">Generated with Python</p>
-    </footer>
-    
-    <!-- Edit Modal -->
-    <div id="editModal" class="edit-modal">
-        <div class="edit-modal-content">
-            <div class="edit-modal-header">
-                <h3 id="modalTitle">Edit</h3>
-                <button class="edit-modal-close" onclick="closeEditModal()">×</button>
-            </div>
-            <div class="edit-modal-body">
-                <label id="modalLabel" for="editInput">Value:</label>
-                <input type="text" id="editInput" style="display: none;">
-                <textarea id="editTextarea" style="display: none;"></textarea>
-            </div>
-            <div class="edit-modal-footer">
-                <button class="edit-modal-btn cancel" onclick="closeEditModal()">Cancel</button>
-                <button class="edit-modal-btn save" onclick="saveEdit()">Save</button>
-            </div>
-        </div>
-    </div>
-    
-    <!-- Export Button -->
-    <div class="export-btn-container">
-        <button class="export-btn" onclick="exportToJson()">📥 Export url.json</button>
-    </div>
-    
-    <script>
-        let currentEdit = {{'paperId': null, 'field': null}};
+
+
+EDITOR_JS = '''
+        let currentEdit = {'paperId': null, 'field': null, 'base': ''};
         const editsKey = 'siggraph_paper_edits';
         
-        function openEditModal(paperId, field, currentValue) {{
+        function openEditModal(paperId, field, currentValue) {
             currentEdit.paperId = paperId;
             currentEdit.field = field;
+            currentEdit.base = currentValue || '';
             
             const modal = document.getElementById('editModal');
             const title = document.getElementById('modalTitle');
@@ -1141,154 +1554,280 @@ footer a:hover {
             const input = document.getElementById('editInput');
             const textarea = document.getElementById('editTextarea');
             
-            if (field === 'url') {{
+            if (field === 'url') {
                 title.textContent = 'Edit URL';
                 label.textContent = 'URL:';
                 input.style.display = 'block';
                 textarea.style.display = 'none';
                 input.value = currentValue || '';
                 input.focus();
-            }} else if (field === 'abstract') {{
+            } else if (field === 'abstract') {
                 title.textContent = 'Edit Abstract';
                 label.textContent = 'Abstract:';
                 input.style.display = 'none';
                 textarea.style.display = 'block';
                 textarea.value = currentValue || '';
                 textarea.focus();
-            }}
+            }
             
             modal.classList.add('active');
-        }}
+        }
         
-        function closeEditModal() {{
+        function closeEditModal() {
             document.getElementById('editModal').classList.remove('active');
             currentEdit.paperId = null;
             currentEdit.field = null;
-        }}
+        }
         
-        function saveEdit() {{
+        function saveEdit() {
             if (!currentEdit.paperId || !currentEdit.field) return;
             
             const input = document.getElementById('editInput');
             const textarea = document.getElementById('editTextarea');
             const value = currentEdit.field === 'url' ? input.value.trim() : textarea.value.trim();
+            const paperId = currentEdit.paperId;
+            const field = currentEdit.field;
+            const base = currentEdit.base;
             
-            // Save to localStorage
-            let edits = JSON.parse(localStorage.getItem(editsKey) || '{{}}');
-            if (!edits[currentEdit.paperId]) {{
-                edits[currentEdit.paperId] = {{}};
-            }}
-            edits[currentEdit.paperId][currentEdit.field] = value;
-            localStorage.setItem(editsKey, JSON.stringify(edits));
+            // Persist through the local edit server when the page is served by
+            // `python scraper.py watch`; otherwise keep the edit in localStorage.
+            fetch(`/papers/${encodeURIComponent(paperId)}`, {
+                method: 'PATCH',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({[field]: value}),
+            })
+                .then(r => {
+                    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+                    return r.json();
+                })
+                .then(data => {
+                    // The server re-rendered this card already; don't live-reload for it.
+                    if (data.build !== undefined) window.liveBuild = data.build;
+                    clearLocalEdit(paperId, field);
+                })
+                .catch(() => saveLocalEdit(paperId, field, value, base));
             
             // Update the UI immediately
-            updateUI(currentEdit.paperId, currentEdit.field, value);
+            updateUI(paperId, field, value);
             
             closeEditModal();
-        }}
+        }
+        
+        function saveLocalEdit(paperId, field, value, base) {
+            let edits = JSON.parse(localStorage.getItem(editsKey) || '{}');
+            if (!edits[paperId]) {
+                edits[paperId] = {};
+            }
+            edits[paperId][field] = value;
+            
+            // Bookkeeping for `python scraper.py merge-edits`: when the field was
+            // last edited and its value before the first local edit.
+            const meta = edits[paperId]._meta || (edits[paperId]._meta = {});
+            if (!meta[field]) meta[field] = {'base': base};
+            meta[field].updatedAt = Date.now();
+            
+            localStorage.setItem(editsKey, JSON.stringify(edits));
+        }
         
-        function updateUI(paperId, field, value) {{
-            const card = document.querySelector(`[data-paper-id="${{paperId}}"]`);
+        function clearLocalEdit(paperId, field) {
+            let edits = JSON.parse(localStorage.getItem(editsKey) || '{}');
+            if (!edits[paperId] || edits[paperId][field] === undefined) return;
+            delete edits[paperId][field];
+            if (edits[paperId]._meta) delete edits[paperId]._meta[field];
+            if (edits[paperId].url === undefined && edits[paperId].abstract === undefined) delete edits[paperId];
+            localStorage.setItem(editsKey, JSON.stringify(edits));
+        }
+        
+        function updateUI(paperId, field, value) {
+            const card = document.querySelector(`[data-paper-id="${paperId}"]`);
             if (!card) return;
             
-            if (field === 'url') {{
+            if (field === 'url') {
                 const linkDiv = card.querySelector('.paper-links');
-                if (value) {{
+                if (value) {
                     const link = linkDiv.querySelector('.paper-link');
-                    if (link) {{
+                    if (link) {
                         link.href = value;
                         // Update or add edit icon inside the link
                         let editIcon = link.querySelector('.edit-icon-inline');
                         const escapedValue = value.replace(/'/g, "\\\\'");
-                        if (!editIcon) {{
+                        if (!editIcon) {
                             editIcon = document.createElement('span');
                             editIcon.className = 'edit-icon-inline';
                             editIcon.title = 'Edit URL';
                             editIcon.textContent = '✏️';
-                            editIcon.onclick = (e) => {{
+                            editIcon.onclick = (e) => {
                                 e.preventDefault();
                                 e.stopPropagation();
                                 openEditModal(paperId, 'url', value);
-                            }};
+                            };
                             link.appendChild(editIcon);
-                        }} else {{
-                            editIcon.onclick = (e) => {{
+                        } else {
+                            editIcon.onclick = (e) => {
                                 e.preventDefault();
                                 e.stopPropagation();
                                 openEditModal(paperId, 'url', value);
-                            }};
-                        }}
-                    }} else {{
+                            };
+                        }
+                    } else {
                         const escapedValue = value.replace(/'/g, "\\\\'");
-                        linkDiv.innerHTML = `<a class="paper-link" href="${{value}}" target="_blank" rel="noopener">🔗 Open link<span class="edit-icon-inline" onclick="event.preventDefault(); event.stopPropagation(); openEditModal('${{paperId}}', 'url', '${{escapedValue}}')" title="Edit URL">✏️</span></a>`;
-                    }}
-                }}
+                        linkDiv.innerHTML = `<a class="paper-link" href="${value}" target="_blank" rel="noopener">🔗 Open link<span class="edit-icon-inline" onclick="event.preventDefault(); event.stopPropagation(); openEditModal('${paperId}', 'url', '${escapedValue}')" title="Edit URL">✏️</span></a>`;
+                    }
+                }
                 // Update title link too
                 const titleLink = card.querySelector('.paper-title-link');
-                if (titleLink) {{
+                if (titleLink) {
                     titleLink.href = value;
-                }}
-            }} else if (field === 'abstract') {{
+                }
+            } else if (field === 'abstract') {
                 const details = card.querySelector('.abstract-toggle');
-                if (details) {{
+                if (details) {
                     const body = details.querySelector('.abstract-body');
-                    if (body) {{
+                    if (body) {
                         body.textContent = value || 'Abstract not available yet (you can paste it into url.json).';
                         body.classList.toggle('abstract-missing', !value);
-                    }}
-                }}
-            }}
-        }}
+                    }
+                }
+            }
+        }
         
-        function exportToJson() {{
-            const edits = JSON.parse(localStorage.getItem(editsKey) || '{{}}');
-            if (Object.keys(edits).length === 0) {{
+        function exportEdits() {
+            const edits = JSON.parse(localStorage.getItem(editsKey) || '{}');
+            
+            // Export only the edited fields; `python scraper.py merge-edits` folds
+            // them into url.json with per-field last-writer-wins.
+            const delta = {};
+            for (const [paperId, fields] of Object.entries(edits)) {
+                const meta = fields._meta || {};
+                for (const field of ['url', 'abstract']) {
+                    if (fields[field] === undefined) continue;
+                    delta[paperId] = delta[paperId] || {};
+                    delta[paperId][field] = {
+                        'value': fields[field],
+                        'updated_at': (meta[field] || {}).updatedAt || null,
+                        'base': (meta[field] || {}).base ?? null,
+                    };
+                }
+            }
+            if (Object.keys(delta).length === 0) {
                 alert('No edits to export! Make some edits first.');
                 return;
-            }}
+            }
             
-            // Load original url.json structure
-            fetch('url.json')
-                .then(r => r.json())
-                .then(original => {{
-                    // Merge edits into original
-                    const updated = original.map(entry => {{
-                        const pid = entry.id;
-                        if (edits[pid]) {{
-                            if (edits[pid].url !== undefined) entry.url = edits[pid].url;
-                            if (edits[pid].abstract !== undefined) entry.abstract = edits[pid].abstract;
-                        }}
-                        return entry;
-                    }});
-                    
-                    // Download as JSON file
-                    const blob = new Blob([JSON.stringify(updated, null, 2)], {{'type': 'application/json'}});
-                    const url = URL.createObjectURL(blob);
-                    const a = document.createElement('a');
-                    a.href = url;
-                    a.download = 'url.json';
-                    a.click();
-                    URL.revokeObjectURL(url);
-                }})
-                .catch(() => {{
-                    alert('Could not load url.json. Edits saved to localStorage only.');
-                }});
-        }}
+            const payload = {'format': editsKey, 'version': 1, 'exported_at': Date.now(), 'edits': delta};
+            const blob = new Blob([JSON.stringify(payload, null, 2)], {'type': 'application/json'});
+            const url = URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = `${editsKey}.json`;
+            a.click();
+            URL.revokeObjectURL(url);
+        }
         
         // Load edits from localStorage on page load
-        window.addEventListener('DOMContentLoaded', () => {{
-            const edits = JSON.parse(localStorage.getItem(editsKey) || '{{}}');
-            for (const [paperId, fields] of Object.entries(edits)) {{
+        window.addEventListener('DOMContentLoaded', () => {
+            const edits = JSON.parse(localStorage.getItem(editsKey) || '{}');
+            for (const [paperId, fields] of Object.entries(edits)) {
                 if (fields.url !== undefined) updateUI(paperId, 'url', fields.url);
                 if (fields.abstract !== undefined) updateUI(paperId, 'abstract', fields.abstract);
-            }}
-        }});
+            }
+        });
         
         // Close modal on background click
-        document.getElementById('editModal').addEventListener('click', (e) => {{
+        document.getElementById('editModal').addEventListener('click', (e) => {
             if (e.target.id === 'editModal') closeEditModal();
-        }});
-    </script>
+        });
+'''
+
+
+def render_page(sessions_html, total_papers, total_sessions, extra_body="", asset_urls=None):
+    """
+    Wrap rendered sessions in the full page: styles, header, edit modal and script.
+
+    With asset_urls ({"css": ..., "js": ...}, see assets.write_static_assets) the
+    stylesheet and editor script are referenced as external files instead of inlined.
+    """
+    fonts_href = html_escape(FONTS_URL)
+    if asset_urls:
+        style_html = f'<link rel="stylesheet" href="{asset_urls["css"]}">'
+        script_html = f'<script src="{asset_urls["js"]}"></script>'
+    else:
+        style_html = f"<style>\n{PAGE_CSS}\n    </style>"
+        script_html = f"<script>\n{EDITOR_JS}\n    </script>"
+    
+    html = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SIGGRAPH Asia 2025 - Technical Papers</title>
+    <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🎬</text></svg>">
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link rel="preload" as="style" href="{fonts_href}" onload="this.onload=null;this.rel='stylesheet'">
+    <noscript><link rel="stylesheet" href="{fonts_href}"></noscript>
+    {style_html}
+</head>
+<body>
+    <div class="bg-pattern"></div>
+    
+    <header>
+        <div class="logo">ACM SIGGRAPH</div>
+        <h1>SIGGRAPH Asia 2025</h1>
+        <p class="subtitle">Technical Papers Collection</p>
+        
+        <div class="meta-info">
+            <span><span class="icon">📍</span> Hong Kong</span>
+            <span><span class="icon">📅</span> December 13-19, 2025</span>
+        </div>
+        
+        <div class="stats-bar">
+            <div class="stat-item">
+                <div class="stat-value">{total_papers}</div>
+                <div class="stat-label">Technical Papers</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-value">{total_sessions}</div>
+                <div class="stat-label">Sessions</div>
+            </div>
+        </div>
+    </header>
+    
+    <main class="container">
+        {sessions_html}
+    </main>
+    
+    <footer>
+        <p>Data sourced from <a href="https://sa2025.conference-schedule.org/" target="_blank" rel="noopener">SIGGRAPH Asia 2025 Conference Schedule</a></p>
+        <p style="margin-top: 0.5rem; opacity: 0.7;">Generated with Python</p>
+    </footer>
+    
+    <!-- Edit Modal -->
+    <div id="editModal" class="edit-modal">
+        <div class="edit-modal-content">
+            <div class="edit-modal-header">
+                <h3 id="modalTitle">Edit</h3>
+                <button class="edit-modal-close" onclick="closeEditModal()">×</button>
+            </div>
+            <div class="edit-modal-body">
+                <label id="modalLabel" for="editInput">Value:</label>
+                <input type="text" id="editInput" style="display: none;">
+                <textarea id="editTextarea" style="display: none;"></textarea>
+            </div>
+            <div class="edit-modal-footer">
+                <button class="edit-modal-btn cancel" onclick="closeEditModal()">Cancel</button>
+                <button class="edit-modal-btn save" onclick="saveEdit()">Save</button>
+            </div>
+        </div>
+    </div>
+    
+    <!-- Export Button -->
+    <div class="export-btn-container">
+        <button class="export-btn" onclick="exportEdits()">📥 Export edits</button>
+    </div>
+    
+    {script_html}
+{extra_body}
 </body>
 </html>
 '''
@@ -1296,33 +1835,269 @@ footer a:hover {
     return html
 
 
-def main():
-    print("=" * 60)
-    print("SIGGRAPH Asia 2025 Technical Papers Scraper")
-    print("=" * 60)
+def generate_html(papers_by_session, extra_body="", asset_urls=None, related_map=None, placeholder_map=None):
+    """
+    Generate HTML output with CSS styling.
+
+    related_map (papers_#### -> [papers_####], see analysis.related_papers)
+    adds a "Related" list to each card; placeholder_map (image url ->
+    placeholder, see thumbnails.build_placeholders) sizes and previews the
+    thumbnails.
+    """
     
-    # Fetch schedule data
-    print("\nFetching schedule data...")
-    html_content = fetch_schedule_data()
+    meta_map = _load_existing_meta()
+    url_map = load_urls_for_html(meta_map)
+    abstract_map = load_abstracts_for_html(meta_map)
+    
+    # Count totals
+    total_papers = sum(len(papers) for papers in papers_by_session.values())
+    total_sessions = len(papers_by_session)
+    
+    related_map = related_map or {}
+    placeholder_map = placeholder_map or {}
+    titles = {paper.pid: paper.title for papers in papers_by_session.values() for paper in papers}
+    
+    # Generate session HTML
+    sessions_html = ""
+    for session_name, papers in papers_by_session.items():
+        cards_html = "".join(
+            render_paper_card(
+                paper, url_map, abstract_map,
+                related_items(paper.pid, related_map, titles),
+                placeholder_map.get(paper.image),
+            )
+            for paper in papers
+        )
+        sessions_html += render_session(session_name, papers, cards_html)
     
-    if not html_content:
-        print("ERROR: Could not fetch schedule data")
+    return render_page(sessions_html, total_papers, total_sessions, extra_body, asset_urls)
+
+
+def related_items(pid, related_map, titles, page_of=None):
+    """
+    (papers_####, title, href) for pid's related papers that are in titles.
+
+    hrefs are in-page anchors; with page_of (papers_#### -> page file name,
+    multi-page mode) papers on another page link to that page's anchor.
+    """
+    own_page = page_of.get(pid) if page_of else None
+    items = []
+    for rel in related_map.get(pid, []):
+        if rel not in titles:
+            continue
+        page = page_of.get(rel) if page_of else None
+        href = f"#{rel}" if page == own_page else f"{page}#{rel}"
+        items.append((rel, titles[rel], href))
+    return items
+
+
+def session_slug(session_name):
+    """File-name friendly slug for a session name."""
+    return re.sub(r"[^a-z0-9]+", "-", session_name.lower()).strip("-") or "session"
+
+
+def _render_session_page(session_name, papers, url_map, abstract_map, asset_urls, placeholder_map, related):
+    cards_html = "".join(
+        render_paper_card(
+            paper, url_map, abstract_map, related.get(paper.pid), placeholder=placeholder_map.get(paper.image)
+        )
+        for paper in papers
+    )
+    nav_html = '<nav class="page-nav"><a href="index.html">← All sessions</a></nav>'
+    return render_page(nav_html + render_session(session_name, papers, cards_html), len(papers), 1, "", asset_urls)
+
+
+def _render_index_page(pages, total_papers, asset_urls):
+    items_html = "".join(
+        f'<li><a href="{slug}.html">{html_escape(session_name)}</a>'
+        f'<span class="session-count">{count} papers</span></li>'
+        for session_name, slug, count in pages
+    )
+    sessions_html = f'''
+    <section class="session">
+        <div class="session-header">
+            <h2>Sessions</h2>
+        </div>
+        <ul class="session-index">{items_html}</ul>
+    </section>
+    '''
+    return render_page(sessions_html, total_papers, len(pages), "", asset_urls)
+
+
+def generate_session_pages(
+    papers_by_session, out_dir=SESSIONS_DIR, asset_urls=None, placeholder_map=None, related_map=None,
+    max_workers=None,
+):
+    """
+    Multi-page mode: write one HTML file per session plus an index.html into out_dir.
+
+    Related lists (related_map, as in generate_html) link across pages.
+    A page is re-rendered only when its inputs (papers, their url.json entries,
+    thumbnail placeholders, related lists, asset urls) hash differently from the last run, as recorded in
+    out_dir/manifest.json. Pending pages are rendered in parallel worker
+    processes. Returns (written, all_paths).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception:
+        manifest = {}
+
+    meta_map = _load_existing_meta()
+    url_map = load_urls_for_html(meta_map)
+    abstract_map = load_abstracts_for_html(meta_map)
+    placeholder_map = placeholder_map or {}
+
+    # Pages live one level below the assets' base directory.
+    if asset_urls:
+        asset_urls = {k: os.path.relpath(v, out_dir).replace(os.sep, "/") for k, v in asset_urls.items()}
+    placeholder_map = {
+        url: {**info, "src": os.path.relpath(info["src"], out_dir).replace(os.sep, "/")} if "src" in info else info
+        for url, info in placeholder_map.items()
+    }
+    # Any change to the page template invalidates every page.
+    shell_key = hashlib.sha256(render_page("", 0, 0, "", asset_urls).encode("utf-8")).hexdigest()
+
+    pages = []
+    used_slugs = set()
+    for session_name, papers in papers_by_session.items():
+        slug = base = session_slug(session_name)
+        n = 2
+        while slug in used_slugs or slug == "index":
+            slug, n = f"{base}-{n}", n + 1
+        used_slugs.add(slug)
+        pages.append((session_name, slug, len(papers)))
+
+    related_map = related_map or {}
+    titles = {paper.pid: paper.title for papers in papers_by_session.values() for paper in papers}
+    page_of = {
+        paper.pid: f"{slug}.html"
+        for (_, slug, _), papers in zip(pages, papers_by_session.values()) for paper in papers
+    }
+
+    pending = {}
+    new_manifest = {}
+    for (session_name, slug, _), papers in zip(pages, papers_by_session.values()):
+        pids = [paper.pid for paper in papers]
+        page_placeholders = {p.image: placeholder_map[p.image] for p in papers if p.image in placeholder_map}
+        page_related = {pid: related_items(pid, related_map, titles, page_of) for pid in pids}
+        key_payload = json.dumps(
+            [
+                session_name, [dataclasses.astuple(paper) for paper in papers],
+                [meta_map.get(pid) for pid in pids], page_placeholders, page_related, shell_key,
+            ],
+            sort_keys=True, ensure_ascii=False,
+        )
+        key = hashlib.sha256(key_payload.encode("utf-8")).hexdigest()
+        new_manifest[slug] = key
+        path = out_dir / f"{slug}.html"
+        if manifest.get(slug) != key or not path.exists():
+            page_urls = {pid: url_map[pid] for pid in pids if pid in url_map}
+            page_abstracts = {pid: abstract_map[pid] for pid in pids if pid in abstract_map}
+            pending[path] = (
+                session_name, papers, page_urls, page_abstracts, asset_urls, page_placeholders, page_related
+            )
+
+    written = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_render_session_page, *args): path for path, args in pending.items()}
+            for future, path in futures.items():
+                path.write_text(future.result(), encoding="utf-8")
+                written.append(path)
+
+    index_path = out_dir / "index.html"
+    total_papers = sum(count for _, _, count in pages)
+    index_html = _render_index_page(pages, total_papers, asset_urls)
+    if not index_path.exists() or index_path.read_text(encoding="utf-8") != index_html:
+        index_path.write_text(index_html, encoding="utf-8")
+        written.append(index_path)
+
+    # Remove pages of sessions that no longer exist.
+    for slug in set(manifest) - set(new_manifest):
+        (out_dir / f"{slug}.html").unlink(missing_ok=True)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(new_manifest, f, indent=2)
+
+    all_paths = [index_path] + [out_dir / f"{slug}.html" for _, slug, _ in pages]
+    return written, all_paths
+
+
+def audit_sessions(n_clusters=None, margin=0.2):
+    """Report sessions and papers whose content disagrees with their session in url.json."""
+    if not analysis.HAVE_NUMPY:
+        print("ERROR: audit-sessions needs numpy and scipy (pip install numpy scipy)")
         return
+
+    entries = [e for e in _meta_store().entries().values() if isinstance(e, dict) and e.get("session")]
+    docs = [f"{e.get('title', '')} {e.get('abstract', '')}" for e in entries]
+    sessions = [e["session"] for e in entries]
+
+    start = time.perf_counter()
+    name_mismatches = analysis.audit_session_names(docs, sessions)
+    paper_mismatches = analysis.audit_sessions(docs, sessions, n_clusters=n_clusters, margin=margin)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Sessions whose papers match another session's name better ({len(name_mismatches)}):")
+    for session, best_name, own_sim, best_sim in name_mismatches:
+        print(f"  {session}\n    -> {best_name}  ({own_sim:.2f} vs {best_sim:.2f})")
+
+    print(f"\nPapers that disagree with their topic cluster ({len(paper_mismatches)}):")
+    for i, suggested, score in paper_mismatches:
+        e = entries[i]
+        print(f"  {e.get('id')}\t{score:.2f}\t{e['session']} -> {suggested}\t{e.get('title', '')}")
+
+    print(f"\nAudited {len(entries)} papers in {len(set(sessions))} sessions in {elapsed_ms:.0f} ms")
+
+
+@metrics.timed_stage("fetch")
+def fetch_stage(raw_dir=RAW_DIR, deadline=None):
+    """
+    Stage 1: download the per-day schedule snippets into raw_dir.
+
+    deadline (seconds) bounds the whole download, retries included; the
+    enrich stage's downloads are not counted against it.
+    """
+    print("\nFetching schedule data...")
+    try:
+        with transport.fetch_deadline(deadline):
+            days = fetch_schedule_days()
+    except IncompleteScheduleError as e:
+        print(f"ERROR: {e}; keeping the previous build")
+        return False
     
-    print(f"\nTotal HTML: {len(html_content):,} characters")
+    manifest = write_raw_snippets(days, raw_dir)
+    total = sum(info["bytes"] for info in manifest["days"].values())
+    print(f"\nTotal HTML: {total:,} bytes in {len(days)} days -> {raw_dir}/")
     
-    # Save raw content for debugging
+    # Concatenated copy for `watch --raw debug_raw.html`
     with open("debug_raw.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
+        f.write("".join(days.values()))
     print("Saved raw HTML to debug_raw.html")
-    
-    # Extract Technical Papers
+    return True
+
+
+@metrics.timed_stage("parse")
+def parse_stage(raw_dir=RAW_DIR, papers_path=PAPERS_JSONL_PATH):
+    """Stage 2: extract and group papers from the raw snippets into papers.jsonl."""
     print("\nExtracting Technical Papers...")
-    papers = extract_technical_papers(html_content)
+    days = read_raw_days(raw_dir)
+    papers = extract_technical_papers("".join(days.values()))
+    
+    # A paper's date is the first day whose snippet links to it.
+    first_day = {}
+    for date, html in days.items():
+        for paper_id in re.findall(r'id=papers_(\d+)&', html):
+            first_day.setdefault(paper_id, date)
+    for paper in papers:
+        paper.date = first_day.get(paper.id)
     
     print(f"Found {len(papers)} Technical Papers")
-    print(f"  With images: {sum(1 for p in papers if p.get('image'))}")
-    print(f"  With authors: {sum(1 for p in papers if p.get('authors'))}")
+    print(f"  With images: {sum(1 for p in papers if p.image)}")
+    print(f"  With authors: {sum(1 for p in papers if p.authors)}")
     
     # Group by session
     print("\nGrouping by session...")
@@ -1331,24 +2106,572 @@ def main():
     print(f"Sessions: {len(papers_by_session)}")
     for session, paper_list in papers_by_session.items():
         print(f"  - {session}: {len(paper_list)} papers")
+    metrics.set_gauge("papers_parsed", len(papers))
+    metrics.set_gauge("sessions", len(papers_by_session))
+    
+    write_papers_jsonl(papers_by_session, papers_path)
+    print(f"Wrote {papers_path}")
+    return papers_by_session
+
 
+@metrics.timed_stage("enrich")
+def enrich_stage(
+    papers_path=PAPERS_JSONL_PATH, related_k=5, placeholders=True, pdfs=True, arxiv=True, crossref=True,
+    browser_pages=0,
+):
+    """
+    Stage 3: update url.json (plus links, abstracts and authors from
+    Crossref, arXiv, direct-PDF links and, with browser_pages > 0, a headless
+    browser), the change feed, related papers and thumbnail placeholders
+    from papers.jsonl.
+    """
+    papers_by_session = read_papers_jsonl(papers_path)
+    papers = [paper for session_papers in papers_by_session.values() for paper in session_papers]
+    
     # Write url.json scaffold (preserving any existing URLs)
     write_urls_json(papers_by_session)
     
+    # Links, abstracts and missing authors from Crossref for known DOIs
+    if crossref:
+        fill_crossref_meta(papers)
+    
+    # Abstracts from arXiv links (batched API queries)
+    if arxiv:
+        fill_arxiv_meta(papers)
+    
+    # Abstracts from links that point straight at a PDF
+    if pdfs:
+        fill_pdf_abstracts()
+    
+    # Remaining abstracts from JS-rendered landing pages (opt-in: slow)
+    if browser_pages > 0:
+        fill_browser_abstracts(pool_size=browser_pages)
+    
+    meta_map = _load_existing_meta()
+    metrics.set_gauge("empty_urls", sum(1 for m in meta_map.values() if not m["url"].strip()))
+    metrics.set_gauge("missing_abstracts", sum(1 for m in meta_map.values() if not m["abstract"].strip()))
+    
+    # Change feed against the previous run's snapshot
+    feed = update_change_feed(papers_by_session)
+    print_change_summary(feed)
+    print(f"Wrote change feed to {CHANGES_PATH}")
+    
+    # Related papers (TF-IDF nearest neighbours over title + abstract)
+    related_map = {}
+    if related_k > 0:
+        if analysis.HAVE_NUMPY:
+            start = time.perf_counter()
+            related_map = analysis.related_papers(papers, load_abstracts_for_html(), k=related_k)
+            print(f"Computed {related_k} related papers per card in {time.perf_counter() - start:.2f}s")
+        else:
+            print("Skipping related papers (pip install numpy scipy)")
+    write_json_atomic(RELATED_JSON_PATH, {"version": ARTIFACT_VERSION, "related": related_map})
+    
+    # Thumbnail sizes and blurred previews (downloads are cached in build/thumbs/)
+    if placeholders:
+        start = time.perf_counter()
+        placeholder_map, failures = thumbnails.build_placeholders([p.image for p in papers if p.image])
+        thumbnails.write_placeholders(placeholder_map)
+        print(f"Computed {len(placeholder_map)} thumbnail placeholders in {time.perf_counter() - start:.2f}s"
+              f" ({len(failures)} failed)")
+        for url, error in list(failures.items())[:5]:
+            print(f"  {url}: {error}")
+        if thumbnails.Image is None:
+            print("  (Pillow not installed: sizes only, no colour/blur previews; pip install pillow)")
+    return papers_by_session
+
+
+def fill_crossref_meta(papers):
+    """
+    Fill empty url.json urls/abstracts from Crossref work records, and
+    record Crossref authors for papers the schedule lists without any
+    (build/authors.json, applied at render time).
+    """
+    meta_map = _load_existing_meta()
+    title_matches = crossref_meta.load_title_matches()
+    targets = {}
+    for paper in papers:
+        url = meta_map.get(paper.pid, {}).get("url", "")
+        doi = crossref_meta.doi_from_url(url) or title_matches.get(crossref_meta.title_key(paper.title))
+        if doi:
+            targets[paper.pid] = doi
+    
+    start = time.perf_counter()
+    try:
+        records, requests = crossref_meta.hydrate(targets.values())
+    except Exception as e:
+        print(f"Crossref hydration failed ({e}); continuing with cached records")
+        works = crossref_meta.load_works()
+        records, requests = {d: works.get(d) for d in targets.values()}, 0
+    
+    found = {pid: records[doi] for pid, doi in targets.items() if records.get(doi)}
+    filled = fill_missing_meta({
+        pid: {"url": record["url"], "abstract": record["abstract"]} for pid, record in found.items()
+    })
+    authors = {
+        paper.pid: found[paper.pid]["authors"]
+        for paper in papers if not paper.authors and found.get(paper.pid, {}).get("authors")
+    }
+    write_json_atomic(AUTHORS_JSON_PATH, {"version": ARTIFACT_VERSION, "authors": authors})
+    
+    n_urls = sum(1 for _, field in filled if field == "url")
+    print(f"Crossref: {len(found)} of {len(targets)} DOIs resolved ({requests} API requests), "
+          f"{n_urls} urls / {len(filled) - n_urls} abstracts filled, "
+          f"{len(authors)} author lists added in {time.perf_counter() - start:.2f}s")
+
+
+def apply_author_overrides(papers_by_session, path=AUTHORS_JSON_PATH):
+    """Give papers without schedule authors the author list enrich found for them."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _check_artifact_version(data, path, "enrich")
+    except FileNotFoundError:
+        return
+    authors = data["authors"]
+    for papers in papers_by_session.values():
+        for paper in papers:
+            if not paper.authors and paper.pid in authors:
+                paper.authors = tuple(sys.intern(a) for a in authors[paper.pid])
+
+
+def fill_arxiv_meta(papers):
+    """
+    Fill empty url.json abstracts of arXiv-linked papers from the arXiv API,
+    and report papers whose schedule title differs from the arXiv title.
+    """
+    targets = {}
+    for pid, meta in _load_existing_meta().items():
+        arxiv_id = arxiv_meta.arxiv_id(meta["url"])
+        if arxiv_id:
+            targets[pid] = arxiv_id
+    if not targets:
+        return
+    
+    start = time.perf_counter()
+    try:
+        records, requests = arxiv_meta.hydrate(targets.values())
+    except Exception as e:
+        print(f"arXiv hydration failed ({e}); continuing with cached metadata")
+        cache = arxiv_meta.load_cache()
+        records, requests = {i: cache.get(i) for i in targets.values()}, 0
+    filled = fill_missing_meta({
+        pid: {"abstract": records[arxiv_id]["abstract"]}
+        for pid, arxiv_id in targets.items() if records.get(arxiv_id)
+    })
+    print(f"arXiv: {len(filled)} abstracts filled for {len(targets)} linked papers "
+          f"({requests} API requests) in {time.perf_counter() - start:.2f}s")
+    
+    titles = {paper.pid: paper.title for paper in papers}
+    renamed = [
+        (pid, records[arxiv_id]["title"]) for pid, arxiv_id in targets.items()
+        if records.get(arxiv_id) and pid in titles
+        and records[arxiv_id]["title"].casefold() != titles[pid].casefold()
+    ]
+    if renamed:
+        print(f"  {len(renamed)} schedule titles differ from arXiv:")
+    for pid, title in renamed[:10]:
+        print(f"    {pid}: {title!r}")
+
+
+def fill_pdf_abstracts():
+    """Fill empty url.json abstracts from the first pages of direct-PDF links."""
+    targets = {
+        pid: meta["url"] for pid, meta in _load_existing_meta().items()
+        if not meta["abstract"].strip() and pdf_abstracts.is_pdf_url(meta["url"].strip())
+    }
+    if not targets:
+        return
+    if pdf_abstracts.PdfReader is None:
+        print(f"Skipping {len(targets)} PDF abstracts (pip install pypdf)")
+        return
+    
+    start = time.perf_counter()
+    abstracts, stats = pdf_abstracts.pdf_abstracts({pid: url.strip() for pid, url in targets.items()})
+    filled = fill_missing_meta({pid: {"abstract": abstract} for pid, abstract in abstracts.items()})
+    print(f"PDF abstracts: {len(filled)} filled from {stats['pdfs']} PDFs "
+          f"({stats['processed']} fetched/parsed, {len(stats['errors'])} errors) in {time.perf_counter() - start:.2f}s")
+    for url, error in stats["errors"].items():
+        print(f"  {url}: {error}")
+
+
+def fill_browser_abstracts(pool_size=browser_fetch.POOL_SIZE):
+    """Fill the abstracts still empty in url.json from their links rendered in a headless browser."""
+    targets = {
+        pid: meta["url"].strip() for pid, meta in _load_existing_meta().items()
+        if not meta["abstract"].strip() and meta["url"].strip().startswith("http")
+        and not pdf_abstracts.is_pdf_url(meta["url"].strip())
+    }
+    if not targets:
+        return
+    if browser_fetch.async_playwright is None:
+        print(f"Skipping {len(targets)} browser abstracts (pip install playwright && playwright install chromium)")
+        return
+    
+    try:
+        records, stats = browser_fetch.fetch_rendered(targets.values(), pool_size=pool_size)
+    except Exception as e:
+        # Typically a missing browser binary; the other sources already ran.
+        print(f"Browser abstracts failed: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+        return
+    abstracts = {pid: records[url]["abstract"] for pid, url in targets.items() if records.get(url, {}).get("abstract")}
+    filled = fill_missing_meta({pid: {"abstract": abstract} for pid, abstract in abstracts.items()})
+    print(f"Browser abstracts: {len(filled)} filled from {stats['pages']} pages "
+          f"({stats['cached']} cached, {stats['rendered']} rendered with {pool_size} pages, "
+          f"{len(stats['errors'])} errors) in {stats['seconds']:.2f}s")
+    for url, error in list(stats["errors"].items())[:10]:
+        print(f"  {url}: {error}")
+
+
+def _load_related_map():
+    try:
+        with open(RELATED_JSON_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _check_artifact_version(data, RELATED_JSON_PATH, "enrich")
+        return data["related"] or None
+    except FileNotFoundError:
+        return None
+
+
+@metrics.timed_stage("render")
+def render_stage(papers_path=PAPERS_JSONL_PATH, multi_page=False):
+    """Stage 4: render papers.html (and session pages) from papers.jsonl + url.json."""
+    papers_by_session = read_papers_jsonl(papers_path)
+    apply_author_overrides(papers_by_session)
+    papers = [paper for session_papers in papers_by_session.values() for paper in session_papers]
+    placeholder_map = thumbnails.load_placeholders()
+
+    # Same-origin copies of the downloaded thumbnails: cacheable by the
+    # service worker without opaque cross-origin responses.
+    thumb_paths = thumbnails.publish_thumbnails(placeholder_map, THUMBS_STATIC_DIR)
+    placeholder_map = {
+        url: {**info, "src": thumb_paths[url].as_posix()} if url in thumb_paths else info
+        for url, info in placeholder_map.items()
+    }
+    
+    # Static assets (hashed, cacheable) referenced by the page
+    asset_urls, asset_paths = write_static_assets(PAGE_CSS, EDITOR_JS)
+    # With sharded metadata url.json only exists after `join-meta`.
+    meta_paths = [URLS_JSON_PATH] if URLS_JSON_PATH.exists() else []
+    write_cache_headers([PAPERS_HTML_PATH, *meta_paths, SERVICE_WORKER_PATH])
+    print(f"Wrote static assets: {', '.join(str(p) for p in asset_paths)}")
+    
     # Generate HTML
     print("\nGenerating HTML output...")
-    output_html = generate_html(papers_by_session)
+    related_map = _load_related_map()
+    output_html = generate_html(
+        papers_by_session,
+        extra_body=SERVICE_WORKER_REGISTER_SNIPPET,
+        asset_urls=asset_urls,
+        related_map=related_map,
+        placeholder_map=placeholder_map,
+    )
     
     # Save output
-    output_path = Path("papers.html")
+    output_path = PAPERS_HTML_PATH
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(output_html)
     
+    # Per-session pages
+    page_paths = []
+    if multi_page:
+        written, page_paths = generate_session_pages(
+            papers_by_session, asset_urls=asset_urls, placeholder_map=placeholder_map, related_map=related_map
+        )
+        print(f"Wrote {len(written)} of {len(page_paths)} session pages to {SESSIONS_DIR}/")
+    
+    # Service worker for offline / repeat visits
+    thumbnail_paths = [thumb_paths[p.image] for p in papers if p.image in thumb_paths]
+    sw_path = write_service_worker(output_path, [*meta_paths, *asset_paths], thumbnail_paths)
+    print(f"Wrote {sw_path} ({len(set(thumbnail_paths))} thumbnails in precache manifest)")
+    
+    # Precompressed variants for static hosting
+    print("\nPrecompressing outputs...")
+    compression = precompress([output_path, *meta_paths, *asset_paths, sw_path, *page_paths])
+    
     print(f"\n{'=' * 60}")
     print(f"[SUCCESS] Output saved to: {output_path.absolute()}")
     print(f"[SUCCESS] Total: {len(papers)} papers in {len(papers_by_session)} sessions")
+    print_compression_summary(compression)
     print(f"{'=' * 60}")
 
 
+def history_paths():
+    """Files a run keeps in history/: enough for parse or render to reproduce it offline."""
+    return [
+        *sorted(RAW_DIR.glob("*")),
+        PAPERS_JSONL_PATH,
+        URLS_JSON_PATH,
+        *sorted(meta_store.META_DIR.glob("*.json")),
+        RELATED_JSON_PATH,
+        AUTHORS_JSON_PATH,
+        thumbnails.PLACEHOLDERS_PATH,
+        CHANGES_PATH,
+        changes.SNAPSHOT_PATH,
+        crossref_meta.CROSSREF_CACHE_PATH,
+        crossref_meta.CROSSREF_WORKS_PATH,
+        arxiv_meta.ARXIV_CACHE_PATH,
+    ]
+
+
+def record_history(command):
+    start = time.perf_counter()
+    run, new_bytes = history.record_run(history_paths(), command)
+    print(f"Recorded run {run['run']} in {history.HISTORY_DIR}/ ({len(run['files'])} files, "
+          f"{new_bytes / 1024:.1f} KB new) in {time.perf_counter() - start:.2f}s")
+
+
+def print_history():
+    runs = history.load_runs()
+    previous = {}
+    for run in runs:
+        changed = sum(1 for path, digest in run["files"].items() if previous.get(path) != digest)
+        print(f"  {run['run']}  {run['command']:<7} {len(run['files']):>4} files, {changed:>4} changed")
+        previous = run["files"]
+    stats = history.storage_stats()
+    print(f"{stats['runs']} runs, {stats['objects']} objects: {stats['stored_bytes'] / 1024:.1f} KB on disk "
+          f"for {stats['logical_bytes'] / 1024:.1f} KB of run files")
+
+
+def restore_history(run_id, into=None, render=False, multi_page=False):
+    """Write a recorded run's files into a directory and optionally re-render it there (no network)."""
+    run = history.find_run(run_id)
+    into = into or history.HISTORY_DIR / "checkout" / run["run"]
+    written = history.restore(run, into)
+    print(f"Restored {len(written)} files of run {run['run']} ({run['command']}) into {into}/")
+    if render:
+        # Stage paths are relative to the working directory.
+        with contextlib.chdir(into):
+            if not PAPERS_JSONL_PATH.exists():
+                parse_stage()
+            render_stage(multi_page=multi_page)
+
+
+@metrics.timed_stage("export")
+def export_stage(formats=tuple(export.WRITERS), papers_path=PAPERS_JSONL_PATH, out_dir=export.EXPORT_DIR):
+    """Write the selected export formats from papers.jsonl + url.json in a single pass."""
+    start = time.perf_counter()
+    papers_by_session = read_papers_jsonl(papers_path)
+    apply_author_overrides(papers_by_session)
+    title_dois = crossref_meta.load_title_matches()
+
+    def doi_for(paper, url):
+        return crossref_meta.doi_from_url(url) or title_dois.get(crossref_meta.title_key(paper.title))
+
+    paths = export.export_papers(papers_by_session, _load_existing_meta(), doi_for, formats=formats, out_dir=out_dir)
+    total = sum(len(papers) for papers in papers_by_session.values())
+    print(f"Exported {total} papers to {', '.join(str(p) for p in paths)} in {time.perf_counter() - start:.2f}s")
+    return paths
+
+
+def build(
+    multi_page=False, related_k=5, placeholders=True, pdfs=True, arxiv=True, crossref=True, browser_pages=0,
+    deadline=None,
+):
+    """Full pipeline: fetch -> parse -> enrich -> render, through the build/ artifacts."""
+    print("=" * 60)
+    print("SIGGRAPH Asia 2025 Technical Papers Scraper")
+    print("=" * 60)
+    
+    if not fetch_stage(deadline=deadline):
+        return False
+    parse_stage()
+    enrich_stage(
+        related_k=related_k, placeholders=placeholders, pdfs=pdfs, arxiv=arxiv, crossref=crossref,
+        browser_pages=browser_pages,
+    )
+    render_stage(multi_page=multi_page)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SIGGRAPH Asia 2025 Technical Papers Scraper")
+    parser.add_argument("--record", type=Path, metavar="DIR", help="save every HTTP response as a fixture in DIR")
+    parser.add_argument("--replay", type=Path, metavar="DIR", help="serve HTTP responses from fixtures in DIR (no network)")
+    parser.add_argument("--latency", type=float, default=0, metavar="MS", help="simulated latency per replayed request")
+    parser.add_argument("--deadline", type=float, default=120, metavar="S", help="give up on the schedule fetch after S seconds (enrichment downloads are not bounded)")
+    parser.add_argument("--retries", type=int, default=3, help="retries per request for transient failures")
+    parser.add_argument("--metrics", type=Path, metavar="PATH", help="write Prometheus textfile metrics to PATH")
+    parser.add_argument(
+        "--no-history", dest="history", action="store_false",
+        help=f"do not record this run in {history.HISTORY_DIR}/",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    build_parser = subparsers.add_parser("build", help="run fetch, parse, enrich and render (default)")
+    subparsers.add_parser("fetch", help=f"download the per-day schedule snippets into {RAW_DIR}/")
+    subparsers.add_parser("parse", help=f"parse {RAW_DIR}/ into {PAPERS_JSONL_PATH}")
+    enrich_parser = subparsers.add_parser(
+        "enrich", help=f"update url.json, the change feed and related papers from {PAPERS_JSONL_PATH}"
+    )
+    render_parser = subparsers.add_parser(
+        "render", help=f"render papers.html from {PAPERS_JSONL_PATH} and url.json (no network)"
+    )
+    for sub in (build_parser, render_parser):
+        sub.add_argument(
+            "--pages", action="store_true",
+            help=f"also write one page per session plus an index into {SESSIONS_DIR}/",
+        )
+    for sub in (build_parser, enrich_parser):
+        sub.add_argument(
+            "--related", type=int, default=5, metavar="K",
+            help="related papers per card from TF-IDF similarity (0 disables)",
+        )
+        sub.add_argument(
+            "--no-placeholders", dest="placeholders", action="store_false",
+            help="skip downloading thumbnails for size/colour placeholders",
+        )
+        sub.add_argument(
+            "--no-pdfs", dest="pdfs", action="store_false",
+            help="skip extracting abstracts from direct-PDF links",
+        )
+        sub.add_argument(
+            "--no-arxiv", dest="arxiv", action="store_false",
+            help="skip arXiv metadata for arXiv-linked papers",
+        )
+        sub.add_argument(
+            "--no-crossref", dest="crossref", action="store_false",
+            help="skip Crossref work records for papers with a known DOI",
+        )
+        sub.add_argument(
+            "--browser", dest="browser_pages", type=int, nargs="?", const=browser_fetch.POOL_SIZE, default=0,
+            metavar="PAGES", help="render links still missing an abstract in headless Chromium, "
+                                  f"PAGES at a time (default {browser_fetch.POOL_SIZE})",
+        )
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="re-render papers.watch.html on url.json changes and serve it with auto-reload"
+    )
+    watch_parser.add_argument(
+        "--raw", type=Path,
+        help="read schedule HTML from this file (e.g. debug_raw.html) instead of fetching",
+    )
+    watch_parser.add_argument("--port", type=int, default=8000)
+    watch_parser.add_argument("--interval", type=float, default=0.5, help="url.json poll interval (s)")
+
+    merge_parser = subparsers.add_parser(
+        "merge-edits", help="merge exported siggraph_paper_edits delta files into url.json"
+    )
+    merge_parser.add_argument("deltas", type=Path, nargs="+")
+    merge_parser.add_argument("--dry-run", action="store_true", help="report without writing url.json")
+
+    audit_parser = subparsers.add_parser(
+        "audit-sessions", help="cluster url.json papers by topic and report session mismatches"
+    )
+    audit_parser.add_argument("--clusters", type=int, help="k-means clusters (default: one per session)")
+    audit_parser.add_argument("--margin", type=float, default=0.2, help="minimum similarity gap to report")
+
+    shard_parser = subparsers.add_parser(
+        "shard-meta", help=f"split {URLS_JSON_PATH} into per-session (or id-prefix) shards in {meta_store.META_DIR}/"
+    )
+    shard_parser.add_argument("--by", choices=meta_store.LAYOUTS, default="session", help="shard layout")
+    join_parser = subparsers.add_parser(
+        "join-meta", help=f"write the single-file {URLS_JSON_PATH} format from the {meta_store.META_DIR}/ shards"
+    )
+    join_parser.add_argument("--out", type=Path, default=URLS_JSON_PATH)
+    join_parser.add_argument(
+        "--unshard", action="store_true", help=f"also remove {meta_store.META_DIR}/ and go back to {URLS_JSON_PATH}"
+    )
+
+    subparsers.add_parser("history", help=f"list the runs recorded in {history.HISTORY_DIR}/ and their disk use")
+    restore_parser = subparsers.add_parser(
+        "history-restore", help="write a recorded run's files into a directory (no network)"
+    )
+    restore_parser.add_argument("run", help='run id (or unique prefix), or "latest"')
+    restore_parser.add_argument("--into", type=Path, help=f"target directory (default {history.HISTORY_DIR}/checkout/RUN)")
+    restore_parser.add_argument("--render", action="store_true", help="re-render the restored run in that directory")
+    restore_parser.add_argument("--pages", action="store_true", help="with --render, also write session pages")
+    prune_parser = subparsers.add_parser("history-prune", help="drop old runs and the objects only they use")
+    prune_parser.add_argument("--keep", type=int, required=True, metavar="N", help="newest runs to keep")
+
+    export_parser = subparsers.add_parser(
+        "export", help=f"write JSON/CSV/Markdown/BibTeX/iCal exports into {export.EXPORT_DIR}/ (no network)"
+    )
+    export_parser.add_argument(
+        "--format", dest="formats", action="append", choices=sorted(export.WRITERS),
+        help="format to write (repeatable; default: all)",
+    )
+    export_parser.add_argument("--out", type=Path, default=export.EXPORT_DIR, help="output directory")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "unshard", False) and args.out != URLS_JSON_PATH:
+        parser.error(f"--unshard needs the joined file at {URLS_JSON_PATH}")
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.record:
+        backend = transport.RecordingTransport(args.record)
+    elif args.replay:
+        backend = transport.ReplayTransport(args.replay, latency=args.latency / 1000)
+    else:
+        backend = transport.LiveTransport()
+    transport.set_transport(transport.ResilientTransport(backend, retries=args.retries))
+
+    success = False
+    try:
+        if args.command == "fetch":
+            if not fetch_stage(deadline=args.deadline):
+                sys.exit(1)
+        elif args.command == "parse":
+            parse_stage()
+        elif args.command == "enrich":
+            enrich_stage(
+                related_k=args.related, placeholders=args.placeholders,
+                pdfs=args.pdfs, arxiv=args.arxiv, crossref=args.crossref, browser_pages=args.browser_pages,
+            )
+        elif args.command == "render":
+            render_stage(multi_page=args.pages)
+        elif args.command == "watch":
+            import serve
+            serve.watch(raw_path=args.raw, port=args.port, interval=args.interval)
+        elif args.command == "merge-edits":
+            try:
+                applied, conflicts = merge_edit_deltas(args.deltas, dry_run=args.dry_run)
+            except (OSError, ValueError) as e:
+                print(f"ERROR: {e}")
+                sys.exit(1)
+            for line in applied:
+                print(f"  applied  {line}")
+            for line in conflicts:
+                print(f"  CONFLICT {line}")
+            action = "Would apply" if args.dry_run else "Applied"
+            print(f"{action} {len(applied)} edits to {_meta_store().location} ({len(conflicts)} conflicts)")
+        elif args.command == "audit-sessions":
+            audit_sessions(n_clusters=args.clusters, margin=args.margin)
+        elif args.command == "shard-meta":
+            shard_meta(layout=args.by)
+        elif args.command == "join-meta":
+            join_meta(out_path=args.out, unshard=args.unshard)
+        elif args.command == "history":
+            print_history()
+        elif args.command == "history-restore":
+            restore_history(args.run, into=args.into, render=args.render, multi_page=args.pages)
+        elif args.command == "history-prune":
+            runs, objects = history.prune(args.keep)
+            print(f"Removed {runs} runs and {objects} objects from {history.HISTORY_DIR}/")
+        elif args.command == "export":
+            export_stage(formats=args.formats or tuple(export.WRITERS), out_dir=args.out)
+        else:
+            if not build(
+                multi_page=getattr(args, "pages", False),
+                related_k=getattr(args, "related", 5),
+                placeholders=getattr(args, "placeholders", True),
+                pdfs=getattr(args, "pdfs", True),
+                arxiv=getattr(args, "arxiv", True),
+                crossref=getattr(args, "crossref", True),
+                browser_pages=getattr(args, "browser_pages", 0),
+                deadline=args.deadline,
+            ):
+                sys.exit(1)
+
+        if args.history and args.command in (None, "build", "fetch", "parse", "enrich", "render"):
+            record_history(args.command or "build")
+        success = True
+    except meta_store.MetaStoreError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    finally:
+        if args.metrics:
+            metrics.write_textfile(args.metrics, success)
+
 if __name__ == "__main__":
     main()
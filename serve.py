@@ -0,0 +1,264 @@
+"""
+Watch mode for the SIGGRAPH Asia 2025 papers page.
+
+Keeps the parsed papers and their rendered cards in memory, polls url.json
+(or the meta/ shards) for changes, re-renders only the affected
+cards/sections into papers.watch.html and serves that page from a local
+HTTP server that auto-reloads on every rebuild. The built papers.html (and
+its precompressed .gz/.br siblings) are left alone, so stopping watch mode
+never leaves a live-reload page where the static build used to be.
+
+The server also accepts PATCH /papers/{id} with a JSON body of url/abstract
+fields, which the page's editor uses (instead of localStorage) when present.
+
+Without --raw, papers come from build/papers.jsonl when a parse stage has
+written it, and from the live schedule otherwise.
+
+Usage:
+    python scraper.py watch --raw debug_raw.html --port 8000
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from pathlib import Path
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import scraper
+import meta_store
+import thumbnails
+from fsutil import write_atomic
+
+EDITABLE_FIELDS = ("url", "abstract")
+
+WATCH_HTML_PATH = Path("papers.watch.html")
+
+LIVE_RELOAD_SNIPPET = '''
+    <script>
+        // Injected by watch mode: reload when the served build changes.
+        window.liveBuild = null;
+        (function () {
+            setInterval(() => {
+                fetch('/__build', {cache: 'no-store'})
+                    .then(r => r.json())
+                    .then(data => {
+                        if (window.liveBuild !== null && data.build !== window.liveBuild) location.reload();
+                        window.liveBuild = data.build;
+                    })
+                    .catch(() => {});
+            }, 1000);
+        })();
+    </script>
+'''
+
+
+class IncrementalRenderer:
+    """
+    Rendered page cache keyed by paper id and session.
+
+    refresh() diffs the url/abstract maps against the previous ones and only
+    re-renders cards whose metadata changed, plus the sections containing them.
+    Cards carry the same "Related" lists as the built page (related_map, see
+    scraper.generate_html).
+    """
+
+    def __init__(self, papers_by_session, extra_body="", related_map=None):
+        self.papers_by_session = papers_by_session
+        self.extra_body = extra_body
+        self.related_map = related_map or {}
+        self.total_papers = sum(len(papers) for papers in papers_by_session.values())
+        self.url_map = {}
+        self.abstract_map = {}
+        self.cards = {}
+        self.sections = {}
+        self.html = ""
+        self.placeholder_map = thumbnails.load_placeholders()
+
+        # papers_#### -> (session name, paper)
+        self.paper_index = {}
+        for session_name, papers in papers_by_session.items():
+            for paper in papers:
+                self.paper_index[paper.pid] = (session_name, paper)
+        self.titles = {pid: paper.title for pid, (_, paper) in self.paper_index.items()}
+
+    def refresh(self, meta_map):
+        """Apply a new url.json meta map; returns the ids of re-rendered cards."""
+        url_map = scraper.load_urls_for_html(meta_map)
+        abstract_map = scraper.load_abstracts_for_html(meta_map)
+
+        changed = [
+            pid for pid in self.paper_index
+            if pid not in self.cards
+            or url_map.get(pid) != self.url_map.get(pid)
+            or abstract_map.get(pid) != self.abstract_map.get(pid)
+        ]
+        self.url_map = url_map
+        self.abstract_map = abstract_map
+        if not changed:
+            return changed
+
+        dirty_sessions = set()
+        for pid in changed:
+            session_name, paper = self.paper_index[pid]
+            self.cards[pid] = scraper.render_paper_card(
+                paper, url_map, abstract_map,
+                scraper.related_items(pid, self.related_map, self.titles),
+                placeholder=self.placeholder_map.get(paper.image),
+            )
+            dirty_sessions.add(session_name)
+
+        for session_name in dirty_sessions:
+            papers = self.papers_by_session[session_name]
+            cards_html = "".join(self.cards[paper.pid] for paper in papers)
+            self.sections[session_name] = scraper.render_session(session_name, papers, cards_html)
+
+        sessions_html = "".join(self.sections[name] for name in self.papers_by_session)
+        self.html = scraper.render_page(
+            sessions_html, self.total_papers, len(self.papers_by_session), self.extra_body
+        )
+        return changed
+
+
+def _read_meta():
+    """Read url.json (or its shards) strictly; returns None while missing or mid-save."""
+    try:
+        return scraper._parse_meta(scraper._meta_store().entries())
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _load_papers_by_session(raw_path=None):
+    if raw_path is not None:
+        print(f"Reading schedule HTML from {raw_path}...")
+        html_content = raw_path.read_text(encoding="utf-8")
+    elif scraper.PAPERS_JSONL_PATH.exists():
+        print(f"Reading parsed papers from {scraper.PAPERS_JSONL_PATH}...")
+        papers_by_session = scraper.read_papers_jsonl()
+        scraper.apply_author_overrides(papers_by_session)
+        return papers_by_session
+    else:
+        print("Fetching schedule data...")
+        html_content = scraper.fetch_schedule_data()
+    papers = scraper.extract_technical_papers(html_content)
+    return scraper.group_papers_by_session(papers)
+
+
+class _WatchHandler(SimpleHTTPRequestHandler):
+    """Static file handler plus the /__build and PATCH /papers/{id} endpoints."""
+
+    def __init__(self, *args, state=None, **kwargs):
+        self.state = state
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == "/__build":
+            self._send_json(200, {"build": self.state["build"]})
+            return
+        if self.path == "/":
+            self.path = "/" + WATCH_HTML_PATH.name
+        super().do_GET()
+
+    def do_PATCH(self):
+        match = re.fullmatch(r"/papers/(papers_\d+)", self.path)
+        if not match:
+            self._send_json(404, {"error": "not found"})
+            return
+        pid = match.group(1)
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            updates = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "body must be JSON"})
+            return
+        if (
+            not isinstance(updates, dict)
+            or not updates
+            or any(k not in EDITABLE_FIELDS or not isinstance(v, str) for k, v in updates.items())
+        ):
+            self._send_json(400, {"error": f"body must map {'/'.join(EDITABLE_FIELDS)} to strings"})
+            return
+
+        with self.state["lock"]:
+            try:
+                entry = scraper.update_paper_meta(pid, {k: v.strip() for k, v in updates.items()})
+            except (OSError, ValueError) as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            if entry is None:
+                self._send_json(404, {"error": f"{pid} not in {scraper._meta_store().location}"})
+                return
+            self.state["rebuild"]()
+            build = self.state["build"]
+
+        print(f"PATCH {pid}: {', '.join(updates)}")
+        self._send_json(200, {"id": pid, "entry": entry, "build": build})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def end_headers(self):
+        # Never let the browser hold on to a stale rebuild.
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def watch(raw_path=None, port=8000, interval=0.5):
+    """Render once, then re-render papers.watch.html whenever url.json changes."""
+    papers_by_session = _load_papers_by_session(raw_path)
+    renderer = IncrementalRenderer(
+        papers_by_session, extra_body=LIVE_RELOAD_SNIPPET, related_map=scraper._load_related_map()
+    )
+
+    state = {"build": 0, "lock": threading.Lock()}
+
+    def rebuild():
+        meta_map = _read_meta()
+        if meta_map is None:
+            return
+        start = time.perf_counter()
+        changed = renderer.refresh(meta_map)
+        if not changed:
+            return
+        write_atomic(WATCH_HTML_PATH, renderer.html)
+        state["build"] += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Rebuilt {WATCH_HTML_PATH} ({len(changed)} cards) in {elapsed_ms:.1f} ms")
+
+    state["rebuild"] = rebuild
+
+    rebuild()
+    if not renderer.html:
+        # No usable url.json yet: render without metadata.
+        renderer.refresh({})
+        write_atomic(WATCH_HTML_PATH, renderer.html)
+
+    handler = partial(_WatchHandler, state=state, directory=os.getcwd())
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving http://127.0.0.1:{port}/ (watching {scraper._meta_store().location}, Ctrl+C to stop)")
+
+    last_stat = None
+    try:
+        while True:
+            current = meta_store.signature(scraper.URLS_JSON_PATH)
+            if current != last_stat:
+                last_stat = current
+                with state["lock"]:
+                    rebuild()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.shutdown()
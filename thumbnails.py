@@ -0,0 +1,208 @@
+"""
+Build-time thumbnail placeholders.
+
+Downloads every paper thumbnail once (cached under build/thumbs/, fetched
+concurrently through transport.http_get so record/replay and retries apply)
+and derives, per image URL:
+
+- width / height: intrinsic size, emitted on the <img> so the layout is
+  known before the image arrives;
+- color: average colour, painted behind the image;
+- lqip: a tiny blurred copy as a data: URI, painted over that colour until
+  the real (lazy-loaded) image replaces it.
+
+The render stage then publishes the cached images under content-hashed
+names next to the other static assets (publish_thumbnails), so the page and
+its service worker load them same-origin instead of from the schedule host.
+
+Pillow is optional: without it only the size is read (from the image
+header), and cards fall back to the plain background.
+"""
+
+import json
+import base64
+import struct
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import transport
+from fsutil import write_atomic, write_json_atomic
+
+try:
+    from PIL import Image, ImageFilter, features
+    HAVE_WEBP = features.check("webp")
+except ImportError:  # optional: pip install pillow
+    Image = ImageFilter = None
+    HAVE_WEBP = False
+
+THUMBS_DIR = Path("build") / "thumbs"
+PLACEHOLDERS_PATH = Path("build") / "placeholders.json"
+PLACEHOLDERS_VERSION = 1
+
+LQIP_SIZE = 16
+
+
+def image_size(data):
+    """(width, height) from a JPEG / PNG / GIF / WebP header, or None."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8X":
+            return 1 + int.from_bytes(data[24:27], "little"), 1 + int.from_bytes(data[27:30], "little")
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                i += 1 if marker == 0xFF else 2
+                continue
+            length = struct.unpack(">H", data[i + 2:i + 4])[0]
+            # SOFn frames (excluding DHT / JPG / DAC) carry the dimensions.
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                h, w = struct.unpack(">HH", data[i + 5:i + 9])
+                return w, h
+            i += 2 + length
+    return None
+
+
+def image_extension(data):
+    """File extension for a JPEG / PNG / GIF / WebP header, or None."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return ".png"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    if data[:2] == b"\xff\xd8":
+        return ".jpg"
+    return None
+
+
+def placeholder_info(data):
+    """{"width", "height", "color", "lqip"} for image bytes (size only without Pillow)."""
+    if Image is None:
+        size = image_size(data)
+        return {"width": size[0], "height": size[1]} if size else None
+
+    with Image.open(BytesIO(data)) as img:
+        width, height = img.size
+        # JPEG draft mode decodes at 1/2..1/8 scale, far cheaper than a full decode.
+        img.draft("RGB", (LQIP_SIZE * 4, LQIP_SIZE * 4))
+        small = img.convert("RGB")
+    small.thumbnail((LQIP_SIZE, LQIP_SIZE))
+    r, g, b = small.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+
+    blurred = small.filter(ImageFilter.GaussianBlur(1))
+    buf = BytesIO()
+    if HAVE_WEBP:
+        # ~80 bytes at this size, against ~250+ for PNG.
+        blurred.save(buf, format="WEBP", quality=40)
+        mime = "image/webp"
+    else:
+        blurred.save(buf, format="PNG", optimize=True)
+        mime = "image/png"
+    return {
+        "width": width,
+        "height": height,
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+        "lqip": f"data:{mime};base64," + base64.b64encode(buf.getvalue()).decode("ascii"),
+    }
+
+
+def _cache_path(url, cache_dir):
+    return cache_dir / hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+
+def fetch_thumbnail(url, cache_dir=THUMBS_DIR):
+    """Image bytes for url, downloaded once and then read from cache_dir."""
+    path = _cache_path(url, cache_dir)
+    if path.exists():
+        return path.read_bytes()
+    data = transport.http_get(url, timeout=15).body
+    write_atomic(path, data)
+    return data
+
+
+def _placeholder_for(url, cache_dir):
+    try:
+        return url, placeholder_info(fetch_thumbnail(url, cache_dir)), None
+    except Exception as e:
+        return url, None, e
+
+
+def build_placeholders(urls, cache_dir=THUMBS_DIR, max_workers=16):
+    """
+    Compute placeholders for urls concurrently; returns ({url: info}, failures).
+
+    Thumbnails are decoration, so a failed image is reported and skipped
+    rather than failing the build.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    placeholders = {}
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for url, info, error in pool.map(lambda u: _placeholder_for(u, cache_dir), sorted(set(urls))):
+            if info:
+                placeholders[url] = info
+            else:
+                failures[url] = error or "unrecognised image format"
+    return placeholders, failures
+
+
+def publish_thumbnails(urls, out_dir, cache_dir=THUMBS_DIR):
+    """
+    Copy the cached images for urls into out_dir as <sha256>.<ext>; returns {url: path}.
+
+    Only already-downloaded images are published (no network); copies no
+    longer referenced are removed.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    published = {}
+    for url in sorted(set(urls)):
+        try:
+            data = _cache_path(url, cache_dir).read_bytes()
+        except OSError:
+            continue
+        ext = image_extension(data)
+        if ext is None:
+            continue
+        path = out_dir / f"{hashlib.sha256(data).hexdigest()[:16]}{ext}"
+        if not path.exists():
+            write_atomic(path, data)
+        published[url] = path
+    keep = set(published.values())
+    for old in out_dir.iterdir():
+        if old not in keep:
+            old.unlink()
+    return published
+
+
+def write_placeholders(placeholders, path=PLACEHOLDERS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(path, {"version": PLACEHOLDERS_VERSION, "images": placeholders})
+
+
+def load_placeholders(path=PLACEHOLDERS_PATH):
+    """url -> placeholder info from the last enrich run ({} if none)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != PLACEHOLDERS_VERSION:
+            return {}
+        return data["images"]
+    except Exception:
+        return {}
@@ -0,0 +1,315 @@
+"""
+Pluggable HTTP transport for every network fetch in the pipeline.
+
+- LiveTransport: plain urllib GET (the default).
+- RecordingTransport: live GET that also stores each response (status,
+  headers, body) in a fixture directory.
+- ReplayTransport: serves responses from a fixture directory, optionally
+  sleeping to simulate latency; never touches the network.
+
+Fixtures are two files per URL, keyed by a hash of the URL:
+<key>.json ({url, status, reason, headers}) and <key>.body (raw bytes).
+Error responses are recorded too, so a replayed run fails the same way.
+
+Whichever backend is installed is wrapped in a ResilientTransport: transient
+failures (connection errors, timeouts, 429 and 5xx) are retried with
+jittered exponential backoff, and a per-host circuit breaker stops
+hammering a host that keeps failing. fetch_deadline() bounds every attempt
+made inside a block (the schedule fetch) by one shared deadline; requests
+outside it (enrichment downloads) are only bounded by their own timeouts.
+
+Usage:
+    python scraper.py --record fixtures/ fetch
+    python scraper.py --replay fixtures/ --latency 50 build
+"""
+
+import io
+import json
+import time
+import random
+import hashlib
+import threading
+import contextlib
+from pathlib import Path
+from urllib.parse import urlsplit
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen, Request
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+class Response:
+    """A fully read HTTP response."""
+
+    __slots__ = ("url", "status", "reason", "headers", "body")
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def text(self, encoding="utf-8"):
+        return self.body.decode(encoding)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HTTPError(self.url, self.status, self.reason, self.headers, io.BytesIO(self.body))
+        return self
+
+
+class FixtureMissing(LookupError):
+    """Replay mode was asked for a URL that was never recorded."""
+
+
+class ResponseTooLarge(ValueError):
+    """The response body exceeds the caller's max_bytes cap."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The fetch deadline passed before a request could complete."""
+
+
+class CircuitOpen(ConnectionError):
+    """Requests to a host are suspended after repeated failures."""
+
+
+def _check_size(url, size, max_bytes):
+    if max_bytes is not None and size > max_bytes:
+        raise ResponseTooLarge(f"{url} is larger than {max_bytes:,} bytes")
+
+
+class LiveTransport:
+    def get(self, url, headers=None, timeout=30, max_bytes=None):
+        req = Request(url, headers={**DEFAULT_HEADERS, **(headers or {})})
+        try:
+            with urlopen(req, timeout=timeout) as response:
+                # Refuse early on Content-Length, and never read past the cap.
+                _check_size(url, int(response.headers.get("Content-Length") or 0), max_bytes)
+                body = response.read() if max_bytes is None else response.read(max_bytes + 1)
+                _check_size(url, len(body), max_bytes)
+                return Response(url, response.status, response.reason, dict(response.headers), body)
+        except HTTPError as e:
+            return Response(url, e.code, e.reason, dict(e.headers or {}), e.read())
+
+
+def fixture_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+
+def write_fixture(fixture_dir, response):
+    """Store a Response under fixture_dir so ReplayTransport can serve it."""
+    fixture_dir = Path(fixture_dir)
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    key = fixture_key(response.url)
+    (fixture_dir / f"{key}.body").write_bytes(response.body)
+    meta = {
+        "url": response.url,
+        "status": response.status,
+        "reason": response.reason,
+        "headers": response.headers,
+    }
+    (fixture_dir / f"{key}.json").write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+class RecordingTransport:
+    def __init__(self, fixture_dir, inner=None):
+        self.fixture_dir = Path(fixture_dir)
+        self.inner = inner or LiveTransport()
+
+    def get(self, url, headers=None, timeout=30, max_bytes=None):
+        response = self.inner.get(url, headers=headers, timeout=timeout, max_bytes=max_bytes)
+        write_fixture(self.fixture_dir, response)
+        return response
+
+
+class ReplayTransport:
+    def __init__(self, fixture_dir, latency=0.0):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+
+    def get(self, url, headers=None, timeout=30, max_bytes=None):
+        key = fixture_key(url)
+        try:
+            meta = json.loads((self.fixture_dir / f"{key}.json").read_text(encoding="utf-8"))
+            body = (self.fixture_dir / f"{key}.body").read_bytes()
+        except FileNotFoundError:
+            raise FixtureMissing(f"no fixture for {url} in {self.fixture_dir}") from None
+        if self.latency:
+            time.sleep(self.latency)
+        _check_size(url, len(body), max_bytes)
+        return Response(url, meta["status"], meta["reason"], meta["headers"], body)
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class Deadline:
+    """A point in time shared by every request of a fetch (None = no deadline)."""
+
+    def __init__(self, seconds=None):
+        self.expires = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        if self.expires is None:
+            return float("inf")
+        return self.expires - time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after `threshold` consecutive failures the host is
+    refused for `cooldown` seconds, then a single trial request is let through
+    while every other caller is still refused (success closes the breaker,
+    failure re-opens it, release() hands the trial to the next caller).
+    """
+
+    def __init__(self, threshold=5, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self._trials = set()
+
+    def check(self, host):
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if host in self._trials:
+                raise CircuitOpen(f"circuit half-open for {host}, waiting for the trial request")
+            if time.monotonic() - opened_at < self.cooldown:
+                raise CircuitOpen(f"circuit open for {host} after {self._failures[host]} failures")
+            # Half-open: this caller is the trial until its outcome is recorded.
+            self._trials.add(host)
+
+    def release(self, host):
+        """End a trial without a verdict (the request failed for reasons unrelated to the host)."""
+        with self._lock:
+            self._trials.discard(host)
+
+    def record(self, host, ok):
+        with self._lock:
+            self._trials.discard(host)
+            if ok:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+def _is_transient(error):
+    if isinstance(error, (FixtureMissing, CircuitOpen, ResponseTooLarge)):
+        return False
+    return isinstance(error, (URLError, TimeoutError, ConnectionError))
+
+
+class ResilientTransport:
+    """
+    Retries transient failures of an inner transport within a deadline.
+
+    Backoff is "full jitter": attempt n sleeps uniform(0, min(max_delay,
+    base_delay * 2**n)), trimmed to the time left before the deadline. A
+    Retry-After header on 429/503 is honoured when it fits the deadline.
+    """
+
+    def __init__(self, inner, retries=3, base_delay=0.5, max_delay=8.0, deadline=None, breaker=None):
+        self.inner = inner
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline or Deadline()
+        self.breaker = breaker or CircuitBreaker()
+
+    def get(self, url, headers=None, timeout=30, max_bytes=None):
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            remaining = self.deadline.remaining()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"fetch deadline passed before {url}")
+            self.breaker.check(host)
+
+            retry_after = None
+            try:
+                response = self.inner.get(
+                    url, headers=headers, timeout=min(timeout, remaining), max_bytes=max_bytes
+                )
+            except BaseException as e:
+                if not _is_transient(e):
+                    self.breaker.release(host)
+                    raise
+                self.breaker.record(host, ok=False)
+                if attempt == self.retries:
+                    raise
+                error = e
+            else:
+                if response.status not in RETRY_STATUSES:
+                    self.breaker.record(host, ok=response.status < 500)
+                    return response
+                self.breaker.record(host, ok=False)
+                if attempt == self.retries:
+                    return response
+                error = f"HTTP {response.status}"
+                retry_after = _retry_after(response.headers)
+
+            delay = retry_after if retry_after is not None else random.uniform(
+                0, min(self.max_delay, self.base_delay * 2 ** attempt)
+            )
+            if delay >= self.deadline.remaining():
+                raise DeadlineExceeded(f"fetch deadline passed while retrying {url} ({error})")
+            print(f"  Retrying {url} in {delay:.1f}s ({error})")
+            time.sleep(delay)
+
+
+def _retry_after(headers):
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+    return None
+
+
+_transport = ResilientTransport(LiveTransport())
+
+
+def set_transport(transport):
+    """
+    Install the transport used by http_get; returns the previous one.
+
+    Callers wanting retries wrap their backend in ResilientTransport.
+    """
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
+
+
+def get_transport():
+    return _transport
+
+
+@contextlib.contextmanager
+def fetch_deadline(seconds):
+    """Bound every request through the installed ResilientTransport within the block by one deadline."""
+    if not isinstance(_transport, ResilientTransport):
+        yield
+        return
+    transport, previous = _transport, _transport.deadline
+    transport.deadline = Deadline(seconds)
+    try:
+        yield
+    finally:
+        transport.deadline = previous
+
+
+def http_get(url, headers=None, timeout=30, max_bytes=None):
+    """
+    GET url through the installed transport; raises HTTPError on 4xx/5xx and
+    ResponseTooLarge if the body would exceed max_bytes.
+    """
+    return _transport.get(url, headers=headers, timeout=timeout, max_bytes=max_bytes).raise_for_status()